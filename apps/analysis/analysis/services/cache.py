@@ -0,0 +1,314 @@
+import asyncio
+import contextlib
+import fcntl
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import pandas as pd
+
+
+def freeze(value: Any) -> Hashable:
+    """Turn nested lists and dicts, e.g. from JSON, into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value if isinstance(value, Hashable) else repr(value)
+
+
+def dataframe_nbytes(value: pd.DataFrame | pd.Series) -> int:
+    """Return the in-memory size of a DataFrame or Series, including objects."""
+    usage = value.memory_usage(deep=True)
+    return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+
+
+@contextlib.contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a file, blocking until it is available.
+
+    The lock is shared by all worker processes on the same host, unlike the
+    in-process deduplication of ``SingleFlight``.
+    """
+    with lock_path.open("a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def try_file_lock(lock_path: Path) -> Iterator[bool]:
+    """
+    Take an exclusive lock on a file without blocking, if nobody holds it.
+
+    Yields whether the lock is held. A missing lock file is not created, and
+    counts as held, as nobody else can hold it either.
+    """
+    try:
+        fd = os.open(lock_path, os.O_WRONLY)
+    except FileNotFoundError:
+        yield True
+        return
+
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+        else:
+            yield True
+    finally:
+        # Closing the file releases the lock
+        os.close(fd)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its entries.
+
+    The size of an entry is computed with ``sizeof`` when it is stored. By
+    default every entry has a size of one, which turns ``max_size`` into a
+    maximum number of entries. Entries larger than ``max_size`` are never
+    stored, and a ``max_size`` of zero disables the cache.
+
+    When ``ttl`` is set, entries older than ``ttl`` seconds are treated as
+    missing and dropped on their next lookup.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        sizeof: Callable[[Any], int] = lambda _: 1,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check for a key without touching its recency or the counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for a key and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry):
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries to make room."""
+        size = self._sizeof(value)
+        with self._lock:
+            self._discard(key)
+            if size > self.max_size:
+                return
+            while self._entries and self._size + size > self.max_size:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+            self._entries[key] = (value, size, self._clock())
+            self._size += size
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove a key from the cache and return its value if it was cached."""
+        with self._lock:
+            entry = self._discard(key)
+            return entry[0] if entry is not None else None
+
+    def pop_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove all keys matching a predicate and return how many were removed."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._discard(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return usage counters for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self._size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _is_expired(self, entry: tuple[Any, int, float]) -> bool:
+        return self.ttl is not None and self._clock() - entry[2] >= self.ttl
+
+    def _discard(self, key: Hashable) -> Optional[tuple[Any, int, float]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+        return entry
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share a key.
+
+    The first caller for a key runs the function. Callers that arrive while
+    that call is still running wait for it and receive its result, or its
+    exception, instead of running the function again. Calls are made either
+    from threads with ``do`` or from the event loop with ``do_async``, or
+    with ``do_many_async`` for batches of keys.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` unless a call for the same key is in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            is_owner = future is None
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_async(
+        self,
+        key: Hashable,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Any:
+        """
+        Await ``func(*args)`` unless a call for the same key is in flight.
+
+        The call runs as a task of its own, so that it still completes for
+        the waiting callers if the caller that started it is cancelled.
+        """
+
+        async def call(_: List[Any]) -> List[Any]:
+            return [await func(*args)]
+
+        results = await self.do_many_async([(key, None)], call)
+        return results[0]
+
+    async def do_many_async(
+        self,
+        items: Sequence[Tuple[Hashable, Any]],
+        func: Callable[[List[Any]], Awaitable[List[Any]]],
+    ) -> List[Any]:
+        """
+        Await the results of several keyed items, sharing calls key by key.
+
+        Items whose key is in flight wait for that call. All other items are
+        passed to a single ``func(values)`` call, which returns their results
+        in the same order. Every key is settled on its own, so later callers
+        can share any subset of the keys of this call. As with ``do_async``,
+        the call runs as a task of its own.
+
+        Returns:
+            The results of the items, in order.
+        """
+        futures: List[Future] = []
+        with self._lock:
+            owned: Dict[Hashable, Future] = {}
+            values: List[Any] = []
+            for key, value in items:
+                future = self._calls.get(key)
+                if future is None:
+                    future = Future()
+                    # A running future cannot be cancelled by one of its waiters
+                    future.set_running_or_notify_cancel()
+                    self._calls[key] = owned[key] = future
+                    values.append(value)
+                elif key not in owned:
+                    self.coalesced += 1
+                futures.append(future)
+
+            if owned:
+                self.calls += 1
+                task = asyncio.ensure_future(func(values))
+                task.add_done_callback(lambda task: self._settle(owned, task))
+
+        return [await asyncio.wrap_future(future) for future in futures]
+
+    def _settle(self, owned: Dict[Hashable, Future], task: asyncio.Future) -> None:
+        with self._lock:
+            for key in owned:
+                self._calls.pop(key, None)
+        if task.cancelled():
+            for future in owned.values():
+                future.set_exception(asyncio.CancelledError())
+        elif task.exception() is not None:
+            for future in owned.values():
+                future.set_exception(task.exception())
+        else:
+            for future, result in zip(owned.values(), task.result(), strict=True):
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, int]:
+        """Return usage counters for monitoring."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,260 @@
+import json
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyreadstat
+from loguru import logger
+
+from analysis.services.cache import LRUCache, file_lock
+from analysis.services.stats_index import (
+    forget_stats_index,
+    summarize_column,
+    write_stats_index,
+)
+from analysis.settings import settings
+
+SIDECAR_SUFFIX = ".columns"
+MANIFEST_FILE_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Numpy dtype kinds that can be stored as a plain, memory-mappable array:
+# booleans, integers, floats and datetimes.
+_ARRAY_DTYPE_KINDS = "biufmM"
+
+_manifest_cache = LRUCache(max_size=256)
+_conversion_executor = ThreadPoolExecutor(
+    max_workers=1,
+    thread_name_prefix="columnar-cache",
+)
+_scheduled_conversions: set[Path] = set()
+_scheduled_conversions_lock = threading.Lock()
+
+
+def get_sidecar_path(sav_path: Path) -> Path:
+    """Return the directory holding the columnar sidecar of a cached SAV file."""
+    return sav_path.with_suffix(SIDECAR_SUFFIX)
+
+
+def get_conversion_lock_path(sav_path: Path) -> Path:
+    """Return the lock file held while a cached SAV file is being converted."""
+    return sav_path.with_suffix(f"{SIDECAR_SUFFIX}.lock")
+
+
+def schedule_columnar_conversion(sav_path: Path) -> None:
+    """
+    Convert a cached SAV file to a columnar sidecar in the background.
+
+    The conversion is scheduled at most once per file and process, and runs
+    in one process at a time. Files that already have a sidecar are skipped.
+    """
+    if not settings.columnar_cache_enabled:
+        return
+    if get_sidecar_path(sav_path).exists():
+        return
+
+    with _scheduled_conversions_lock:
+        if sav_path in _scheduled_conversions:
+            return
+        _scheduled_conversions.add(sav_path)
+
+    _conversion_executor.submit(_convert_in_background, sav_path)
+
+
+def _convert_in_background(sav_path: Path) -> None:
+    try:
+        convert_to_columnar(sav_path)
+    except Exception:
+        logger.exception("Failed to build columnar sidecar for {}", sav_path)
+    finally:
+        with _scheduled_conversions_lock:
+            _scheduled_conversions.discard(sav_path)
+
+
+def convert_to_columnar(sav_path: Path) -> Path:
+    """
+    Write a columnar sidecar next to a cached SAV file.
+
+    Every column is stored in its own ``.npy`` file so that readers can memory
+    map exactly the columns they need. Numeric and datetime columns are stored
+    as plain arrays, string columns as UTF-8 bytes plus offsets. Columns that
+    pyreadstat returns as other Python objects, i.e. those with a date or
+    time format, are left out and keep being read from the SAV file. When
+    enabled, the statistics index of the numeric columns is built in the same
+    pass.
+
+    Worker processes converting the same file wait for each other through a
+    lock file, so every file is parsed by one process only. The sidecar is
+    written to a temporary directory first and then renamed, so readers never
+    see a partially written sidecar.
+    """
+    sidecar_path = get_sidecar_path(sav_path)
+    if sidecar_path.exists():
+        return sidecar_path
+
+    with file_lock(get_conversion_lock_path(sav_path)):
+        # Another process may have finished the conversion while we waited
+        if not sidecar_path.exists():
+            _write_sidecar(sav_path, sidecar_path)
+    return sidecar_path
+
+
+def _write_sidecar(sav_path: Path, sidecar_path: Path) -> None:
+    _, meta = pyreadstat.read_sav(str(sav_path), metadataonly=True)
+    column_names = list(meta.column_names)
+    batch_size = max(1, settings.columnar_cache_batch_columns)
+
+    temp_path = Path(
+        tempfile.mkdtemp(prefix=f"{sidecar_path.name}-", dir=sav_path.parent),
+    )
+    try:
+        manifest_columns: Dict[str, Dict[str, str]] = {}
+        column_summaries: Dict[str, Dict[str, Any]] = {}
+        row_count = int(meta.number_rows or 0)
+
+        # Parse the file in batches of columns to bound peak memory
+        for start in range(0, len(column_names), batch_size):
+            usecols = column_names[start : start + batch_size]
+            df, _ = pyreadstat.read_sav(str(sav_path), usecols=usecols)
+            row_count = len(df)
+            for offset, column in enumerate(df.columns):
+                file_stem = str(start + offset)
+                entry = _write_column(df[column], temp_path / file_stem)
+                if entry is not None:
+                    manifest_columns[column] = {"file": file_stem, **entry}
+                if settings.stats_index_enabled:
+                    summary = summarize_column(df[column])
+                    if summary is not None:
+                        column_summaries[column] = summary
+
+        if settings.stats_index_enabled:
+            write_stats_index(temp_path, column_summaries)
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "row_count": row_count,
+            "columns": manifest_columns,
+        }
+        (temp_path / MANIFEST_FILE_NAME).write_text(json.dumps(manifest))
+
+        try:
+            temp_path.rename(sidecar_path)
+        except OSError:
+            # A sidecar is already in place, e.g. from a worker of an older release
+            shutil.rmtree(temp_path, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+
+def remove_sidecar(sav_path: Path) -> None:
+    """Delete the columnar sidecar of a cached SAV file, if there is one."""
+    sidecar_path = get_sidecar_path(sav_path)
+    _manifest_cache.pop(sidecar_path)
+    forget_stats_index(sidecar_path)
+
+    # Move the sidecar out of the way first, so that readers either see the
+    # complete sidecar or none at all.
+    trash_path = sidecar_path.with_name(f".{sidecar_path.name}-{uuid.uuid4().hex}")
+    try:
+        sidecar_path.rename(trash_path)
+    except FileNotFoundError:
+        return
+    shutil.rmtree(trash_path, ignore_errors=True)
+
+
+def _write_column(series: pd.Series, file_stem: Path) -> Optional[Dict[str, str]]:
+    """Write one column to disk and return its manifest entry."""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in _ARRAY_DTYPE_KINDS:
+        np.save(file_stem.with_suffix(".npy"), series.to_numpy())
+        return {"kind": "array", "dtype": str(dtype)}
+
+    if pd.api.types.infer_dtype(series, skipna=True) not in {"string", "empty"}:
+        return None
+
+    nulls = series.isna().to_numpy()
+    encoded = [
+        b"" if is_null else value.encode("utf-8")
+        for value, is_null in zip(series.tolist(), nulls.tolist(), strict=True)
+    ]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in encoded], out=offsets[1:])
+
+    np.save(
+        file_stem.with_suffix(".data.npy"),
+        np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    )
+    np.save(file_stem.with_suffix(".offsets.npy"), offsets)
+    np.save(file_stem.with_suffix(".nulls.npy"), nulls)
+    return {"kind": "string", "dtype": str(dtype)}
+
+
+def read_columnar_columns(sav_path: Path, columns: List[str]) -> Dict[str, pd.Series]:
+    """
+    Read columns from the columnar sidecar of a cached SAV file.
+
+    Plain arrays are memory-mapped, so their pages are loaded lazily and
+    shared with other worker processes through the OS page cache. Columns
+    that are not part of the sidecar are left out of the result, as is
+    everything when no sidecar has been written yet.
+    """
+    sidecar_path = get_sidecar_path(sav_path)
+    manifest = _load_manifest(sidecar_path)
+    if manifest is None:
+        return {}
+
+    result: Dict[str, pd.Series] = {}
+    try:
+        for column in columns:
+            entry = manifest["columns"].get(column)
+            if entry is None:
+                continue
+            file_stem = sidecar_path / entry["file"]
+            if entry["kind"] == "array":
+                values = np.load(file_stem.with_suffix(".npy"), mmap_mode="r")
+                result[column] = pd.Series(values, name=column, copy=False)
+            else:
+                result[column] = pd.Series(
+                    _read_strings(file_stem),
+                    name=column,
+                    dtype=entry["dtype"],
+                )
+    except FileNotFoundError:
+        # The sidecar was evicted by another worker in the meantime
+        _manifest_cache.pop(sidecar_path)
+
+    return result
+
+
+def _read_strings(file_stem: Path) -> List[Any]:
+    data = np.load(file_stem.with_suffix(".data.npy"), mmap_mode="r").tobytes()
+    offsets = np.load(file_stem.with_suffix(".offsets.npy")).tolist()
+    nulls = np.load(file_stem.with_suffix(".nulls.npy")).tolist()
+    return [
+        None if is_null else data[start:end].decode("utf-8")
+        for start, end, is_null in zip(offsets[:-1], offsets[1:], nulls, strict=True)
+    ]
+
+
+def _load_manifest(sidecar_path: Path) -> Optional[Dict[str, Any]]:
+    manifest = _manifest_cache.get(sidecar_path)
+    if manifest is not None:
+        return manifest
+
+    try:
+        manifest = json.loads((sidecar_path / MANIFEST_FILE_NAME).read_text())
+    except FileNotFoundError:
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    _manifest_cache.put(sidecar_path, manifest)
+    return manifest
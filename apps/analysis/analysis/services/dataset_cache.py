@@ -1,14 +1,51 @@
+import asyncio
+import contextlib
+import os
+import shutil
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
 from fastapi import HTTPException, status
 
+from analysis.services.cache import (
+    LRUCache,
+    SingleFlight,
+    dataframe_nbytes,
+    file_lock,
+    try_file_lock,
+)
+from analysis.services.columnar_cache import (
+    get_conversion_lock_path,
+    get_sidecar_path,
+    remove_sidecar,
+    schedule_columnar_conversion,
+)
 from analysis.services.s3_client import S3Client
+from analysis.services.stats_index import load_stats_index
 from analysis.settings import TEMP_DIR, settings
 
 CACHE_DIRECTORY = TEMP_DIR / "analysis-dataset-cache"
 
+# Parsed dataset columns of this worker process, keyed by (file hash, column).
+dataframe_cache = LRUCache(
+    settings.dataframe_cache_max_bytes,
+    sizeof=dataframe_nbytes,
+)
+
+# Dataset downloads in flight in this worker process, keyed by file hash.
+download_flights = SingleFlight()
+
+# Downloads run on their own threads, so that slow transfers do not hold
+# slots of the request threadpool.
+_download_executor = ThreadPoolExecutor(
+    max_workers=settings.dataset_download_workers,
+    thread_name_prefix="dataset-download",
+)
+
 
 def get_cached_dataset_path(file_hash: str, s3_key: str) -> Path:
     """Return a local cached path for a dataset SAV file."""
@@ -16,9 +53,279 @@ def get_cached_dataset_path(file_hash: str, s3_key: str) -> Path:
     cached_path = CACHE_DIRECTORY / f"{file_hash}.sav"
 
     if cached_path.exists():
-        return cached_path
+        _mark_accessed(cached_path)
+    else:
+        download_flights.do(file_hash, _download_once, cached_path, s3_key)
+
+    schedule_columnar_conversion(cached_path)
+    return cached_path
+
+
+async def ensure_dataset_cached(file_hash: str, s3_key: str) -> Path:
+    """
+    Return a local cached path for a dataset SAV file, without blocking.
+
+    Cache hits are answered directly. Downloads run on the dedicated download
+    executor while the caller awaits them.
+    """
+    if (CACHE_DIRECTORY / f"{file_hash}.sav").exists():
+        return get_cached_dataset_path(file_hash, s3_key)
+
+    return await asyncio.wrap_future(
+        _download_executor.submit(get_cached_dataset_path, file_hash, s3_key),
+    )
+
+
+def get_dataset_stats_index(file_hash: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Return the statistics index of a cached dataset, keyed by column.
+
+    Datasets are never downloaded for this. Returns None until the dataset
+    is cached and its columnar copy, which holds the index, has been written.
+    """
+    return load_stats_index(get_sidecar_path(CACHE_DIRECTORY / f"{file_hash}.sav"))
+
+
+def _download_once(cached_path: Path, s3_key: str) -> None:
+    """
+    Download a dataset unless another worker process already did.
+
+    Threads of this process are deduplicated by ``download_flights``. Other
+    worker processes are kept out with a lock file, and see the finished
+    download once they get the lock.
+    """
+    with file_lock(_get_download_lock_path(cached_path)):
+        if cached_path.exists():
+            return
+        _download_dataset_to_cache(cached_path, s3_key)
+
+    enforce_dataset_cache_limit()
+
+
+def _get_download_lock_path(cached_path: Path) -> Path:
+    """Return the lock file held while a dataset is being downloaded."""
+    return cached_path.with_suffix(".lock")
+
+
+def _mark_accessed(cached_path: Path) -> None:
+    """
+    Record an access to a cached dataset.
+
+    The modification time of the SAV file doubles as its last access time,
+    because file systems are often mounted without access time updates.
+    """
+    with contextlib.suppress(FileNotFoundError):
+        os.utime(cached_path)
+
+
+def _list_cache_entries() -> List[Tuple[Path, float, int]]:
+    """Return (path, last access time, size) for every cached dataset."""
+    entries = []
+    for cached_path in CACHE_DIRECTORY.glob("*.sav"):
+        try:
+            stat = cached_path.stat()
+        except FileNotFoundError:
+            continue
+        size = stat.st_size + _directory_size(get_sidecar_path(cached_path))
+        entries.append((cached_path, stat.st_mtime, size))
+    return entries
+
+
+def _is_partial_download(path: Path) -> bool:
+    """
+    Whether a file is a download in progress, or left by an interrupted one.
+
+    Downloads go to ``tmp*.part``, but boto3 writes the data to a file named
+    after it with a random suffix, e.g. ``tmpab12.part.Ab3dE9f1``.
+    """
+    return ".part" in path.suffixes
+
+
+def _partial_downloads_size() -> int:
+    """Return the disk space taken by partial downloads."""
+    size = 0
+    for path in CACHE_DIRECTORY.glob("*.part*"):
+        if not _is_partial_download(path):
+            continue
+        try:
+            size += path.stat().st_size
+        except FileNotFoundError:
+            continue
+    return size
+
+
+def _directory_size(path: Path) -> int:
+    size = 0
+    for file_path in path.glob("*"):
+        try:
+            size += file_path.stat().st_size
+        except FileNotFoundError:
+            continue
+    return size
+
+
+def _remove_cache_entry(cached_path: Path) -> None:
+    """
+    Delete a cached SAV file together with its columnar sidecar.
+
+    Workers that already opened or memory-mapped the files keep reading them,
+    as the data is only released once the last handle is closed.
+    """
+    remove_sidecar(cached_path)
+    cached_path.unlink(missing_ok=True)
+    for lock_path in (
+        _get_download_lock_path(cached_path),
+        get_conversion_lock_path(cached_path),
+    ):
+        _remove_lock_file(lock_path)
+
+
+def _remove_lock_file(lock_path: Path) -> bool:
+    """
+    Delete a lock file unless another process holds it.
+
+    Processes that opened the file before it was deleted may later lock it
+    alongside a process locking its replacement. Downloads and conversions
+    both tolerate that, as they move their results into place atomically.
+    """
+    with try_file_lock(lock_path) as locked:
+        if locked:
+            lock_path.unlink(missing_ok=True)
+        return locked
+
+
+def _remove_leftovers() -> int:
+    """
+    Remove stale files left behind by interrupted downloads and conversions.
+
+    These are partial downloads, temporary and trashed sidecar directories,
+    sidecars whose SAV file was evicted while they were written, and lock
+    files of datasets that are no longer cached. Only leftovers untouched for
+    the eviction grace period are removed, and directories only while no
+    conversion of their dataset is running.
+
+    Returns:
+        The number of removed leftovers.
+    """
+    grace_cutoff = time.time() - settings.dataset_cache_eviction_grace_seconds
+    removed = 0
+    for path in CACHE_DIRECTORY.iterdir():
+        if path.suffix == ".sav" or not _is_stale(path, grace_cutoff):
+            continue
+        if _is_partial_download(path):
+            path.unlink(missing_ok=True)
+            removed += 1
+            continue
+
+        # Everything else is named after the file hash of its dataset
+        file_hash = path.name.lstrip(".").split(".", 1)[0]
+        cached_path = CACHE_DIRECTORY / f"{file_hash}.sav"
+        if _remove_leftover(path, cached_path):
+            removed += 1
+    return removed
+
+
+def _remove_leftover(path: Path, cached_path: Path) -> bool:
+    """Remove a lock file or directory, unless it belongs to a cached dataset."""
+    sidecar_path = get_sidecar_path(cached_path)
+    entry_paths = {
+        sidecar_path,
+        _get_download_lock_path(cached_path),
+        get_conversion_lock_path(cached_path),
+    }
+    if path in entry_paths and cached_path.exists():
+        return False
+
+    if path.suffix == ".lock":
+        return _remove_lock_file(path)
+    if not path.is_dir():
+        return False
+
+    with try_file_lock(get_conversion_lock_path(cached_path)) as locked:
+        if not locked:
+            return False
+        if path == sidecar_path:
+            remove_sidecar(cached_path)
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+    return True
+
+
+def _is_stale(path: Path, grace_cutoff: float) -> bool:
+    try:
+        return path.lstat().st_mtime <= grace_cutoff
+    except FileNotFoundError:
+        return False
+
+
+def enforce_dataset_cache_limit() -> int:
+    """
+    Evict least recently used datasets until the cache fits its byte limit.
+
+    Datasets accessed within the eviction grace period are never evicted, so
+    files that are about to be read by a request stay in place. Stale
+    leftovers of interrupted downloads and conversions are removed first.
+
+    Returns:
+        The number of evicted datasets.
+    """
+    _remove_leftovers()
+    entries = sorted(_list_cache_entries(), key=lambda entry: entry[1])
+    # Partial downloads take up space too, but cannot be evicted
+    total_size = sum(size for _, _, size in entries) + _partial_downloads_size()
+    grace_cutoff = time.time() - settings.dataset_cache_eviction_grace_seconds
+
+    evicted = 0
+    for cached_path, accessed_at, size in entries:
+        if total_size <= settings.dataset_cache_max_bytes:
+            break
+        if accessed_at > grace_cutoff:
+            # Entries are sorted by access time, so all remaining ones are recent
+            break
+        _remove_cache_entry(cached_path)
+        total_size -= size
+        evicted += 1
+
+    return evicted
+
+
+def evict_dataset(file_hash: str) -> bool:
+    """
+    Remove a dataset from the disk cache and from this worker's memory.
+
+    The disk cache is shared by all worker processes, but the in-memory
+    caches are not: other workers keep the dataset's columns until their own
+    caches evict them.
+
+    Returns:
+        True if the dataset was cached on disk.
+    """
+    cached_path = CACHE_DIRECTORY / f"{file_hash}.sav"
+    was_cached = cached_path.exists()
+    _remove_cache_entry(cached_path)
+    dataframe_cache.pop_matching(lambda key: key[0] == file_hash)
+    return was_cached
+
+
+def get_dataset_cache_usage() -> Dict[str, int]:
+    """
+    Return the occupancy of the disk cache for monitoring.
+
+    The size includes partial downloads, the entries only cached datasets.
+    """
+    if not CACHE_DIRECTORY.exists():
+        return {
+            "entries": 0,
+            "size": 0,
+            "max_size": settings.dataset_cache_max_bytes,
+        }
 
-    return _download_dataset_to_cache(cached_path, s3_key)
+    entries = _list_cache_entries()
+    return {
+        "entries": len(entries),
+        "size": sum(size for _, _, size in entries) + _partial_downloads_size(),
+        "max_size": settings.dataset_cache_max_bytes,
+    }
 
 
 def _download_dataset_to_cache(cached_path: Path, s3_key: str) -> Path:
@@ -26,7 +333,7 @@ def _download_dataset_to_cache(cached_path: Path, s3_key: str) -> Path:
     s3_client = S3Client.get_client()
 
     with tempfile.NamedTemporaryFile(
-        suffix=".sav",
+        suffix=".part",
         dir=CACHE_DIRECTORY,
         delete=False,
     ) as temp_file:
@@ -37,6 +344,7 @@ def _download_dataset_to_cache(cached_path: Path, s3_key: str) -> Path:
             Bucket=settings.s3_bucket_name,
             Key=s3_key,
             Filename=str(temp_path),
+            Config=S3Client.get_transfer_config(),
         )
 
         try:
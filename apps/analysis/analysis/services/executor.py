@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from analysis.settings import settings
+
+
+class InstrumentedExecutor:
+    """
+    Thread pool for CPU-bound request work, with usage counters.
+
+    Work is awaited from the event loop, so a long computation only occupies
+    one of the pool's threads while other requests keep being served. The
+    counters record how long tasks waited for a free thread and how long they
+    ran, which shows whether the pool is sized correctly.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix,
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool and wait for its result."""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """Schedule ``func(*args)`` on the pool from outside the event loop."""
+        with self._lock:
+            self.queued += 1
+        future = self._executor.submit(self._run, time.perf_counter(), func, *args)
+        future.add_done_callback(self._discard_cancelled)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        """Return usage counters for monitoring."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "failed": self.failed,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "run_seconds": round(self.run_seconds, 3),
+            }
+
+    def _run(self, submitted_at: float, func: Callable[..., Any], *args: Any) -> Any:
+        started_at = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.wait_seconds += started_at - submitted_at
+
+        failed = False
+        try:
+            return func(*args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.failed += failed
+                self.run_seconds += time.perf_counter() - started_at
+
+    def _discard_cancelled(self, future: Future) -> None:
+        # Tasks cancelled before they started never reach _run
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+
+compute_executor = InstrumentedExecutor(
+    max_workers=settings.compute_workers,
+    thread_name_prefix="compute",
+)
+
+# Describes parts of a large stats request in parallel. Tasks are submitted
+# from compute threads, so this must be a separate pool to avoid deadlocks.
+stats_executor = InstrumentedExecutor(
+    max_workers=settings.stats_workers,
+    thread_name_prefix="stats",
+)
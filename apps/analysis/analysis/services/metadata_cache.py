@@ -0,0 +1,80 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from analysis.db.models.models import Dataset, DatasetVariable
+from analysis.services.cache import LRUCache
+from analysis.settings import settings
+
+
+def _variable_key(dataset: Dataset, name: str) -> Hashable:
+    # A new file or any update to the dataset makes its old variables unreachable
+    return (str(dataset.id), dataset.file_hash, dataset.updated_at, name)
+
+
+class MetadataCache:
+    """
+    Per-worker cache of dataset rows and their variable metadata.
+
+    Dataset rows are kept for a limited time, after which they are loaded
+    from the database again. Variables are cached per dataset version, as
+    identified by the file hash and ``updated_at`` of the dataset row, so
+    they are invalidated as soon as a reloaded row has changed.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.datasets = LRUCache(max_entries, ttl=ttl)
+        self.variables = LRUCache(max_entries, ttl=ttl)
+
+    def get_dataset(self, dataset_id: str) -> Optional[Dataset]:
+        """Return a cached dataset row."""
+        return self.datasets.get(dataset_id)
+
+    def put_dataset(self, dataset_id: str, dataset: Dataset) -> None:
+        """Cache a dataset row loaded from the database."""
+        self.datasets.put(dataset_id, dataset)
+
+    def get_variables(
+        self,
+        dataset: Dataset,
+        names: List[str],
+    ) -> Tuple[Dict[str, DatasetVariable], List[str]]:
+        """Return the cached variables of a dataset and the names not cached."""
+        found: Dict[str, DatasetVariable] = {}
+        missing: List[str] = []
+        for name in names:
+            variable = self.variables.get(_variable_key(dataset, name))
+            if variable is None:
+                missing.append(name)
+            else:
+                found[name] = variable
+        return found, missing
+
+    def put_variables(
+        self,
+        dataset: Dataset,
+        variables: Dict[str, DatasetVariable],
+    ) -> None:
+        """Cache variables loaded from the database."""
+        for name, variable in variables.items():
+            self.variables.put(_variable_key(dataset, name), variable)
+
+    def evict_file_hash(self, file_hash: str) -> int:
+        """Drop the variables of a dataset file and return how many were cached."""
+        return self.variables.pop_matching(lambda key: key[1] == file_hash)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self.datasets.clear()
+        self.variables.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return usage counters for monitoring."""
+        return {
+            "datasets": self.datasets.stats(),
+            "variables": self.variables.stats(),
+        }
+
+
+metadata_cache = MetadataCache(
+    ttl=settings.metadata_cache_ttl_seconds,
+    max_entries=settings.metadata_cache_max_entries,
+)
@@ -0,0 +1,195 @@
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis.services.cache import LRUCache, freeze
+
+_spec_cache = LRUCache(max_size=4096)
+
+
+@dataclass(frozen=True, eq=False)
+class MissingValueSpec:
+    """
+    Missing values and ranges of a variable, compiled for vectorized lookups.
+
+    ``points`` holds the missing values, ``lows`` and ``highs`` the bounds of
+    the missing ranges, merged into sorted, non-overlapping intervals.
+    """
+
+    values: tuple[int | float, ...]
+    ranges: tuple[tuple[float, float], ...]
+    points: np.ndarray
+    lows: np.ndarray
+    highs: np.ndarray
+    # Whether missing values or ranges were configured at all, even if empty
+    has_values: bool
+    has_ranges: bool
+
+    @property
+    def is_active(self) -> bool:
+        """Whether applying the spec modifies a variable."""
+        return self.has_values or self.has_ranges
+
+    def contains(self, numbers: np.ndarray) -> np.ndarray:
+        """Return a mask of the numbers that are missing values or in a range."""
+        return np.isin(numbers, self.points) | self._in_ranges(numbers)
+
+    def point_mask(self, variable: pd.Series) -> np.ndarray:
+        """Return a mask of the rows holding one of the missing values."""
+        if is_plain_numeric(variable):
+            return np.isin(variable.to_numpy(dtype=np.float64), self.points)
+        return variable.isin(self.values).to_numpy(dtype=bool)
+
+    def range_mask(self, variable: pd.Series) -> np.ndarray:
+        """Return a mask of the rows within one of the missing ranges."""
+        if is_plain_numeric(variable):
+            return self._in_ranges(variable.to_numpy(dtype=np.float64))
+
+        mask = np.zeros(len(variable), dtype=bool)
+        for lo, hi in self.ranges:
+            mask |= ((variable >= lo) & (variable <= hi)).to_numpy(dtype=bool)
+        return mask
+
+    def mask(self, variable: pd.Series) -> np.ndarray:
+        """Return a mask of the rows that are missing."""
+        return self.point_mask(variable) | self.range_mask(variable)
+
+    def _in_ranges(self, numbers: np.ndarray) -> np.ndarray:
+        if len(self.lows) == 0:
+            return np.zeros(len(numbers), dtype=bool)
+        # Find the last interval starting at or before each number
+        interval = np.searchsorted(self.lows, numbers, side="right") - 1
+        return (interval >= 0) & (numbers <= self.highs[np.maximum(interval, 0)])
+
+
+def compile_missing_value_spec(
+    missing_values: list[str | int | float] | None = None,
+    missing_ranges: Optional[List[Dict[str, float]]] = None,
+) -> MissingValueSpec:
+    """
+    Compile the missing values and ranges of a variable.
+
+    Compiled specs are cached, so variables sharing the same definition, or
+    requested repeatedly, are only compiled once per worker.
+
+    Raises:
+        ValueError: If any missing value cannot be converted to a number
+    """
+    key = _spec_key(missing_values, missing_ranges)
+    spec = _spec_cache.get(key)
+    if spec is None:
+        spec = _compile(missing_values, missing_ranges)
+        _spec_cache.put(key, spec)
+    return spec
+
+
+def convert_to_numeric_missing_values(missing_values: list) -> list:
+    """
+    Converts missing_values to numeric types (int or float).
+
+    Args:
+        missing_values: List of values to convert to numeric
+
+    Returns:
+        List of converted numeric values
+
+    Raises:
+        ValueError: If any value cannot be converted to a numeric type
+    """
+    converted_values = []
+
+    for i, value in enumerate(missing_values):
+        # If already numeric, keep as is
+        if isinstance(value, (int, float)):
+            converted_values.append(value)
+            continue
+
+        # Try to convert string to numeric
+        if isinstance(value, str):
+            # Remove whitespace
+            stripped_value = value.strip()
+
+            # Try to convert to int first (for whole numbers)
+            try:
+                # Check if it's a whole number (no decimal point or .0)
+                if "." not in stripped_value or stripped_value.endswith(".0"):
+                    int_val = int(
+                        float(stripped_value),
+                    )  # Convert via float to handle "123.0"
+                    converted_values.append(int_val)
+                else:
+                    # Convert to float for decimal numbers
+                    float_val = float(stripped_value)
+                    converted_values.append(float_val)
+                continue
+            except ValueError:
+                pass  # Will raise error below
+
+        # If we get here, conversion failed
+        raise ValueError(
+            f"Cannot convert missing_values[{i}] = '{stripped_value if isinstance(value, str) else value}' "
+            f"(type: {type(value).__name__}) "
+            f"to a numeric value. All missing_values must be numeric "
+            f"or convertible to numeric.",
+        )
+
+    return converted_values
+
+
+def _compile(
+    missing_values: list[str | int | float] | None,
+    missing_ranges: Optional[List[Dict[str, float]]],
+) -> MissingValueSpec:
+    values = (
+        tuple(convert_to_numeric_missing_values(missing_values))
+        if missing_values is not None
+        else ()
+    )
+
+    ranges = []
+    for range_obj in missing_ranges or []:
+        if (
+            not isinstance(range_obj, dict)
+            or "lo" not in range_obj
+            or "hi" not in range_obj
+        ):
+            continue
+        try:
+            ranges.append((float(range_obj["lo"]), float(range_obj["hi"])))
+        except TypeError, ValueError:
+            continue
+
+    # Merge overlapping ranges, so that every number falls into at most one
+    lows: list[float] = []
+    highs: list[float] = []
+    for lo, hi in sorted((lo, hi) for lo, hi in ranges if lo <= hi):
+        if highs and lo <= highs[-1]:
+            highs[-1] = max(highs[-1], hi)
+        else:
+            lows.append(lo)
+            highs.append(hi)
+
+    return MissingValueSpec(
+        values=values,
+        ranges=tuple(ranges),
+        points=np.unique(np.array(values, dtype=np.float64)),
+        lows=np.array(lows, dtype=np.float64),
+        highs=np.array(highs, dtype=np.float64),
+        has_values=missing_values is not None,
+        has_ranges=bool(ranges),
+    )
+
+
+def _spec_key(
+    missing_values: list[str | int | float] | None,
+    missing_ranges: Optional[List[Dict[str, float]]],
+) -> Hashable:
+    return (freeze(missing_values), freeze(missing_ranges))
+
+
+def is_plain_numeric(variable: pd.Series) -> bool:
+    """Whether a variable has a NumPy integer or float dtype."""
+    dtype = variable.dtype
+    return isinstance(dtype, np.dtype) and dtype.kind in "iuf"
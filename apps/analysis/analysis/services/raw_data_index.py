@@ -0,0 +1,184 @@
+import re
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from analysis.services.cache import LRUCache, dataframe_nbytes
+from analysis.services.stats import PositionIndex, non_empty_positions
+from analysis.settings import settings
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into case-insensitive words."""
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+
+@dataclass(frozen=True)
+class TokenIndex:
+    """
+    Inverted index of the words in the values of a variable.
+
+    ``tokens`` holds the distinct words in lower case, as they are shown to
+    users. Every occurrence of a word is a pair of the word's code in
+    ``tokens`` and the position of its row, stored in ``codes`` and
+    ``positions``. ``size`` is the number of rows.
+    """
+
+    tokens: pd.Series
+    codes: np.ndarray
+    positions: np.ndarray
+    size: int
+
+    @property
+    def nbytes(self) -> int:
+        """The in-memory size of the index."""
+        return dataframe_nbytes(self.tokens) + self.codes.nbytes + self.positions.nbytes
+
+    @classmethod
+    def build(cls, variable: pd.Series, positions: Sequence[int]) -> "TokenIndex":
+        """Index the words of the values at the given positions of a variable."""
+        values = variable.iloc[positions]
+        if not isinstance(values.dtype, pd.StringDtype):
+            values = pd.Series([str(v) for v in values.tolist()], dtype="str")
+        values.index = np.asarray(positions)
+
+        # Lower case keeps spellings such as "Straße", which casefold turns
+        # into "strasse"; matching ignores case with ``folded_tokens``
+        words = values.str.lower().str.findall(_TOKEN_PATTERN).explode().dropna()
+        codes, tokens = pd.factorize(words.to_numpy())
+        return cls(
+            tokens=pd.Series(tokens, dtype="str"),
+            codes=codes.astype(np.int32),
+            positions=words.index.to_numpy(dtype=np.int32),
+            size=len(variable),
+        )
+
+    def folded_tokens(self) -> pd.Series:
+        """Return the distinct words casefolded, for case-insensitive matching."""
+        return self.tokens.str.casefold()
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Return the positions of the rows matching a search query.
+
+        A row matches if every word of the query occurs in one of its words,
+        e.g. "serv" matches "Great service!". Words are matched by scanning
+        the distinct words only, which are far fewer than the rows.
+        """
+        matches = np.ones(self.size, dtype=bool)
+        folded_tokens = self.folded_tokens()
+        for word in tokenize(query):
+            hits = folded_tokens.str.contains(word, regex=False).to_numpy(dtype=bool)
+            rows = np.zeros(self.size, dtype=bool)
+            rows[self.positions[hits[self.codes]]] = True
+            matches &= rows
+        return np.flatnonzero(matches)
+
+
+class RawDataIndex:
+    """
+    Per-worker cache of the positions of non-empty values of variables.
+
+    Positions are keyed by the dataset file hash, the variable and whether
+    empty values are excluded. They are found once per variable, after which
+    any page of raw values is a slice of the cached positions, no matter how
+    far into the variable it is. Searched variables also keep a token index,
+    built on their first search.
+    """
+
+    def __init__(self, max_bytes: int, max_token_bytes: int) -> None:
+        self.positions = LRUCache(max_bytes, sizeof=lambda value: value.nbytes)
+        self.tokens = LRUCache(max_token_bytes, sizeof=lambda value: value.nbytes)
+
+    def for_file(self, file_hash: str, search: Optional[str] = None) -> PositionIndex:
+        """
+        Return the position index of a dataset file, for ``RawDataService``.
+
+        With a search query, only the positions of matching values are
+        returned. Queries without any words match all values.
+        """
+        if search is not None and tokenize(search):
+            return partial(self.search_positions, file_hash, search)
+        return partial(self.get_positions, file_hash)
+
+    def get_positions(
+        self,
+        file_hash: str,
+        variable_name: str,
+        variable: pd.Series,
+        exclude_empty: bool,
+    ) -> Sequence[int]:
+        """Return the positions of the values of a variable to page through."""
+        if not exclude_empty:
+            return range(len(variable))
+
+        key = (file_hash, variable_name, exclude_empty)
+        positions = self.positions.get(key)
+        if positions is None:
+            positions = non_empty_positions(variable)
+            self.positions.put(key, positions)
+        return positions
+
+    def token_index_for_file(
+        self,
+        file_hash: str,
+    ) -> Callable[[str, pd.Series], TokenIndex]:
+        """Return the token indexes of a dataset file, by variable name."""
+        return partial(self.get_token_index, file_hash)
+
+    def get_token_index(
+        self,
+        file_hash: str,
+        variable_name: str,
+        variable: pd.Series,
+    ) -> TokenIndex:
+        """Return the token index of a variable, building it on first use."""
+        # Empty values never contain a word, so only non-empty ones are indexed
+        key = (file_hash, variable_name)
+        index = self.tokens.get(key)
+        if index is None:
+            index = TokenIndex.build(
+                variable,
+                self.get_positions(file_hash, variable_name, variable, True),
+            )
+            self.tokens.put(key, index)
+        return index
+
+    def search_positions(
+        self,
+        file_hash: str,
+        search: str,
+        variable_name: str,
+        variable: pd.Series,
+        exclude_empty: bool,
+    ) -> Sequence[int]:
+        """Return the positions of the values of a variable matching a search."""
+        return self.get_token_index(file_hash, variable_name, variable).search(search)
+
+    def evict_file_hash(self, file_hash: str) -> int:
+        """Drop the indexes of a dataset file and return how many were cached."""
+        evicted = self.positions.pop_matching(lambda key: key[0] == file_hash)
+        return evicted + self.tokens.pop_matching(lambda key: key[0] == file_hash)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self.positions.clear()
+        self.tokens.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return usage counters for monitoring."""
+        return {
+            "positions": self.positions.stats(),
+            "tokens": self.tokens.stats(),
+        }
+
+
+raw_data_index = RawDataIndex(
+    max_bytes=settings.raw_data_index_max_bytes,
+    max_token_bytes=settings.raw_data_token_index_max_bytes,
+)
@@ -0,0 +1,107 @@
+import dataclasses
+from typing import AbstractSet, Any, Dict, Hashable, Optional
+
+from analysis.services.cache import LRUCache, SingleFlight, freeze
+from analysis.services.stats import VariableStatsRequest
+from analysis.settings import settings
+
+
+def result_key(
+    file_hash: str,
+    request: VariableStatsRequest,
+    include: list[str] | None = None,
+    decimal_places: int | None = 2,
+) -> Hashable:
+    """Return the signature of a variable's statistics, as used for caching."""
+    # The request holds the variable, its split variable and all of their
+    # metadata, so changed metadata makes old results unreachable
+    return (
+        file_hash,
+        freeze(dataclasses.asdict(request)),
+        freeze(include),
+        decimal_places,
+    )
+
+
+class StatsResultCache:
+    """
+    Per-worker cache of computed variable statistics.
+
+    Results are keyed by the dataset file hash and everything that affects
+    them: the variable, its split variable, their missing values and value
+    labels, the requested statistics and the decimal places. A new dataset
+    file or changed metadata therefore never serves stale results.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.results = LRUCache(max_entries)
+
+    def get(
+        self,
+        file_hash: str,
+        request: VariableStatsRequest,
+        include: list[str] | None = None,
+        decimal_places: int | None = 2,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached statistics of a variable."""
+        return self.results.get(
+            result_key(file_hash, request, include, decimal_places),
+        )
+
+    def put(
+        self,
+        file_hash: str,
+        request: VariableStatsRequest,
+        stats: Dict[str, Any],
+        include: list[str] | None = None,
+        decimal_places: int | None = 2,
+    ) -> None:
+        """Cache the statistics computed for a variable."""
+        self.results.put(
+            result_key(file_hash, request, include, decimal_places),
+            stats,
+        )
+
+    def evict_file_hash(self, file_hash: str) -> int:
+        """Drop the results of a dataset file and return how many were cached."""
+        return self.results.pop_matching(lambda key: key[0] == file_hash)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self.results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return usage counters, including the hit ratio, for monitoring."""
+        stats: Dict[str, Any] = self.results.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else None
+        return stats
+
+
+stats_result_cache = StatsResultCache(
+    max_entries=settings.stats_result_cache_max_entries,
+)
+
+# Statistics computations in flight in this worker process, keyed by the
+# result key of every variable they describe.
+stats_flights = SingleFlight()
+
+
+def word_frequency_key(
+    file_hash: str,
+    request: VariableStatsRequest,
+    top_n: int,
+    stopwords: AbstractSet[str],
+) -> Hashable:
+    """Return the signature of a variable's word frequencies, as used for caching."""
+    return (
+        file_hash,
+        freeze(dataclasses.asdict(request)),
+        top_n,
+        frozenset(stopwords),
+    )
+
+
+# Word frequencies computed by this worker process, keyed by
+# word_frequency_key. Results are a few KB per variable.
+word_frequency_cache = LRUCache(settings.word_frequency_cache_max_entries)
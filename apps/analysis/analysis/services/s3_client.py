@@ -2,6 +2,7 @@ import logging
 from typing import Optional
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from boto3.session import Session
 from botocore.client import BaseClient
 
@@ -27,6 +28,7 @@ class S3Client:
                         "endpoint": settings.s3_endpoint,
                         "bucket": settings.s3_bucket_name,
                         "access_key_set": bool(settings.s3_access_key_id),
+                        "max_pool_connections": settings.s3_max_pool_connections,
                     },
                 )
 
@@ -40,7 +42,10 @@ class S3Client:
 
                 client_config = {
                     "service_name": "s3",
-                    "config": boto3.session.Config(signature_version="s3v4"),
+                    "config": boto3.session.Config(
+                        signature_version="s3v4",
+                        max_pool_connections=settings.s3_max_pool_connections,
+                    ),
                 }
 
                 client_config["endpoint_url"] = endpoint_url
@@ -54,3 +59,18 @@ class S3Client:
                 raise
 
         return cls._instance
+
+    @staticmethod
+    def get_transfer_config() -> TransferConfig:
+        """
+        Get the transfer settings for downloads.
+
+        Objects larger than one part are fetched as byte ranges of that size,
+        with up to ``s3_transfer_concurrency`` ranges in parallel.
+        """
+        return TransferConfig(
+            multipart_threshold=settings.s3_transfer_part_size,
+            multipart_chunksize=settings.s3_transfer_part_size,
+            max_concurrency=settings.s3_transfer_concurrency,
+            use_threads=settings.s3_transfer_concurrency > 1,
+        )
@@ -1,10 +1,79 @@
-from typing import Any, Dict, List, Optional
-
+import bisect
+import itertools
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+import numpy as np
 import pandas as pd
 
+from analysis.services.missing_values import (
+    MissingValueSpec,
+    compile_missing_value_spec,
+    is_plain_numeric,
+)
+
+_Frame = TypeVar("_Frame", pd.Series, pd.DataFrame)
+
+# Multi-response sets with up to this many split categories are counted as a
+# matrix product, in blocks of rows
+_ONE_HOT_MAX_CATEGORIES = 64
+_ONE_HOT_BLOCK_ROWS = 1 << 16
+
+_DEFAULT_NUMERIC_STATS = [
+    "count",
+    "frequencies",
+    "mean",
+    "std",
+    "min",
+    "max",
+    "median",
+    "range",
+    "mode",
+]
+
+
+@dataclass
+class VariableStatsRequest:
+    """A variable to describe with ``StatisticsService.describe_many``."""
+
+    variable_name: str
+    missing_values: list[str | int | float] | None = None
+    missing_ranges: Optional[List[Dict[str, float]]] = None
+    value_labels: dict[str, str] | None = None
+    split_variable: str | None = None
+    split_variable_value_labels: dict[str, str] | None = None
+    split_variable_missing_values: list[str | int | float] | None = None
+    split_variable_missing_ranges: Optional[List[Dict[str, float]]] = None
+
+
+# A batched variable: its position in the request, the request and its spec
+_BatchMember = tuple[int, VariableStatsRequest, MissingValueSpec]
+
+# Returns the positions of all values of a variable to page through, given
+# the variable name, the variable and whether empty values are excluded
+PositionIndex = Callable[[str, pd.Series, bool], Sequence[int]]
+
 
 class RawDataService:
-    """Service for fetching raw data values from variables."""
+    """
+    Service for fetching raw data values from variables.
+
+    ``position_index`` returns the positions of the values to page through,
+    e.g. from a cache. Without it, the values of each request are found by
+    scanning up to ``max_values`` rows.
+    """
+
+    def __init__(self, position_index: Optional[PositionIndex] = None) -> None:
+        self.position_index = position_index
 
     def get_raw_values(
         self,
@@ -14,6 +83,7 @@ class RawDataService:
         max_values: int = 1000,
         page: int = 1,
         page_size: int = 5,
+        cursor: Optional[int] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """
         Get raw values for specified variables from a DataFrame.
@@ -25,6 +95,9 @@ class RawDataService:
             max_values: Maximum total number of values to consider per variable.
             page: 1-based page number to return.
             page_size: Number of values per page.
+            cursor: Row position of the last value of the previous page, as
+                returned in ``nextCursor``. When given, the page starts after
+                that row and ``page`` is ignored.
 
         Returns:
             A dictionary mapping variable names to their raw data:
@@ -36,6 +109,7 @@ class RawDataService:
                     "totalNonEmptyCount": 8,
                     "totalPages": 2,
                     "page": 1,
+                    "nextCursor": 4,
                 }
             }
         """
@@ -50,6 +124,7 @@ class RawDataService:
                     "totalNonEmptyCount": 0,
                     "totalPages": 0,
                     "page": page,
+                    "nextCursor": None,
                     "error": f"Variable '{variable_name}' not found in the DataFrame.",
                 }
                 continue
@@ -57,38 +132,31 @@ class RawDataService:
             variable = data[variable_name]
             total_count = len(variable)
 
-            # Get all values
-            values = variable.tolist()
-
-            # Filter out empty/null values if requested
-            if exclude_empty:
-                values = [
-                    v
-                    for v in values
-                    if v is not None and not pd.isna(v) and str(v).strip() != ""
-                ]
-
-            # Convert all values to strings for consistent serialization
-            values = [str(v) for v in values]
-
-            # Limit to max_values before pagination
-            if len(values) > max_values:
-                values = values[:max_values]
-
-            total_non_empty_count = len(values)
+            # Positions of the values to consider, limited to max_values
+            if self.position_index is None:
+                positions = self._value_positions(variable, exclude_empty, max_values)
+            else:
+                positions = self.position_index(variable_name, variable, exclude_empty)
+                if len(positions) > max_values:
+                    positions = positions[:max_values]
+            total_non_empty_count = len(positions)
 
             # Calculate total pages
             total_pages = max(
                 1, -(-total_non_empty_count // page_size)
             )  # ceiling division
 
-            # Clamp page to valid range
-            clamped_page = max(1, min(page, total_pages))
-
-            # Slice for current page
-            start = (clamped_page - 1) * page_size
+            if cursor is None:
+                # Clamp page to valid range
+                clamped_page = max(1, min(page, total_pages))
+                start = (clamped_page - 1) * page_size
+            else:
+                start = bisect.bisect_right(positions, cursor)
+                clamped_page = min(start // page_size + 1, total_pages)
             end = start + page_size
-            page_values = values[start:end]
+
+            # Only the values of the current page are converted to strings
+            page_values = [str(v) for v in variable.iloc[positions[start:end]].tolist()]
 
             result[variable_name] = {
                 "values": page_values,
@@ -97,10 +165,46 @@ class RawDataService:
                 "totalNonEmptyCount": total_non_empty_count,
                 "totalPages": total_pages,
                 "page": clamped_page,
+                "nextCursor": (
+                    int(positions[end - 1]) if end < total_non_empty_count else None
+                ),
             }
 
         return result
 
+    def _value_positions(
+        self,
+        variable: pd.Series,
+        exclude_empty: bool,
+        max_values: int,
+    ) -> Sequence[int]:
+        """
+        Return the positions of the values to page through.
+
+        Empty values are found with vectorized checks, chunk by chunk, and
+        the scan stops as soon as ``max_values`` values have been found.
+        """
+        if not exclude_empty:
+            positions: Sequence[int] = range(len(variable))
+        else:
+            chunks = []
+            found = 0
+            chunk_size = max(2 * max_values, 1024)
+            start = 0
+            while start < len(variable) and (max_values < 0 or found < max_values):
+                chunk = variable.iloc[start : start + chunk_size]
+                chunk_positions = np.flatnonzero(_non_empty_mask(chunk)) + start
+                chunks.append(chunk_positions)
+                found += len(chunk_positions)
+                start += chunk_size
+                chunk_size *= 2
+            positions = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.intp)
+
+        # Limit to max_values before pagination
+        if len(positions) > max_values:
+            positions = positions[:max_values]
+        return positions
+
 
 class StatisticsService:
     """Service for calculating descriptive statistics for variables."""
@@ -163,14 +267,9 @@ class StatisticsService:
             split_variable is provided, returns statistics broken down by split
             variable categories.
         """
-        if variable_name not in data.columns:
-            raise ValueError(f"Variable '{variable_name}' not found in the DataFrame.")
+        require_columns(data, variable_name, split_variable)
 
         if split_variable is not None:
-            if split_variable not in data.columns:
-                raise ValueError(
-                    f"Split variable '{split_variable}' not found in the DataFrame.",
-                )
             return self._describe_var_with_split(
                 data,
                 variable_name,
@@ -185,176 +284,650 @@ class StatisticsService:
                 decimal_places,
             )
 
-        if missing_values is not None:
-            data = self._apply_missing_values(data, variable_name, missing_values)
-
-        # Apply missing ranges to mark values within ranges as missing
-        if missing_ranges is not None:
-            data = self._apply_missing_ranges(data, variable_name, missing_ranges)
+        missing_spec = compile_missing_value_spec(missing_values, missing_ranges)
+        variable = self._apply_missing_spec(data[variable_name], missing_spec)
 
         return self._calculate_single_var_stats(
-            data,
-            variable_name,
+            variable,
             include,
-            missing_values,
-            missing_ranges,
+            missing_spec,
             value_labels,
             decimal_places,
         )
 
-    def _apply_missing_values(
-        self,
-        data: pd.DataFrame,
-        variable_name: str,
-        missing_values: list[str | int | float],
-    ) -> pd.DataFrame:
-        """Mark configured missing values as ``pd.NA`` for a single variable."""
-        numeric_missing_values = self._convert_to_numeric_missing_values(missing_values)
-        data = data.copy()
-        mask = data[variable_name].isin(numeric_missing_values)
-        data.loc[mask, variable_name] = pd.NA
-        return data
-
-    def _apply_missing_ranges(
+    def describe_from_index(
         self,
-        data: pd.DataFrame,
-        variable_name: str,
+        summary: Dict[str, Any],
+        include: list[str] | None = None,
+        missing_values: list[str | int | float] | None = None,
         missing_ranges: Optional[List[Dict[str, float]]] = None,
-    ) -> pd.DataFrame:
+        value_labels: dict[str, str] | None = None,
+        decimal_places: int | None = 2,
+    ) -> dict | None:
         """
-        Apply missing ranges to mark values within specified ranges as missing (pd.NA).
+        Describe a variable without a split from its statistics index entry.
+
+        Without missing values or ranges, the statistics stored in the index
+        are used as they are. Otherwise they are derived from the exact value
+        counts in the index, which only columns with few distinct values have.
+        Continuous columns therefore only answer requests without missing
+        values, frequencies or mode, which excludes the default statistics.
+        The mean and standard deviation are then computed from the counts,
+        which can differ from ``describe_var`` in the last digits of unrounded
+        values.
 
         Args:
-            data: The input DataFrame to modify
-            variable_name: The name of the variable to apply missing ranges to
-            missing_ranges: List of range objects with 'lo' and 'hi' keys
-                defining inclusive ranges
+            summary: The index entry of the variable, see ``summarize_column``.
+            include: The statistics to calculate, as for ``describe_var``.
+            missing_values: Values to treat as missing.
+            missing_ranges: Ranges of values to treat as missing.
+            value_labels: Value labels for the frequency table.
+            decimal_places: Number of decimal places to round to.
 
         Returns:
-            Modified DataFrame with values in specified ranges replaced with pd.NA
+            The statistics ``describe_var`` returns for the variable, or None
+            if the index entry cannot answer the request.
         """
-        if missing_ranges is None:
-            return data
+        if include is None:
+            include = _DEFAULT_NUMERIC_STATS
+
+        missing_spec = compile_missing_value_spec(missing_values, missing_ranges)
+        has_counts = "values" in summary
+        if not has_counts and (
+            missing_spec.is_active or "mode" in include or "frequencies" in include
+        ):
+            return None
+
+        if has_counts:
+            values = np.array(summary["values"], dtype=summary["dtype"])
+            counts = np.array(summary["counts"], dtype=np.int64)
+
+        if missing_spec.is_active:
+            # Applying missing values turns the variable into floats
+            values = values.astype(np.float64)
+            keep = ~missing_spec.contains(values)
+            values = values[keep]
+            counts = counts[keep]
+            raw_stats = _stats_from_counts(values, counts)
+        else:
+            raw_stats = summary["stats"]
 
-        # Make a copy to avoid modifying the original data
-        data = data.copy()
-        variable = data[variable_name]
+        stats = {}
+        if "count" in include:
+            stats["count"] = raw_stats["count"]
+        if "mode" in include:
+            stats["mode"] = raw_stats["mode"]
+        for name in ("mean", "std", "min", "max", "median", "range"):
+            if name in include:
+                stats[name] = self._round_stat(raw_stats[name], decimal_places)
 
-        # Apply each range for this variable
-        for range_obj in missing_ranges:
-            if (
-                not isinstance(range_obj, dict)
-                or "lo" not in range_obj
-                or "hi" not in range_obj
-            ):
-                continue
+        if "frequencies" in include:
+            stats["frequency_table"] = self._frequency_table_from_counts(
+                pd.Series(counts, index=values),
+                missing_spec,
+                value_labels,
+                decimal_places,
+            )
 
-            lo = range_obj["lo"]
-            hi = range_obj["hi"]
+        return stats
+
+    def describe_many(
+        self,
+        data: pd.DataFrame,
+        variables: List[VariableStatsRequest],
+        include: list[str] | None = None,
+        decimal_places: int | None = 2,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generates descriptive statistics for many variables of a DataFrame.
+
+        Numeric variables are grouped by dtype and split variable and described
+        together: their statistics are computed with column-wise reductions
+        over one 2-D block per group, and split variables are factorized and
+        sorted once per group. Other variables are described one by one with
+        ``describe_var``. The statistics are identical in both cases.
+
+        Args:
+            data: The input DataFrame.
+            variables: The variables to describe, with their metadata.
+            include: The statistics to calculate, as for ``describe_var``.
+            decimal_places: Number of decimal places to round to, as for
+                           ``describe_var``.
+
+        Returns:
+            One result per requested variable, in request order. A result holds
+            either the ``stats`` of the variable, or an ``error`` message if it
+            could not be described.
+        """
+        results: List[Dict[str, Any] | None] = [None] * len(variables)
+        batches: Dict[Hashable, List[_BatchMember]] = {}
+
+        for position, request in enumerate(variables):
+            if not self._can_batch(data, request):
+                results[position] = self._describe_one(
+                    data,
+                    request,
+                    include,
+                    decimal_places,
+                )
+                continue
 
-            # Create mask for values within the range (inclusive)
-            mask = (variable >= lo) & (variable <= hi)
+            try:
+                missing_spec = compile_missing_value_spec(
+                    request.missing_values,
+                    request.missing_ranges,
+                )
+                split_spec = (
+                    compile_missing_value_spec(
+                        request.split_variable_missing_values,
+                        request.split_variable_missing_ranges,
+                    )
+                    if request.split_variable is not None
+                    else None
+                )
+            except ValueError as e:
+                results[position] = {"variable": request.variable_name, "error": str(e)}
+                continue
 
-            # Replace values within range with pd.NA
-            data.loc[mask, variable_name] = pd.NA
+            # Compiled specs are cached, so equal definitions share one object
+            dtype = _block_dtype(data[request.variable_name].dtype, missing_spec)
+            batch_key = (request.split_variable, split_spec, dtype)
+            batches.setdefault(batch_key, []).append((position, request, missing_spec))
+
+        for (split_variable, split_spec, dtype), members in batches.items():
+            if split_variable is None:
+                batch_stats = self._describe_block(
+                    self._build_block(data, dtype, members),
+                    members,
+                    include,
+                    decimal_places,
+                )
+            else:
+                batch_stats = self._describe_block_with_split(
+                    data,
+                    split_variable,
+                    split_spec,
+                    dtype,
+                    members,
+                    include,
+                    decimal_places,
+                )
+            for position, request, _ in members:
+                results[position] = {
+                    "variable": request.variable_name,
+                    "stats": batch_stats[position],
+                }
 
-        return data
+        return results
 
-    def _convert_to_numeric_missing_values(self, missing_values: list) -> list:
+    def crosstab(
+        self,
+        data: pd.DataFrame,
+        request: VariableStatsRequest,
+        decimal_places: int | None = 2,
+    ) -> Dict[str, Any]:
         """
-        Converts missing_values to numeric types (int or float).
+        Cross-tabulate a variable with its split variable.
+
+        Rows are the categories of the variable, columns those of the split
+        variable. Rows where either variable is missing are left out, and
+        labelled categories that do not occur are included with zero counts.
+        Categories are keyed and sorted as in frequency tables. All cells are
+        counted with a single ``np.bincount`` over the combined category codes.
 
         Args:
-            missing_values: List of values to convert to numeric
+            data: The input DataFrame.
+            request: The variable and split variable, with their metadata.
+            decimal_places: Number of decimal places to round percentages to.
 
         Returns:
-            List of converted numeric values
+            The row and column categories and R x C matrices of counts and of
+            row, column and total percentages:
+            {
+                "rows": [{"value": "1.0", "label": "Yes"}, ...],
+                "columns": [{"value": "1.0", "label": "Female"}, ...],
+                "counts": [[12, 8], [5, 15]],
+                "row_percentages": [[60.0, 40.0], [25.0, 75.0]],
+                "column_percentages": [[70.59, 34.78], [29.41, 65.22]],
+                "total_percentages": [[30.0, 20.0], [12.5, 37.5]],
+                "row_totals": [20, 20],
+                "column_totals": [17, 23],
+                "total": 40,
+            }
 
         Raises:
-            ValueError: If any value cannot be converted to a numeric type
+            ValueError: If the request has no split variable, either variable
+                is not in the data, or any missing value cannot be converted
+                to a number
         """
-        converted_values = []
-
-        for i, value in enumerate(missing_values):
-            # If already numeric, keep as is
-            if isinstance(value, (int, float)):
-                converted_values.append(value)
-                continue
-
-            # Try to convert string to numeric
-            if isinstance(value, str):
-                # Remove whitespace
-                stripped_value = value.strip()
-
-                # Try to convert to int first (for whole numbers)
-                try:
-                    # Check if it's a whole number (no decimal point or .0)
-                    if "." not in stripped_value or stripped_value.endswith(".0"):
-                        int_val = int(
-                            float(stripped_value),
-                        )  # Convert via float to handle "123.0"
-                        converted_values.append(int_val)
-                    else:
-                        # Convert to float for decimal numbers
-                        float_val = float(stripped_value)
-                        converted_values.append(float_val)
-                    continue
-                except ValueError:
-                    pass  # Will raise error below
-
-            # If we get here, conversion failed
+        if request.split_variable is None:
             raise ValueError(
-                f"Cannot convert missing_values[{i}] = '{stripped_value if isinstance(value, str) else value}' "
-                f"(type: {type(value).__name__}) "
-                f"to a numeric value. All missing_values must be numeric "
-                f"or convertible to numeric.",
+                f"Variable {request.variable_name} has no split variable",
             )
 
-        return converted_values
+        require_columns(data, request.variable_name, request.split_variable)
+        variable = data[request.variable_name]
+        split = data[request.split_variable]
+        missing_spec = compile_missing_value_spec(
+            request.missing_values,
+            request.missing_ranges,
+        )
+        split_missing_spec = compile_missing_value_spec(
+            request.split_variable_missing_values,
+            request.split_variable_missing_ranges,
+        )
+
+        valid = variable.notna().to_numpy(dtype=bool) & split.notna().to_numpy(
+            dtype=bool,
+        )
+        if missing_spec.is_active:
+            valid &= ~missing_spec.mask(variable)
+        if split_missing_spec.is_active:
+            valid &= ~split_missing_spec.mask(split)
+
+        row_codes, rows = _crosstab_categories(
+            variable[valid],
+            missing_spec,
+            request.value_labels,
+        )
+        column_codes, columns = _crosstab_categories(
+            split[valid],
+            split_missing_spec,
+            request.split_variable_value_labels,
+        )
 
-    def _get_missing_ranges_values(
-        self, missing_ranges: Optional[List[Dict[str, float]]]
-    ) -> set:
+        counts = np.bincount(
+            row_codes * len(columns) + column_codes,
+            minlength=len(rows) * len(columns),
+        ).reshape(len(rows), len(columns))
+        row_totals = counts.sum(axis=1)
+        column_totals = counts.sum(axis=0)
+        total = counts.sum()
+
+        return {
+            "rows": rows,
+            "columns": columns,
+            "counts": counts.tolist(),
+            "row_percentages": self._percentages(
+                counts,
+                row_totals[:, np.newaxis],
+                decimal_places,
+            ),
+            "column_percentages": self._percentages(
+                counts,
+                column_totals[np.newaxis, :],
+                decimal_places,
+            ),
+            "total_percentages": self._percentages(counts, total, decimal_places),
+            "row_totals": row_totals.tolist(),
+            "column_totals": column_totals.tolist(),
+            "total": int(total),
+        }
+
+    def _percentages(
+        self,
+        counts: np.ndarray,
+        totals: np.ndarray,
+        decimal_places: int | None,
+    ) -> list[list[float]]:
+        """Return counts as rounded percentages of totals, 0 for empty totals."""
+        shares = np.divide(
+            counts,
+            totals,
+            out=np.zeros(counts.shape),
+            where=np.broadcast_to(totals > 0, counts.shape),
+        )
+        return [self._round_all(row * 100, decimal_places) for row in shares]
+
+    def describe_multi_response(
+        self,
+        data: pd.DataFrame,
+        variables: List[VariableStatsRequest],
+        counted_value: float = 1,
+        split_variable: str | None = None,
+        split_variable_value_labels: dict[str, str] | None = None,
+        split_variable_missing_values: list[str | int | float] | None = None,
+        split_variable_missing_ranges: Optional[List[Dict[str, float]]] = None,
+        decimal_places: int | None = 2,
+    ) -> Dict[str, Any]:
         """
-        Get all values that fall within the missing ranges.
+        Count the selections of a multi-response set.
+
+        Each variable of the set is an item, selected where it holds the
+        counted value and the value is not missing. As is usual for sets of
+        dichotomies, respondents are the rows with at least one selected
+        item. Rows without any selection, even if they answered every item,
+        are not part of the base of the respondent percentages. Responses
+        are all selections. The items are stacked into one 2-D block and
+        counted in a single pass, for every split category at once.
 
         Args:
-            missing_ranges: List of range objects with 'lo' and 'hi' keys
+            data: The input DataFrame.
+            variables: The items of the set, with their missing values.
+            counted_value: The value of a selected item.
+            split_variable: The name of a variable to count the set by.
+            split_variable_value_labels: Value labels for the split variable.
+            split_variable_missing_values: Values to treat as missing for the
+                                          split variable.
+            split_variable_missing_ranges: Ranges to treat as missing for the
+                                          split variable.
+            decimal_places: Number of decimal places to round percentages to.
 
         Returns:
-            Set of values (as strings) that fall within the missing ranges
+            The counts of the items, in request order, with their percentages
+            of respondents and of responses:
+            {
+                "items": [
+                    {
+                        "variable": "q1_1",
+                        "counts": 12,
+                        "respondent_percentages": 40.0,
+                        "response_percentages": 25.0,
+                    },
+                    ...
+                ],
+                "respondents": 30,
+                "responses": 48,
+            }
+            With a split variable, one such result per split category, as in
+            ``describe_var``.
+
+        Raises:
+            ValueError: If an item is not numeric, any variable is not in the
+                data, or any missing value cannot be converted to a number
         """
-        missing_set = set()
-        if missing_ranges is None:
-            return missing_set
-
-        for range_obj in missing_ranges:
-            if (
-                not isinstance(range_obj, dict)
-                or "lo" not in range_obj
-                or "hi" not in range_obj
-            ):
-                continue
+        selected = np.empty((len(data), len(variables)), dtype=bool, order="F")
+        respondent = np.zeros(len(data), dtype=bool)
+        for column, request in enumerate(variables):
+            require_columns(data, request.variable_name, split_variable)
+            variable = data[request.variable_name]
+            if not is_plain_numeric(variable):
+                raise ValueError(f"Variable {request.variable_name} is not numeric")
+
+            values = variable.to_numpy(dtype=np.float64)
+            valid = ~np.isnan(values)
+            missing_spec = compile_missing_value_spec(
+                request.missing_values,
+                request.missing_ranges,
+            )
+            if missing_spec.is_active:
+                valid &= ~missing_spec.contains(values)
+            selected[:, column] = valid & (values == counted_value)
+            respondent |= selected[:, column]
+
+        if split_variable is None:
+            codes = np.zeros(len(data), dtype=np.intp)
+            category_count, category_order = 1, [0]
+        else:
+            codes, categories, category_order = split_categories(
+                data[split_variable],
+                compile_missing_value_spec(
+                    split_variable_missing_values,
+                    split_variable_missing_ranges,
+                ),
+            )
+            category_count = len(categories)
+
+        counts = _count_selections(selected, codes, category_count)
+        respondents = np.bincount(
+            codes[respondent & (codes >= 0)],
+            minlength=category_count,
+        )
+
+        responses = counts.sum(axis=1)
+        respondent_percentages = self._percentages(
+            counts,
+            respondents[:, np.newaxis],
+            decimal_places,
+        )
+        response_percentages = self._percentages(
+            counts,
+            responses[:, np.newaxis],
+            decimal_places,
+        )
+
+        results = {}
+        for code in category_order:
+            results[code] = {
+                "items": [
+                    {
+                        "variable": request.variable_name,
+                        "counts": int(counts[code, column]),
+                        "respondent_percentages": respondent_percentages[code][column],
+                        "response_percentages": response_percentages[code][column],
+                    }
+                    for column, request in enumerate(variables)
+                ],
+                "respondents": int(respondents[code]),
+                "responses": int(responses[code]),
+            }
+
+        if split_variable is None:
+            return results[0]
+        return {
+            "split_variable": split_variable,
+            "categories": {
+                str(categories[code]): results[code] for code in category_order
+            },
+            "split_variable_labels": split_variable_value_labels or {},
+        }
 
-            lo = range_obj["lo"]
-            hi = range_obj["hi"]
-
-            # For each value in the range (assuming integer ranges like 97-97, 98-98, 99-99)
-            # Generate all possible values in the range
-            if isinstance(lo, (int, float)) and isinstance(hi, (int, float)):
-                # For ranges like 97-97, 98-98, this will add just that single value
-                # For ranges like 97-99, this will add 97, 98, 99
-                current = lo
-                while current <= hi:
-                    # Add different string representations
-                    missing_set.add(str(current))
-                    missing_set.add(str(float(current)))
-                    if isinstance(current, int) or current.is_integer():
-                        missing_set.add(f"{int(current)}.0")
-                        missing_set.add(str(int(current)))
-                    current += 1
-
-        return missing_set
+    def _can_batch(self, data: pd.DataFrame, request: VariableStatsRequest) -> bool:
+        """Whether a variable can be described as part of a numeric block."""
+        if request.variable_name not in data.columns:
+            return False
+        if not is_plain_numeric(data[request.variable_name]):
+            return False
+        return request.split_variable is None or (
+            request.split_variable in data.columns
+            and request.split_variable != request.variable_name
+        )
+
+    def _describe_one(
+        self,
+        data: pd.DataFrame,
+        request: VariableStatsRequest,
+        include: list[str] | None,
+        decimal_places: int | None,
+    ) -> Dict[str, Any]:
+        """Describe a variable that is not batched."""
+        try:
+            stats = self.describe_var(
+                data,
+                request.variable_name,
+                include=include,
+                missing_values=request.missing_values,
+                missing_ranges=request.missing_ranges,
+                value_labels=request.value_labels,
+                split_variable=request.split_variable,
+                split_variable_value_labels=request.split_variable_value_labels,
+                split_variable_missing_values=request.split_variable_missing_values,
+                split_variable_missing_ranges=request.split_variable_missing_ranges,
+                decimal_places=decimal_places,
+            )
+        except ValueError as e:
+            return {"variable": request.variable_name, "error": str(e)}
+        return {"variable": request.variable_name, "stats": stats}
+
+    def _build_block(
+        self,
+        data: pd.DataFrame,
+        dtype: np.dtype,
+        members: List[_BatchMember],
+    ) -> pd.DataFrame:
+        """
+        Build a 2-D block of the batched variables, with missing values applied.
+
+        The block holds one column per variable, labelled with its position in
+        the request, and is stored in a single array of ``dtype``.
+        """
+        values = np.empty((len(data), len(members)), dtype=dtype, order="F")
+        for column, (_, request, missing_spec) in enumerate(members):
+            variable = data[request.variable_name]
+            values[:, column] = variable.to_numpy()
+            if missing_spec.is_active:
+                values[missing_spec.mask(variable), column] = np.nan
+        return pd.DataFrame(
+            values,
+            index=data.index,
+            columns=[position for position, _, _ in members],
+            copy=False,
+        )
+
+    def _describe_block_with_split(
+        self,
+        data: pd.DataFrame,
+        split_variable: str,
+        split_missing_spec: MissingValueSpec,
+        dtype: np.dtype,
+        members: List[_BatchMember],
+        include: list[str] | None,
+        decimal_places: int | None,
+    ) -> Dict[int, dict]:
+        """
+        Describe a block of variables sharing a split variable.
+
+        Mirrors ``_describe_var_with_split``, with the split variable
+        filtered, factorized and sorted once for the whole block.
+        """
+        block = self._build_block(data, dtype, members)
+        split = data[split_variable]
+
+        if split_missing_spec.has_values:
+            keep_mask = ~split_missing_spec.point_mask(split)
+            block = block[keep_mask]
+            split = split[keep_mask]
+        if split_missing_spec.has_ranges:
+            split = split.copy()
+            split.loc[split_missing_spec.range_mask(split)] = pd.NA
+
+        codes, categories = pd.factorize(split)
+        category_order = sorted(
+            range(len(categories)),
+            key=lambda code: category_sort_key(categories[code]),
+        )
+
+        results = {
+            position: {
+                "split_variable": split_variable,
+                "categories": {},
+                "split_variable_labels": request.split_variable_value_labels or {},
+            }
+            for position, request, _ in members
+        }
+
+        category_blocks = self._split_by_codes(block, codes, len(categories))
+        for code in category_order:
+            category_stats = self._describe_block(
+                category_blocks[code],
+                members,
+                include,
+                decimal_places,
+            )
+            category_key = str(categories[code])
+            for position, stats in category_stats.items():
+                results[position]["categories"][category_key] = stats
+
+        return results
+
+    def _describe_block(  # noqa: C901, PLR0912
+        self,
+        block: pd.DataFrame,
+        members: List[_BatchMember],
+        include: list[str] | None,
+        decimal_places: int | None,
+    ) -> Dict[int, dict]:
+        """
+        Calculate the statistics of every column of a numeric block.
+
+        Produces the same statistics as ``_calculate_single_var_stats`` for
+        each column, with every reduction computed for all columns at once.
+        """
+        if include is None:
+            include = _DEFAULT_NUMERIC_STATS
+
+        reductions = {"count": block.count().to_numpy()}
+        for name in ("mean", "std", "min", "max"):
+            if name in include or (name in ("min", "max") and "range" in include):
+                reductions[name] = getattr(block, name)().to_numpy()
+
+        # Sorting every column once yields the value counts and the median
+        # of all columns
+        needs_sort = any(name in include for name in ("mode", "frequencies", "median"))
+        if needs_sort:
+            sorted_values = np.sort(block.to_numpy(), axis=0)
+
+        results = {}
+        for column, (position, request, missing_spec) in enumerate(members):
+            stats = {}
+            count = int(reductions["count"][column])
+            if needs_sort:
+                # Missing values are sorted to the end
+                values = sorted_values[:count, column]
+                value_counts = _sorted_value_counts(values)
+
+            if "count" in include:
+                stats["count"] = count
+            if "mode" in include:
+                stats["mode"] = _modes(value_counts)
+            for name in ("mean", "std", "min", "max"):
+                if name in include:
+                    stats[name] = self._round_stat(
+                        reductions[name][column],
+                        decimal_places,
+                    )
+            if "median" in include:
+                # The middle value, or the mean of the two middle values
+                stats["median"] = (
+                    self._round_stat(
+                        values[(count - 1) // 2 : count // 2 + 1].mean(),
+                        decimal_places,
+                    )
+                    if count > 0
+                    else None
+                )
+            if "range" in include:
+                min_val = reductions["min"][column]
+                max_val = reductions["max"][column]
+                stats["range"] = (
+                    self._round_stat(max_val - min_val, decimal_places)
+                    if str(min_val) != "nan" and str(max_val) != "nan"
+                    else None
+                )
+            if "frequencies" in include:
+                stats["frequency_table"] = self._frequency_table_from_counts(
+                    value_counts,
+                    missing_spec,
+                    request.value_labels,
+                    decimal_places,
+                )
+
+            results[position] = stats
+
+        return results
+
+    def _round_stat(self, value: Any, decimal_places: int | None) -> float | None:
+        """Round a reduced statistic, or return None if it is NaN."""
+        if value is None or str(value) == "nan":
+            return None
+        return self._round_if_needed(float(value), decimal_places)
+
+    def _apply_missing_spec(
+        self,
+        variable: pd.Series,
+        missing_spec: MissingValueSpec,
+    ) -> pd.Series:
+        """
+        Mark missing values and values within missing ranges as ``pd.NA``.
+
+        Only the variable itself is copied, never the DataFrame it belongs to.
+        """
+        if not missing_spec.is_active:
+            return variable
+        mask = missing_spec.mask(variable)
+        variable = variable.copy()
+        variable.loc[mask] = pd.NA
+        return variable
 
     def _describe_var_with_split(
         self,
@@ -389,40 +962,42 @@ class StatisticsService:
             Dictionary with split variable categories as keys, each containing
             statistics for the main variable.
         """
-        if missing_values is not None:
-            data = self._apply_missing_values(data, variable_name, missing_values)
+        # Only the two relevant columns are needed from here on
+        variable = data[variable_name]
+        split = data[split_variable]
+
+        missing_spec = compile_missing_value_spec(missing_values, missing_ranges)
+        variable = self._apply_missing_spec(variable, missing_spec)
 
-        # Apply missing ranges to main variable
-        if missing_ranges is not None:
-            data = self._apply_missing_ranges(data, variable_name, missing_ranges)
+        if split_variable == variable_name:
+            split = variable
+
+        split_missing_spec = compile_missing_value_spec(
+            split_variable_missing_values,
+            split_variable_missing_ranges,
+        )
 
         # Filter out missing values for the split variable
-        if split_variable_missing_values is not None:
-            split_numeric_missing_values = self._convert_to_numeric_missing_values(
-                split_variable_missing_values,
-            )
-            # Create mask for split variable missing values
-            split_missing_mask = data[split_variable].isin(split_numeric_missing_values)
+        if split_missing_spec.has_values:
             # Keep only rows where split variable is not missing
-            data = data.loc[~split_missing_mask].copy()
+            keep_mask = ~split_missing_spec.point_mask(split)
+            variable = variable[keep_mask]
+            split = split[keep_mask]
 
         # Apply missing ranges to split variable
-        if split_variable_missing_ranges is not None:
-            data = self._apply_missing_ranges(
-                data, split_variable, split_variable_missing_ranges
-            )
+        if split_missing_spec.has_ranges:
+            split = split.copy()
+            split.loc[split_missing_spec.range_mask(split)] = pd.NA
 
-        # Get unique categories from split variable (excluding NA and missing values)
-        split_categories = data[split_variable].dropna().unique()
+        # Factorize the split variable once; rows with a missing split value
+        # get a code of -1 and are left out of every category.
+        codes, categories = pd.factorize(split)
 
         # Sort categories in ascending order
-        def sort_key(item: Any) -> tuple[int, float | str]:
-            try:
-                return (0, float(item))  # Numeric values get priority
-            except ValueError, TypeError:
-                return (1, str(item))  # String values come after numbers
-
-        split_categories = sorted(split_categories, key=sort_key)
+        category_order = sorted(
+            range(len(categories)),
+            key=lambda code: category_sort_key(categories[code]),
+        )
 
         # Create result structure with split categories
         result = {
@@ -432,56 +1007,72 @@ class StatisticsService:
         }
 
         # Calculate statistics for each split category
-        for category in split_categories:
-            mask = data[split_variable] == category
-            category_data = data.loc[mask].copy()
+        category_variables = self._split_by_codes(variable, codes, len(categories))
+        for code in category_order:
             category_stats = self._calculate_single_var_stats(
-                category_data,
-                variable_name,
+                category_variables[code],
                 include,
-                missing_values,
-                missing_ranges,
+                missing_spec,
                 value_labels,
                 decimal_places,
             )
 
             # Convert category to string for JSON serialization
-            category_key = str(category)
+            category_key = str(categories[code])
             result["categories"][category_key] = category_stats
 
         return result
 
+    def _split_by_codes(
+        self,
+        variable: _Frame,
+        codes: np.ndarray,
+        group_count: int,
+    ) -> list[_Frame]:
+        """
+        Split a variable, or a block of variables, by group code.
+
+        The rows are sorted by group once, so every group is a contiguous
+        slice. Rows keep their original order within a group, which keeps the
+        statistics identical to those of a boolean-mask selection.
+        """
+        if group_count < np.iinfo(np.int16).max:
+            # NumPy sorts 16-bit integers with a linear-time radix sort
+            codes = codes.astype(np.int16)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(group_count + 1))
+        sorted_variable = variable.iloc[order]
+        return [
+            sorted_variable.iloc[start:end] for start, end in itertools.pairwise(bounds)
+        ]
+
     def _calculate_single_var_stats(  # noqa: C901, PLR0912, PLR0915
         self,
-        data: pd.DataFrame,
-        variable_name: str,
+        variable: pd.Series,
         include: list[str] | None = None,
-        missing_values: list[str | int | float] | None = None,
-        missing_ranges: Optional[List[Dict[str, float]]] = None,
+        missing_spec: MissingValueSpec | None = None,
         value_labels: dict[str, str] | None = None,
         decimal_places: int | None = 2,
     ) -> dict:
         """Calculate statistics for a single variable."""
-        variable = data[variable_name]
         stats = {}
 
         # Set default includes if none are provided
         if include is None:
             if pd.api.types.is_numeric_dtype(variable):
-                include = [
-                    "count",
-                    "frequencies",
-                    "mean",
-                    "std",
-                    "min",
-                    "max",
-                    "median",
-                    "range",
-                    "mode",
-                ]
+                include = _DEFAULT_NUMERIC_STATS
             else:
                 include = ["count", "mode", "frequencies"]
 
+        if is_plain_numeric(variable):
+            return self._calculate_numeric_var_stats(
+                variable,
+                include,
+                missing_spec,
+                value_labels,
+                decimal_places,
+            )
+
         # --- General Statistics ---
         if "count" in include:
             stats["count"] = int(variable.count())
@@ -547,114 +1138,441 @@ class StatisticsService:
                     stats["range"] = None
 
         if "frequencies" in include:
-            counts = variable.value_counts()
-            percentages = variable.value_counts(normalize=True) * 100
-            frequency_table_df = pd.DataFrame(
-                {"counts": counts, "percentages": percentages},
+            stats["frequency_table"] = self._frequency_table(
+                variable,
+                missing_spec,
+                value_labels,
+                decimal_places,
             )
-            frequency_table_df.index.name = "value"
-            frequency_table_df.reset_index(inplace=True)
-
-            # Convert to records while preserving original string representation
-            frequency_records = []
-
-            # If value_labels are provided, ensure all valid labels are included
-            if value_labels is not None:
-                # Get the missing values for filtering
-                missing_set = set()
-                if missing_values is not None:
-                    # Convert missing values to their various string
-                    # representations for comparison
-                    numeric_missing_values = self._convert_to_numeric_missing_values(
-                        missing_values,
-                    )
-                    for mv in numeric_missing_values:
-                        # Add both integer and float string representations
-                        missing_set.add(str(mv))
-                        missing_set.add(str(float(mv)))
-                        if isinstance(mv, int):
-                            missing_set.add(f"{mv}.0")
-                        elif isinstance(mv, float) and mv.is_integer():
-                            missing_set.add(str(int(mv)))
-
-                # Add missing ranges values to the missing set
-                if missing_ranges is not None:
-                    missing_ranges_set = self._get_missing_ranges_values(missing_ranges)
-                    missing_set.update(missing_ranges_set)
-
-                # Create a set of all valid label keys
-                # (excluding missing values and ranges)
-                valid_label_keys = set()
-                for key in value_labels:
-                    if key not in missing_set:
-                        valid_label_keys.add(key)
-
-                # Create a mapping from actual values
-                value_to_data = {}
-
-                # First, add all values that appear in the data
-                for _, row in frequency_table_df.iterrows():
-                    value = row["value"]
-                    try:
-                        value_str = str(value) if pd.notna(value).item() else value
-                    except AttributeError, ValueError:
-                        value_str = str(value)
-
-                    value_to_data[value_str] = {
-                        "counts": int(row["counts"]),
-                        "percentages": self._round_if_needed(
-                            float(row["percentages"]),
-                            decimal_places,
-                        ),
-                    }
 
-                # Then, add all valid label keys with 0 counts if they don't exist
-                for label_key in valid_label_keys:
-                    if label_key not in value_to_data:
-                        value_to_data[label_key] = {
-                            "counts": 0,
-                            "percentages": self._round_if_needed(0.0, decimal_places),
-                        }
-
-                # Convert to frequency records
-                for value_str, freq_data in value_to_data.items():
-                    frequency_records.append(
-                        {
-                            "value": value_str,
-                            "counts": freq_data["counts"],
-                            "percentages": freq_data["percentages"],
-                        },
-                    )
+        return stats
+
+    def _calculate_numeric_var_stats(  # noqa: C901, PLR0912
+        self,
+        variable: pd.Series,
+        include: list[str],
+        missing_spec: MissingValueSpec | None,
+        value_labels: dict[str, str] | None,
+        decimal_places: int | None,
+    ) -> dict:
+        """
+        Calculate statistics for a variable with a NumPy numeric dtype.
+
+        When the mode or frequencies are requested, the values are counted
+        once, and the minimum, maximum and median are derived from the sorted
+        distinct values and their counts. Otherwise each of them is a single
+        reduction, and ``range`` reuses the minimum and maximum. The mean and
+        standard deviation keep pandas' summation, so all results are
+        identical to those of ``_calculate_single_var_stats``.
+        """
+        stats = {}
+        count = int(variable.count())
+
+        value_counts = None
+        if "mode" in include or "frequencies" in include:
+            value_counts = variable.value_counts()
+            order = np.argsort(value_counts.index.to_numpy(), kind="stable")
+            values = value_counts.index.to_numpy()[order]
+            counts = value_counts.to_numpy()[order]
+
+        def extreme(name: str) -> Any:
+            if value_counts is None:
+                return getattr(variable, name)()
+            if len(values) == 0:
+                return np.nan
+            return values[0] if name == "min" else values[-1]
+
+        if "count" in include:
+            stats["count"] = count
+        if "mode" in include:
+            stats["mode"] = (
+                values[counts == counts.max()].tolist() if len(counts) else []
+            )
+        if "mean" in include:
+            stats["mean"] = self._round_stat(variable.mean(), decimal_places)
+        if "std" in include:
+            stats["std"] = self._round_stat(variable.std(), decimal_places)
+
+        min_val = extreme("min") if "min" in include or "range" in include else None
+        max_val = extreme("max") if "max" in include or "range" in include else None
+        if "min" in include:
+            stats["min"] = self._round_stat(min_val, decimal_places)
+        if "max" in include:
+            stats["max"] = self._round_stat(max_val, decimal_places)
+
+        if "median" in include:
+            if count == 0:
+                stats["median"] = None
+            elif value_counts is None:
+                stats["median"] = self._round_stat(variable.median(), decimal_places)
             else:
-                # Original behavior when no value_labels are provided
-                for _, row in frequency_table_df.iterrows():
-                    value = row["value"]
-                    # Always preserve as string to maintain exact format
-                    # (e.g., "1.0" stays "1.0")
-                    try:
-                        value = str(value) if pd.notna(value).item() else value
-                    except AttributeError, ValueError:
-                        value = str(value)
-
-                    frequency_records.append(
-                        {
-                            "value": value,
-                            "counts": int(row["counts"]),
-                            "percentages": self._round_if_needed(
-                                float(row["percentages"]),
-                                decimal_places,
-                            ),
-                        },
-                    )
+                # The middle value, or the mean of the two middle values
+                middle = np.searchsorted(
+                    np.cumsum(counts),
+                    [(count - 1) // 2, count // 2],
+                    side="right",
+                )
+                stats["median"] = self._round_stat(
+                    values[middle].mean(),
+                    decimal_places,
+                )
 
-            # Sort frequency records by value (numeric first, then string)
-            def sort_key(item: dict[str, Any]) -> tuple[int, float | str]:
-                try:
-                    return (0, float(item["value"]))  # Numeric values get priority
-                except ValueError, TypeError:
-                    return (1, str(item["value"]))  # String values come after numbers
+        if "range" in include:
+            stats["range"] = (
+                self._round_stat(max_val - min_val, decimal_places)
+                if str(min_val) != "nan" and str(max_val) != "nan"
+                else None
+            )
 
-            frequency_records.sort(key=sort_key)
-            stats["frequency_table"] = frequency_records
+        if "frequencies" in include:
+            stats["frequency_table"] = self._frequency_table_from_counts(
+                value_counts,
+                missing_spec,
+                value_labels,
+                decimal_places,
+            )
 
         return stats
+
+    def _frequency_table(
+        self,
+        variable: pd.Series,
+        missing_spec: MissingValueSpec | None = None,
+        value_labels: dict[str, str] | None = None,
+        decimal_places: int | None = 2,
+    ) -> list[dict[str, Any]]:
+        """
+        Build the frequency table of a variable, sorted by value.
+
+        Values are formatted as strings. Numeric values are formatted as
+        floats (e.g. "1.0"), and all value labels are included with a count
+        of 0 if they do not appear in the data, unless they are missing.
+        """
+        return self._frequency_table_from_counts(
+            variable.value_counts(),
+            missing_spec,
+            value_labels,
+            decimal_places,
+        )
+
+    def _frequency_table_from_counts(
+        self,
+        value_counts: pd.Series,
+        missing_spec: MissingValueSpec | None = None,
+        value_labels: dict[str, str] | None = None,
+        decimal_places: int | None = 2,
+    ) -> list[dict[str, Any]]:
+        """Build a frequency table from the value counts of a variable."""
+        counts = value_counts.to_numpy(dtype=np.int64)
+        percentages = counts / counts.sum() * 100
+        values = value_counts.index
+
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(
+            values,
+        ):
+            numbers = values.to_numpy(dtype=np.float64)
+            is_string = np.zeros(len(numbers), dtype=bool)
+            keys = [str(number) for number in numbers.tolist()]
+        else:
+            keys = [str(value) for value in values.tolist()]
+            numbers, is_string = _sort_numbers(keys)
+
+        count_list = counts.tolist()
+        percentage_list = self._round_all(percentages, decimal_places)
+
+        if value_labels is not None:
+            # Equal keys are merged, keeping the first position and the last counts
+            value_to_data = dict(
+                zip(keys, zip(count_list, percentage_list, strict=True), strict=True),
+            )
+            if len(value_to_data) < len(keys):
+                numbers, is_string = _sort_numbers(list(value_to_data))
+
+            label_keys = [key for key in value_labels if key not in value_to_data]
+            label_numbers, label_is_string = _sort_numbers(label_keys)
+            if missing_spec is not None:
+                # Labels of missing values and ranges are left out
+                valid = label_is_string | ~missing_spec.contains(label_numbers)
+                label_keys = [
+                    key for key, keep in zip(label_keys, valid, strict=True) if keep
+                ]
+                label_numbers = label_numbers[valid]
+                label_is_string = label_is_string[valid]
+            numbers = np.concatenate([numbers, label_numbers])
+            is_string = np.concatenate([is_string, label_is_string])
+
+            zero_percentage = self._round_if_needed(0.0, decimal_places)
+            keys = [*value_to_data, *label_keys]
+            count_list = [count for count, _ in value_to_data.values()]
+            count_list += [0] * len(label_keys)
+            percentage_list = [percentage for _, percentage in value_to_data.values()]
+            percentage_list += [zero_percentage] * len(label_keys)
+
+        # Numeric values come first in ascending order, then strings
+        numeric_positions = np.flatnonzero(~is_string)
+        numeric_positions = numeric_positions[
+            np.argsort(numbers[numeric_positions], kind="stable")
+        ]
+        string_positions = sorted(
+            np.flatnonzero(is_string).tolist(), key=keys.__getitem__
+        )
+
+        return [
+            {
+                "value": keys[position],
+                "counts": count_list[position],
+                "percentages": percentage_list[position],
+            }
+            for position in [*numeric_positions.tolist(), *string_positions]
+        ]
+
+    def _round_all(
+        self,
+        values: np.ndarray,
+        decimal_places: int | None,
+    ) -> list[float]:
+        """Round an array of floats like ``_round_if_needed`` does for one value."""
+        if decimal_places is None:
+            return values.tolist()
+        return [round(value, decimal_places) for value in values.tolist()]
+
+
+def category_sort_key(item: Any) -> tuple[int, float | str]:
+    """Sort split categories in ascending order, numbers before strings."""
+    try:
+        return (0, float(item))
+    except ValueError, TypeError:
+        return (1, str(item))
+
+
+def require_columns(
+    data: pd.DataFrame,
+    variable_name: str,
+    split_variable: str | None = None,
+) -> None:
+    """
+    Check that a variable and its split variable are columns of the data.
+
+    Raises:
+        ValueError: If either column is missing
+    """
+    if variable_name not in data.columns:
+        raise ValueError(f"Variable '{variable_name}' not found in the DataFrame.")
+    if split_variable is not None and split_variable not in data.columns:
+        raise ValueError(
+            f"Split variable '{split_variable}' not found in the DataFrame.",
+        )
+
+
+def split_categories(
+    split: pd.Series,
+    missing_spec: MissingValueSpec,
+) -> tuple[np.ndarray, pd.Index, list[int]]:
+    """
+    Factorize a split variable into category codes.
+
+    Rows with a missing split value get a code of -1. Returns the codes, the
+    categories, and the codes of the categories that occur in ascending order.
+    """
+    codes, categories = pd.factorize(split)
+    if missing_spec.is_active:
+        codes[missing_spec.mask(split)] = -1
+    present = np.bincount(codes[codes >= 0], minlength=len(categories)) > 0
+    category_order = sorted(
+        np.flatnonzero(present).tolist(),
+        key=lambda code: category_sort_key(categories[code]),
+    )
+    return codes, categories, category_order
+
+
+def _count_selections(
+    selected: np.ndarray,
+    codes: np.ndarray,
+    category_count: int,
+) -> np.ndarray:
+    """
+    Count the selected cells of every column by split category code.
+
+    Rows with a negative code are left out. With few categories, the counts
+    are the product of a one-hot matrix of the codes and the selections,
+    taken in row blocks to bound memory. Otherwise every selection is
+    counted with a single bincount.
+    """
+    column_count = selected.shape[1]
+    if category_count > _ONE_HOT_MAX_CATEGORIES:
+        rows, columns = np.nonzero(selected)
+        row_codes = codes[rows]
+        keep = row_codes >= 0
+        return np.bincount(
+            row_codes[keep] * column_count + columns[keep],
+            minlength=category_count * column_count,
+        ).reshape(category_count, column_count)
+
+    # Float64 products hold counts exactly up to 2**53
+    counts = np.zeros((category_count, column_count))
+    for start in range(0, len(codes), _ONE_HOT_BLOCK_ROWS):
+        block_codes = codes[start : start + _ONE_HOT_BLOCK_ROWS]
+        one_hot = np.zeros((len(block_codes), category_count))
+        kept = np.flatnonzero(block_codes >= 0)
+        one_hot[kept, block_codes[kept]] = 1
+        block = selected[start : start + _ONE_HOT_BLOCK_ROWS]
+        counts += one_hot.T @ block.astype(np.float64)
+    return counts.astype(np.int64)
+
+
+def non_empty_positions(variable: pd.Series) -> np.ndarray:
+    """Return the positions of the values that are neither missing nor blank."""
+    positions = np.flatnonzero(_non_empty_mask(variable))
+    # Positions are kept in memory per variable, so keep them compact
+    if len(variable) <= np.iinfo(np.int32).max:
+        positions = positions.astype(np.int32)
+    return positions
+
+
+def _non_empty_mask(variable: pd.Series) -> np.ndarray:
+    """Return a mask of the values that are neither missing nor blank."""
+    mask = variable.notna().to_numpy(dtype=bool, copy=True)
+    dtype = variable.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        return mask
+
+    if pd.api.types.is_string_dtype(dtype) and not isinstance(dtype, np.dtype):
+        # Whitespace-only strings are empty, like missing values
+        blank = variable.str.strip().str.len().eq(0)
+        return mask & ~blank.fillna(False).to_numpy(dtype=bool)
+
+    # Objects of any type: only the non-missing ones are converted to strings
+    candidates = np.flatnonzero(mask)
+    blank = [str(v).strip() == "" for v in variable.iloc[candidates].tolist()]
+    mask[candidates[np.array(blank, dtype=bool)]] = False
+    return mask
+
+
+def _stats_from_counts(values: np.ndarray, counts: np.ndarray) -> Dict[str, Any]:
+    """Calculate unrounded statistics from sorted distinct values and counts."""
+    count = int(counts.sum())
+    if count == 0:
+        return {
+            "count": 0,
+            "mode": [],
+            **dict.fromkeys(("mean", "std", "min", "max", "median", "range")),
+        }
+
+    mean = (values * counts).sum() / count
+    variance = (
+        ((values - mean) ** 2 * counts).sum() / (count - 1) if count > 1 else None
+    )
+    middle = np.searchsorted(
+        np.cumsum(counts),
+        [(count - 1) // 2, count // 2],
+        side="right",
+    )
+    return {
+        "count": count,
+        "mode": values[counts == counts.max()].tolist(),
+        "mean": mean,
+        "std": np.sqrt(variance) if variance is not None else None,
+        "min": values[0],
+        "max": values[-1],
+        "median": values[middle].mean(),
+        "range": values[-1] - values[0],
+    }
+
+
+def _block_dtype(dtype: np.dtype, missing_spec: MissingValueSpec) -> np.dtype:
+    """Return the dtype of a numeric variable once its missing values are applied."""
+    # Like ``_apply_missing_spec``, which upcasts integers as soon as it applies
+    if missing_spec.is_active and dtype.kind != "f":
+        return np.dtype(np.float64)
+    return dtype
+
+
+def _sorted_value_counts(values: np.ndarray) -> pd.Series:
+    """Count the values of a sorted array without missing values."""
+    if len(values) == 0:
+        return pd.Series(np.zeros(0, dtype=np.int64), index=values)
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    counts = np.diff(np.r_[starts, len(values)])
+    return pd.Series(counts, index=values[starts])
+
+
+def _modes(value_counts: pd.Series) -> list:
+    """Return the modes of a variable from its value counts, like ``mode``."""
+    if value_counts.empty:
+        return []
+    counts = value_counts.to_numpy()
+    modes = value_counts.index[counts == counts.max()]
+    return modes.sort_values().tolist()
+
+
+def _crosstab_categories(
+    values: pd.Series,
+    missing_spec: MissingValueSpec,
+    value_labels: dict[str, str] | None,
+) -> tuple[np.ndarray, list[dict[str, Any]]]:
+    """
+    Factorize the values of a crosstab axis into its sorted categories.
+
+    Returns the category code of every value and the categories with their
+    labels. Labelled values that do not occur are added as categories, unless
+    they are missing values.
+    """
+    codes, uniques = pd.factorize(values)
+    numeric = pd.api.types.is_numeric_dtype(
+        uniques.dtype,
+    ) and not pd.api.types.is_bool_dtype(uniques.dtype)
+    if numeric:
+        keys = [str(number) for number in uniques.to_numpy(dtype=np.float64).tolist()]
+    else:
+        keys = [str(value) for value in uniques.tolist()]
+
+    # Label keys of numeric variables, e.g. "1", match values such as "1.0"
+    labels: dict[str, str] = {}
+    for key, label in (value_labels or {}).items():
+        number, is_string = _sort_numbers([key])
+        labels[str(number[0]) if numeric and not is_string[0] else key] = label
+
+    category_keys = list(dict.fromkeys(keys))
+    label_keys = [key for key in labels if key not in category_keys]
+    label_numbers, label_is_string = _sort_numbers(label_keys)
+    valid = label_is_string | ~missing_spec.contains(label_numbers)
+    category_keys += [key for key, keep in zip(label_keys, valid, strict=True) if keep]
+
+    # Numeric values come first in ascending order, then strings
+    numbers, is_string = _sort_numbers(category_keys)
+    numeric_positions = np.flatnonzero(~is_string)
+    numeric_positions = numeric_positions[
+        np.argsort(numbers[numeric_positions], kind="stable")
+    ]
+    string_positions = sorted(
+        np.flatnonzero(is_string).tolist(),
+        key=category_keys.__getitem__,
+    )
+    ordered_keys = [
+        category_keys[position]
+        for position in [*numeric_positions.tolist(), *string_positions]
+    ]
+
+    order = {key: position for position, key in enumerate(ordered_keys)}
+    unique_positions = np.array([order[key] for key in keys], dtype=np.intp)
+    return (
+        unique_positions[codes],
+        [{"value": key, "label": labels.get(key)} for key in ordered_keys],
+    )
+
+
+def _sort_numbers(keys: List[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse frequency table values for sorting.
+
+    Returns the parsed numbers, with NaN for values that are not numeric, and
+    a mask of the values that are sorted as strings.
+    """
+    numbers = np.full(len(keys), np.nan)
+    is_string = np.zeros(len(keys), dtype=bool)
+    for position, key in enumerate(keys):
+        try:
+            numbers[position] = float(key)
+        except ValueError, TypeError:
+            is_string[position] = True
+    return numbers, is_string
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from analysis.services.cache import LRUCache
+from analysis.services.stats import StatisticsService
+from analysis.settings import settings
+
+STATS_INDEX_FILE_NAME = "stats.json"
+STATS_INDEX_VERSION = 1
+
+# Dtypes whose statistics are precomputed. SAV files hold doubles, and
+# statistics of other dtypes are not reproduced exactly from JSON values.
+_INDEXED_DTYPES = {"float64", "int64"}
+
+_INDEXED_STATS = ["count", "mean", "std", "min", "max", "median", "range"]
+
+_index_cache = LRUCache(max_size=256)
+
+
+def summarize_column(series: pd.Series) -> Optional[Dict[str, Any]]:
+    """
+    Summarize a column for the statistics index.
+
+    The summary holds the unrounded statistics of the column without any
+    missing values applied. Columns with few distinct values also keep their
+    mode and exact value counts, sorted by value. Returns None for columns
+    that are not indexed.
+
+    The index therefore only covers low-cardinality columns fully. The
+    default statistics include the frequency table and mode, which need the
+    count of every distinct value. For continuous columns, with more than
+    ``stats_index_max_distinct_values`` distinct values, that is as large as
+    the column itself, so it is not stored. Their requests are answered from
+    the index only if they leave out frequencies and mode and apply no
+    missing values. Otherwise the column is loaded.
+    """
+    dtype = str(series.dtype)
+    if dtype not in _INDEXED_DTYPES:
+        return None
+
+    value_counts = series.value_counts().sort_index()
+    low_cardinality = len(value_counts) <= settings.stats_index_max_distinct_values
+    include = [*_INDEXED_STATS, "mode"] if low_cardinality else _INDEXED_STATS
+
+    summary: Dict[str, Any] = {
+        "dtype": dtype,
+        "stats": StatisticsService().describe_var(
+            series.to_frame(name="column"),
+            "column",
+            include=include,
+            decimal_places=None,
+        ),
+    }
+    if low_cardinality:
+        summary["values"] = value_counts.index.tolist()
+        summary["counts"] = value_counts.tolist()
+    return summary
+
+
+def write_stats_index(directory: Path, summaries: Dict[str, Dict[str, Any]]) -> None:
+    """Write the statistics index of a dataset into a directory."""
+    index = {"version": STATS_INDEX_VERSION, "columns": summaries}
+    (directory / STATS_INDEX_FILE_NAME).write_text(json.dumps(index))
+
+
+def load_stats_index(directory: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Return the column summaries of a statistics index, keyed by column.
+
+    Returns None if the directory holds no index in the current version.
+    Loaded indexes are kept in memory, as they never change once written.
+    """
+    columns = _index_cache.get(directory)
+    if columns is not None:
+        return columns
+
+    try:
+        index = json.loads((directory / STATS_INDEX_FILE_NAME).read_text())
+    except FileNotFoundError:
+        return None
+
+    if index.get("version") != STATS_INDEX_VERSION:
+        return None
+
+    columns = index["columns"]
+    _index_cache.put(directory, columns)
+    return columns
+
+
+def forget_stats_index(directory: Path) -> None:
+    """Drop a loaded statistics index from memory."""
+    _index_cache.pop(directory)
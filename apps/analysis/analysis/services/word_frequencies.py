@@ -0,0 +1,188 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis.services.missing_values import compile_missing_value_spec
+from analysis.services.raw_data_index import TokenIndex, tokenize
+from analysis.services.stats import (
+    non_empty_positions,
+    require_columns,
+    split_categories,
+)
+
+_ENGLISH_STOPWORDS = """
+a about above after again against all also am an and any are as at be
+because been before being below between both but by can could did do does
+doing down during each few for from further had has have having he her here
+hers herself him himself his how i if in into is it its itself just me more
+most my myself no nor not now of off on once only or other our ours
+ourselves out over own same she should so some such than that the their
+theirs them themselves then there these they this those through to too under
+until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves
+"""
+
+_GERMAN_STOPWORDS = """
+aber alle allem allen aller alles als also am an ander andere anderem
+anderen anderer anderes anderm andern anderr anders auch auf aus bei bin bis
+bist da damit dann das dass dasselbe dazu dein deine deinem deinen deiner
+deines dem demselben den denn denselben der derer derselbe derselben des
+desselben dessen dich die dies diese dieselbe dieselben diesem diesen dieser
+dieses dir doch dort du durch ein eine einem einen einer eines einig einige
+einigem einigen einiger einiges einmal er es etwas euch euer eure eurem
+euren eurer eures für gegen gewesen hab habe haben hat hatte hatten hier hin
+hinter ich ihm ihn ihnen ihr ihre ihrem ihren ihrer ihres im in indem ins
+ist jede jedem jeden jeder jedes jene jenem jenen jener jenes jetzt kann
+kein keine keinem keinen keiner keines können könnte machen man manche
+manchem manchen mancher manches mein meine meinem meinen meiner meines mich
+mir mit muss musste nach nicht nichts noch nun nur ob oder ohne sehr sein
+seine seinem seinen seiner seines selbst sich sie sind so solche solchem
+solchen solcher solches soll sollte sondern sonst über um und uns unser
+unsere unserem unseren unserer unseres unter viel vom von vor während war
+waren warst was weg weil weiter welche welchem welchen welcher welches wenn
+werde werden wie wieder will wir wird wirst wo wollen wollte würde würden zu
+zum zur zwar zwischen
+"""
+
+# Common English and German words, left out of word frequencies by default
+STOPWORDS = frozenset(_ENGLISH_STOPWORDS.split() + _GERMAN_STOPWORDS.split())
+
+
+class WordFrequencyService:
+    """
+    Service for counting the words of text variables.
+
+    Words are found the same way as in raw data searches: case-insensitive
+    runs of letters, digits and underscores. They are counted and reported
+    in lower case, but compared with stopwords ignoring case, so "Straße" is
+    reported as "straße" and left out by the stopword "STRASSE".
+
+    ``token_index`` returns the token index of a variable, e.g. from a cache.
+    Without it, variables are tokenized on every call.
+    """
+
+    def __init__(
+        self,
+        token_index: Optional[Callable[[str, pd.Series], TokenIndex]] = None,
+    ) -> None:
+        self.token_index = token_index
+
+    def count_words(
+        self,
+        data: pd.DataFrame,
+        variable_name: str,
+        split_variable: str | None = None,
+        split_variable_value_labels: dict[str, str] | None = None,
+        split_variable_missing_values: list[str | int | float] | None = None,
+        split_variable_missing_ranges: Optional[List[Dict[str, float]]] = None,
+        top_n: int = 50,
+        stopwords: Iterable[str] = STOPWORDS,
+    ) -> Dict[str, Any]:
+        """
+        Count the most frequent words of a text variable.
+
+        Args:
+            data: The input DataFrame.
+            variable_name: The name of the text variable.
+            split_variable: The name of a variable to count words by.
+            split_variable_value_labels: Value labels for the split variable.
+            split_variable_missing_values: Values to treat as missing for the
+                                          split variable.
+            split_variable_missing_ranges: Ranges to treat as missing for the
+                                          split variable.
+            top_n: Number of words to return, per split category.
+            stopwords: Words to leave out, ignoring case.
+
+        Returns:
+            The ``top_n`` most frequent words with their number of
+            occurrences, most frequent first:
+            {
+                "total_count": 120,
+                "words": [{"word": "service", "count": 12}, ...],
+            }
+            With a split variable, one such result per split category, as in
+            ``StatisticsService.describe_var``.
+
+        Raises:
+            ValueError: If the variable does not hold text, or either
+                variable is not in the data
+        """
+        require_columns(data, variable_name, split_variable)
+        variable = data[variable_name]
+        if pd.api.types.is_numeric_dtype(variable):
+            raise ValueError(f"Variable {variable_name} is not a text variable")
+
+        if self.token_index is not None:
+            index = self.token_index(variable_name, variable)
+        else:
+            index = TokenIndex.build(variable, non_empty_positions(variable))
+
+        # Stopwords are matched against the distinct words only
+        stopword_set = {word for text in stopwords for word in tokenize(text)}
+        kept = ~index.folded_tokens().isin(stopword_set).to_numpy(dtype=bool)
+
+        if split_variable is None:
+            return _top_words(index.tokens, index.codes, kept, top_n)
+
+        split_missing_spec = compile_missing_value_spec(
+            split_variable_missing_values,
+            split_variable_missing_ranges,
+        )
+
+        codes, categories, category_order = split_categories(
+            data[split_variable],
+            split_missing_spec,
+        )
+
+        # Group the word occurrences by split category with a single sort
+        occurrence_codes = codes[index.positions]
+        order = np.argsort(occurrence_codes, kind="stable")
+        bounds = np.searchsorted(
+            occurrence_codes[order],
+            np.arange(len(categories) + 1),
+        )
+
+        result: Dict[str, Any] = {
+            "split_variable": split_variable,
+            "categories": {},
+            "split_variable_labels": split_variable_value_labels or {},
+        }
+        for code in category_order:
+            category_words = index.codes[order[bounds[code] : bounds[code + 1]]]
+            result["categories"][str(categories[code])] = _top_words(
+                index.tokens,
+                category_words,
+                kept,
+                top_n,
+            )
+        return result
+
+
+def _top_words(
+    tokens: pd.Series,
+    word_codes: np.ndarray,
+    kept: np.ndarray,
+    top_n: int,
+) -> Dict[str, Any]:
+    """
+    Count word occurrences, given as codes into ``tokens``, and return the
+    most frequent words that are kept. Ties are broken by the order in which
+    the words first occur in the variable.
+    """
+    counts = np.bincount(word_codes, minlength=len(tokens))
+    counts[~kept] = 0
+
+    candidates = np.flatnonzero(counts)
+    top = candidates[np.lexsort((candidates, -counts[candidates]))][: max(top_n, 0)]
+    return {
+        "total_count": int(counts.sum()),
+        "words": [
+            {"word": word, "count": int(count)}
+            for word, count in zip(
+                tokens.iloc[top].tolist(),
+                counts[top].tolist(),
+                strict=True,
+            )
+        ],
+    }
@@ -69,6 +69,48 @@ class Settings(BaseSettings):
     s3_access_key_id: str = "s3"
     s3_secret_access_key: str = "s3"  # noqa: S105
     s3_endpoint: str = "http://localhost:7070"
+    # Size of the HTTP connection pool shared by all S3 transfers
+    s3_max_pool_connections: int = 32
+    # Size of the byte ranges fetched in parallel when downloading objects
+    s3_transfer_part_size: int = 16 * 1024 * 1024
+    # Number of byte ranges fetched in parallel per download
+    s3_transfer_concurrency: int = 8
+    # Threads reserved for dataset downloads, separate from the request threadpool
+    dataset_download_workers: int = 4
+
+    # Dataset caching
+    # Memory ceiling in bytes for parsed dataset columns kept by each worker
+    dataframe_cache_max_bytes: int = 512 * 1024 * 1024
+    # Write a memory-mappable columnar copy of each cached SAV file
+    columnar_cache_enabled: bool = True
+    # Number of columns parsed at once while writing the columnar copy
+    columnar_cache_batch_columns: int = 256
+    # Precompute per-column statistics while writing the columnar copy
+    stats_index_enabled: bool = True
+    # Columns with at most this many distinct values keep exact value counts in the index
+    stats_index_max_distinct_values: int = 1000
+    # Disk space in bytes for cached dataset files, including columnar copies
+    dataset_cache_max_bytes: int = 20 * 1024 * 1024 * 1024
+    # Datasets accessed more recently than this are never evicted from disk
+    dataset_cache_eviction_grace_seconds: int = 300
+    # Threads per worker for parsing datasets and computing statistics
+    compute_workers: int = 4
+    # Threads per worker describing the variables of one stats request in parallel
+    stats_workers: int = 4
+    # Minimum number of variables described by each of those threads
+    stats_min_variables_per_worker: int = 25
+    # Maximum number of computed variable statistics cached by each worker
+    stats_result_cache_max_entries: int = 10_000
+    # Maximum number of computed word frequencies cached by each worker
+    word_frequency_cache_max_entries: int = 1_000
+    # Memory ceiling in bytes for the positions of non-empty raw values kept by each worker
+    raw_data_index_max_bytes: int = 128 * 1024 * 1024
+    # Memory ceiling in bytes for the word indexes of text variables kept by each worker
+    raw_data_token_index_max_bytes: int = 256 * 1024 * 1024
+    # Seconds a worker reuses dataset and variable rows without querying the database
+    metadata_cache_ttl_seconds: int = 60
+    # Maximum number of dataset rows, and of variable rows, cached by each worker
+    metadata_cache_max_entries: int = 10_000
 
     api_key: str = "your-super-secret-api-key"
 
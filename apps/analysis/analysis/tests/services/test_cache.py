@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from analysis.services.cache import LRUCache, SingleFlight, dataframe_nbytes
+
+
+def test_lru_cache_counts_hits_and_misses() -> None:
+    """Record a miss for unknown keys and a hit for cached ones."""
+    cache = LRUCache(max_size=2)
+
+    assert cache.get("a") is None
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.stats() == {
+        "entries": 1,
+        "size": 1,
+        "max_size": 2,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+    }
+
+
+def test_lru_cache_evicts_least_recently_used_entry() -> None:
+    """Evict the entry that was used least recently when the cache is full."""
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    # Touch "a" so that "b" becomes the least recently used entry
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_expires_entries_after_ttl() -> None:
+    """Treat entries older than the TTL as missing."""
+    now = [0.0]
+    cache = LRUCache(max_size=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+
+    now[0] = 9.0
+    assert cache.get("a") == 1
+
+    now[0] = 10.0
+    assert "a" not in cache
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_respects_size_budget() -> None:
+    """Evict as many entries as needed to stay within the size budget."""
+    cache = LRUCache(max_size=10, sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.put("c", "xxxxxxxx")
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == "xxxxxxxx"
+    assert cache.stats()["size"] == 8
+
+
+def test_lru_cache_skips_entries_larger_than_budget() -> None:
+    """Never store an entry that exceeds the whole budget."""
+    cache = LRUCache(max_size=3, sizeof=len)
+    cache.put("a", "xx")
+    cache.put("b", "xxxx")
+
+    assert cache.get("a") == "xx"
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 0
+
+
+def test_lru_cache_replaces_existing_key() -> None:
+    """Replace an existing entry and keep the size accounting consistent."""
+    cache = LRUCache(max_size=10, sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("a", "xx")
+
+    assert cache.get("a") == "xx"
+    assert cache.stats()["size"] == 2
+
+    assert cache.pop("a") == "xx"
+    assert cache.stats()["size"] == 0
+
+
+def test_dataframe_nbytes_includes_object_columns() -> None:
+    """Account for the memory of string objects, not only the pointers."""
+    df = pd.DataFrame({"text": ["a" * 1000, "b" * 1000]})
+
+    assert dataframe_nbytes(df) > 2000
+    assert dataframe_nbytes(df["text"]) > 2000
+
+
+def test_single_flight_shares_errors_with_waiting_callers() -> None:
+    """Raise the error of the running call in every caller that waited for it."""
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fail() -> None:
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(flights.do, "key", fail)
+        started.wait(timeout=5)
+        second = executor.submit(flights.do, "key", fail)
+        while flights.coalesced < 1:
+            time.sleep(0.01)
+        release.set()
+
+        for future in (first, second):
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+
+    assert calls == [1]
+    assert flights.stats() == {"in_flight": 0, "calls": 1, "coalesced": 1}
+    assert flights.do("key", lambda: "fresh") == "fresh"
+
+
+@pytest.mark.anyio
+async def test_single_flight_coalesces_concurrent_coroutines() -> None:
+    """Run one computation for all concurrent callers with the same key."""
+    flights = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def compute(value: int) -> int:
+        calls.append(value)
+        await release.wait()
+        return value * 2
+
+    callers = [
+        asyncio.ensure_future(flights.do_async("key", compute, 21)) for _ in range(3)
+    ]
+    other = asyncio.ensure_future(flights.do_async("other", compute, 1))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await asyncio.gather(*callers, other) == [42, 42, 42, 2]
+    assert calls == [21, 1]
+    assert flights.stats() == {"in_flight": 0, "calls": 2, "coalesced": 2}
+
+
+@pytest.mark.anyio
+async def test_single_flight_survives_cancelled_first_caller() -> None:
+    """Complete the computation for waiting callers if its starter is cancelled."""
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def compute() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(flights.do_async("key", compute))
+    second = asyncio.ensure_future(flights.do_async("key", compute))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_overlapping_batches() -> None:
+    """Compute every key once when concurrent batches share some of their keys."""
+    flights = SingleFlight()
+    release = asyncio.Event()
+    batches = []
+
+    async def compute(values: list[int]) -> list[int]:
+        batches.append(values)
+        await release.wait()
+        return [value * 2 for value in values]
+
+    first = asyncio.ensure_future(
+        flights.do_many_async([("a", 1), ("b", 2), ("c", 3)], compute)
+    )
+    await asyncio.sleep(0.01)
+    second = asyncio.ensure_future(
+        flights.do_many_async([("d", 4), ("b", 2), ("a", 1), ("d", 4)], compute)
+    )
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await first == [2, 4, 6]
+    assert await second == [8, 4, 2, 8]
+    assert batches == [[1, 2, 3], [4]]
+    assert flights.stats() == {"in_flight": 0, "calls": 2, "coalesced": 2}
@@ -0,0 +1,126 @@
+import datetime
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyreadstat
+import pytest
+
+from analysis.services.columnar_cache import (
+    convert_to_columnar,
+    get_conversion_lock_path,
+    get_sidecar_path,
+    read_columnar_columns,
+)
+from analysis.settings import settings
+
+
+def _write_sav(path: Path) -> None:
+    df = pd.DataFrame(
+        {
+            "age": [21.0, 35.0, np.nan, 64.0],
+            "feedback": ["Great!", "", "Schön", "ok"],
+            "visited": [
+                datetime.date(2024, 1, 1),
+                datetime.date(2024, 2, 1),
+                datetime.date(2024, 3, 1),
+                datetime.date(2024, 4, 1),
+            ],
+            "submitted": [
+                datetime.datetime(2024, 1, 1, 9, 30),
+                datetime.datetime(2024, 2, 1, 10, 0),
+                datetime.datetime(2024, 3, 1, 11, 15),
+                datetime.datetime(2024, 4, 1, 12, 45),
+            ],
+        }
+    )
+    pyreadstat.write_sav(df, str(path))
+
+
+def test_read_columnar_columns_without_sidecar(tmp_path: Path) -> None:
+    """Return nothing when the sidecar has not been written yet."""
+    sav_path = tmp_path / "dataset-hash.sav"
+    _write_sav(sav_path)
+
+    assert read_columnar_columns(sav_path, ["age"]) == {}
+
+
+def test_convert_to_columnar_round_trips_columns(tmp_path: Path) -> None:
+    """Read back the same values as parsing the SAV file directly."""
+    sav_path = tmp_path / "dataset-hash.sav"
+    _write_sav(sav_path)
+    expected, _ = pyreadstat.read_sav(str(sav_path))
+
+    sidecar_path = convert_to_columnar(sav_path)
+    columns = read_columnar_columns(sav_path, ["feedback", "age", "unknown"])
+
+    assert sidecar_path == get_sidecar_path(sav_path)
+    assert list(columns) == ["feedback", "age"]
+    pd.testing.assert_series_equal(columns["age"], expected["age"])
+    pd.testing.assert_series_equal(columns["feedback"], expected["feedback"])
+    assert isinstance(columns["age"].values, np.memmap)
+
+
+def test_convert_to_columnar_skips_object_columns(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Leave columns of Python objects such as dates to the SAV reader."""
+    monkeypatch.setattr(settings, "columnar_cache_batch_columns", 1)
+    sav_path = tmp_path / "dataset-hash.sav"
+    _write_sav(sav_path)
+    expected, _ = pyreadstat.read_sav(str(sav_path))
+
+    convert_to_columnar(sav_path)
+
+    assert read_columnar_columns(sav_path, ["visited"]) == {}
+    columns = read_columnar_columns(sav_path, ["age", "feedback", "submitted"])
+    assert list(columns) == ["age", "feedback", "submitted"]
+    # Datetimes are plain arrays, unlike dates
+    pd.testing.assert_series_equal(columns["submitted"], expected["submitted"])
+    # No temporary conversion directories are left behind
+    assert sorted(tmp_path.iterdir()) == sorted(
+        [sav_path, get_sidecar_path(sav_path), get_conversion_lock_path(sav_path)]
+    )
+
+
+def test_convert_to_columnar_parses_file_once_across_workers(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Let concurrent conversions of the same file wait for the first one."""
+    monkeypatch.setattr(settings, "columnar_cache_batch_columns", 2)
+    sav_path = tmp_path / "dataset-hash.sav"
+    _write_sav(sav_path)
+
+    read_sav = pyreadstat.read_sav
+    batches: list[tuple[str, ...]] = []
+
+    def slow_read_sav(path: str, **kwargs: Any) -> Any:
+        if "usecols" in kwargs:
+            batches.append(tuple(kwargs["usecols"]))
+            time.sleep(0.05)
+        return read_sav(path, **kwargs)
+
+    monkeypatch.setattr(
+        "analysis.services.columnar_cache.pyreadstat.read_sav",
+        slow_read_sav,
+    )
+    barrier = threading.Barrier(2)
+    results: list[Path] = []
+
+    def convert() -> None:
+        barrier.wait()
+        results.append(convert_to_columnar(sav_path))
+
+    threads = [threading.Thread(target=convert) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [get_sidecar_path(sav_path)] * 2
+    assert batches == [("age", "feedback"), ("visited", "submitted")]
@@ -1,15 +1,29 @@
+import fcntl
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pandas as pd
 import pytest
 
 from analysis.services import dataset_cache
+from analysis.services.cache import LRUCache, SingleFlight
+from analysis.services.columnar_cache import (
+    get_conversion_lock_path,
+    get_sidecar_path,
+)
 from analysis.services.dataset_cache import get_cached_dataset_path
+from analysis.settings import settings
 
 
+@patch("analysis.services.dataset_cache.schedule_columnar_conversion")
 @patch("analysis.services.dataset_cache.S3Client.get_client")
 def test_get_cached_dataset_path_downloads_on_cache_miss(
     mock_get_client: Mock,
+    mock_schedule_conversion: Mock,
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
 ) -> None:
@@ -27,12 +41,16 @@ def test_get_cached_dataset_path_downloads_on_cache_miss(
 
     assert result == tmp_path / "dataset-hash.sav"
     assert result.read_bytes() == b"sav-data"
+    assert list(tmp_path.glob("*.part")) == []
     mock_s3_client.download_file.assert_called_once()
+    mock_schedule_conversion.assert_called_once_with(result)
 
 
+@patch("analysis.services.dataset_cache.schedule_columnar_conversion")
 @patch("analysis.services.dataset_cache.S3Client.get_client")
 def test_get_cached_dataset_path_reuses_existing_cached_file(
     mock_get_client: Mock,
+    mock_schedule_conversion: Mock,
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
 ) -> None:
@@ -47,3 +65,319 @@ def test_get_cached_dataset_path_reuses_existing_cached_file(
     assert result == cached_path
     assert result.read_bytes() == b"cached-data"
     mock_get_client.assert_not_called()
+    mock_schedule_conversion.assert_called_once_with(cached_path)
+
+
+def _write_cache_entry(
+    cache_directory: Path,
+    file_hash: str,
+    size: int,
+    accessed_at: float,
+) -> Path:
+    cached_path = cache_directory / f"{file_hash}.sav"
+    cached_path.write_bytes(b"x" * size)
+    os.utime(cached_path, (accessed_at, accessed_at))
+    return cached_path
+
+
+def test_enforce_dataset_cache_limit_evicts_least_recently_used(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Evict the oldest datasets, including their sidecars, until under the limit."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    monkeypatch.setattr(settings, "dataset_cache_max_bytes", 250)
+    monkeypatch.setattr(settings, "dataset_cache_eviction_grace_seconds", 60)
+
+    now = time.time()
+    oldest = _write_cache_entry(tmp_path, "oldest", 100, now - 3000)
+    older = _write_cache_entry(tmp_path, "older", 100, now - 2000)
+    recent = _write_cache_entry(tmp_path, "recent", 100, now - 1000)
+    sidecar_path = get_sidecar_path(oldest)
+    sidecar_path.mkdir()
+    (sidecar_path / "0.npy").write_bytes(b"x" * 10)
+
+    assert dataset_cache.enforce_dataset_cache_limit() == 1
+    assert not oldest.exists()
+    assert not sidecar_path.exists()
+    assert older.exists()
+    assert recent.exists()
+
+
+def test_enforce_dataset_cache_limit_keeps_recently_accessed_datasets(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Never evict datasets accessed within the grace period."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    monkeypatch.setattr(settings, "dataset_cache_max_bytes", 100)
+    monkeypatch.setattr(settings, "dataset_cache_eviction_grace_seconds", 60)
+
+    now = time.time()
+    stale = _write_cache_entry(tmp_path, "stale", 100, now - 3000)
+    in_use = _write_cache_entry(tmp_path, "in-use", 100, now - 10)
+    (tmp_path / "download.part").write_bytes(b"x" * 100)
+
+    assert dataset_cache.enforce_dataset_cache_limit() == 1
+    assert not stale.exists()
+    assert in_use.exists()
+    assert (tmp_path / "download.part").exists()
+    # Partial downloads count towards the size, but are not entries
+    assert dataset_cache.get_dataset_cache_usage() == {
+        "entries": 1,
+        "size": 200,
+        "max_size": 100,
+    }
+
+
+def _write_leftover(path: Path, accessed_at: float, directory: bool = False) -> Path:
+    if directory:
+        path.mkdir()
+        (path / "0.npy").write_bytes(b"x")
+    else:
+        path.write_bytes(b"x")
+    os.utime(path, (accessed_at, accessed_at))
+    return path
+
+
+def test_enforce_dataset_cache_limit_removes_stale_leftovers(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Remove leftovers of interrupted work, but not the files of cached datasets."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    monkeypatch.setattr(settings, "dataset_cache_eviction_grace_seconds", 60)
+    now = time.time()
+    stale = now - 3000
+
+    cached_path = _write_cache_entry(tmp_path, "cached", 10, stale)
+    kept = [
+        cached_path,
+        _write_leftover(get_sidecar_path(cached_path), stale, directory=True),
+        _write_leftover(cached_path.with_suffix(".lock"), stale),
+        _write_leftover(get_conversion_lock_path(cached_path), stale),
+        _write_leftover(tmp_path / "tmp-fresh.part", now),
+        _write_leftover(tmp_path / "tmp-fresh.part.Xy9zQ2w4", now),
+        _write_leftover(tmp_path / "cached.columns-fresh", now, directory=True),
+    ]
+    _write_leftover(tmp_path / "tmp-crashed.part", stale)
+    # The data of an interrupted download, written by boto3 next to the .part file
+    _write_leftover(tmp_path / "tmp-crashed.part.Ab3dE9f1", stale)
+    # A conversion and a sidecar removal that were interrupted
+    _write_leftover(tmp_path / "cached.columns-abc123", stale, directory=True)
+    _write_leftover(tmp_path / ".cached.columns-0123abcd", stale, directory=True)
+    # A sidecar renamed into place after its SAV file was evicted
+    evicted_path = tmp_path / "evicted.sav"
+    _write_leftover(get_sidecar_path(evicted_path), stale, directory=True)
+    _write_leftover(evicted_path.with_suffix(".lock"), stale)
+    _write_leftover(get_conversion_lock_path(evicted_path), stale)
+
+    assert dataset_cache.enforce_dataset_cache_limit() == 0
+    assert sorted(tmp_path.iterdir()) == sorted(kept)
+
+
+def test_enforce_dataset_cache_limit_keeps_leftovers_in_use(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Keep stale directories and lock files while another process holds the lock."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    monkeypatch.setattr(settings, "dataset_cache_eviction_grace_seconds", 60)
+    stale = time.time() - 3000
+
+    # A slow conversion and a download of datasets that are not cached yet
+    conversion_lock_path = get_conversion_lock_path(tmp_path / "converting.sav")
+    download_lock_path = tmp_path / "downloading.lock"
+    in_use = [
+        _write_leftover(tmp_path / "converting.columns-abc123", stale, directory=True),
+        _write_leftover(conversion_lock_path, stale),
+        _write_leftover(download_lock_path, stale),
+    ]
+
+    with (
+        conversion_lock_path.open("a") as conversion_lock,
+        download_lock_path.open("a") as download_lock,
+    ):
+        fcntl.flock(conversion_lock, fcntl.LOCK_EX)
+        fcntl.flock(download_lock, fcntl.LOCK_EX)
+        dataset_cache.enforce_dataset_cache_limit()
+        assert sorted(tmp_path.iterdir()) == sorted(in_use)
+
+    dataset_cache.enforce_dataset_cache_limit()
+    assert list(tmp_path.iterdir()) == []
+
+
+@patch("analysis.services.dataset_cache.schedule_columnar_conversion")
+def test_get_cached_dataset_path_marks_dataset_as_accessed(
+    mock_schedule_conversion: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Refresh the access time of a dataset when it is served from the cache."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    cached_path = _write_cache_entry(tmp_path, "dataset-hash", 10, 0)
+
+    get_cached_dataset_path("dataset-hash", "datasets/test.sav")
+
+    assert cached_path.stat().st_mtime > time.time() - 60
+
+
+def test_evict_dataset_removes_files_and_cached_columns(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Drop a dataset from disk and from the in-memory column cache."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    cache = LRUCache(max_size=10)
+    cache.put(("dataset-hash", "age"), pd.Series([1.0]))
+    cache.put(("other-hash", "age"), pd.Series([2.0]))
+    monkeypatch.setattr(dataset_cache, "dataframe_cache", cache)
+    cached_path = _write_cache_entry(tmp_path, "dataset-hash", 10, time.time())
+    cached_path.with_suffix(".lock").touch()
+    get_conversion_lock_path(cached_path).touch()
+
+    assert dataset_cache.evict_dataset("dataset-hash") is True
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get(("dataset-hash", "age")) is None
+    assert cache.get(("other-hash", "age")) is not None
+    assert dataset_cache.evict_dataset("dataset-hash") is False
+
+
+@patch("analysis.services.dataset_cache.schedule_columnar_conversion")
+@patch("analysis.services.dataset_cache.S3Client.get_client")
+def test_get_cached_dataset_path_downloads_once_for_concurrent_callers(
+    mock_get_client: Mock,
+    mock_schedule_conversion: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Let concurrent callers wait for a single in-flight download."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    download_flights = SingleFlight()
+    monkeypatch.setattr(dataset_cache, "download_flights", download_flights)
+    download_started = threading.Event()
+    release_download = threading.Event()
+
+    def download_file(**kwargs: str) -> None:
+        download_started.set()
+        release_download.wait(timeout=5)
+        Path(kwargs["Filename"]).write_bytes(b"sav-data")
+
+    mock_s3_client = Mock()
+    mock_s3_client.download_file.side_effect = download_file
+    mock_get_client.return_value = mock_s3_client
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(
+            get_cached_dataset_path, "dataset-hash", "datasets/test.sav"
+        )
+        download_started.wait(timeout=5)
+        others = [
+            executor.submit(
+                get_cached_dataset_path, "dataset-hash", "datasets/test.sav"
+            )
+            for _ in range(3)
+        ]
+        while download_flights.coalesced < 3:
+            time.sleep(0.01)
+        release_download.set()
+        results = [first.result(), *(future.result() for future in others)]
+
+    assert results == [tmp_path / "dataset-hash.sav"] * 4
+    mock_s3_client.download_file.assert_called_once()
+    assert download_flights.stats() == {"in_flight": 0, "calls": 1, "coalesced": 3}
+
+
+@patch("analysis.services.dataset_cache.schedule_columnar_conversion")
+@patch("analysis.services.dataset_cache.S3Client.get_client")
+def test_get_cached_dataset_path_waits_for_download_of_other_process(
+    mock_get_client: Mock,
+    mock_schedule_conversion: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Reuse the file downloaded by whoever held the download lock."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    cached_path = tmp_path / "dataset-hash.sav"
+    lock_acquired = threading.Event()
+    release_lock = threading.Event()
+
+    def hold_lock() -> None:
+        # Another worker process holds the download lock and finishes first
+        with cached_path.with_suffix(".lock").open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            lock_acquired.set()
+            release_lock.wait(timeout=5)
+            cached_path.write_bytes(b"downloaded-elsewhere")
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        holder = executor.submit(hold_lock)
+        lock_acquired.wait(timeout=5)
+        waiter = executor.submit(
+            get_cached_dataset_path, "dataset-hash", "datasets/test.sav"
+        )
+        release_lock.set()
+        holder.result()
+        result = waiter.result()
+
+    assert result.read_bytes() == b"downloaded-elsewhere"
+    mock_get_client.assert_not_called()
+
+
+@patch("analysis.services.dataset_cache.schedule_columnar_conversion")
+@patch("analysis.services.dataset_cache.S3Client.get_client")
+def test_get_cached_dataset_path_uses_parallel_transfer_config(
+    mock_get_client: Mock,
+    mock_schedule_conversion: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Download large datasets in concurrent, ranged parts."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+    monkeypatch.setattr(settings, "s3_transfer_part_size", 8 * 1024 * 1024)
+    monkeypatch.setattr(settings, "s3_transfer_concurrency", 4)
+
+    mock_s3_client = Mock()
+    mock_get_client.return_value = mock_s3_client
+    mock_s3_client.download_file.side_effect = lambda **kwargs: Path(
+        kwargs["Filename"]
+    ).write_bytes(b"sav-data")
+
+    get_cached_dataset_path("dataset-hash", "datasets/test.sav")
+
+    transfer_config = mock_s3_client.download_file.call_args.kwargs["Config"]
+    assert transfer_config.multipart_chunksize == 8 * 1024 * 1024
+    assert transfer_config.max_request_concurrency == 4
+    assert transfer_config.use_threads is True
+
+
+@pytest.mark.anyio
+@patch("analysis.services.dataset_cache.schedule_columnar_conversion")
+@patch("analysis.services.dataset_cache.S3Client.get_client")
+async def test_ensure_dataset_cached_downloads_on_download_executor(
+    mock_get_client: Mock,
+    mock_schedule_conversion: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Run downloads on the dedicated download threads, not the event loop."""
+    monkeypatch.setattr(dataset_cache, "CACHE_DIRECTORY", tmp_path)
+
+    download_threads = []
+
+    def download_file(**kwargs: str) -> None:
+        download_threads.append(threading.current_thread().name)
+        Path(kwargs["Filename"]).write_bytes(b"sav-data")
+
+    mock_s3_client = Mock()
+    mock_get_client.return_value = mock_s3_client
+    mock_s3_client.download_file.side_effect = download_file
+
+    result = await dataset_cache.ensure_dataset_cached(
+        "dataset-hash", "datasets/test.sav"
+    )
+
+    assert result == tmp_path / "dataset-hash.sav"
+    assert len(download_threads) == 1
+    assert download_threads[0].startswith("dataset-download")
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import pytest
+
+from analysis.services.executor import InstrumentedExecutor
+
+
+@pytest.mark.anyio
+async def test_instrumented_executor_runs_work_on_its_threads() -> None:
+    """Run work on the executor's own threads and count it."""
+    executor = InstrumentedExecutor(max_workers=2, thread_name_prefix="test-compute")
+
+    thread_name = await executor.run(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("test-compute")
+    stats = executor.stats()
+    assert stats["completed"] == 1
+    assert stats["failed"] == 0
+    assert stats["queued"] == 0
+    assert stats["active"] == 0
+
+
+@pytest.mark.anyio
+async def test_instrumented_executor_keeps_event_loop_responsive() -> None:
+    """Serve other coroutines while a computation blocks a worker thread."""
+    executor = InstrumentedExecutor(max_workers=1, thread_name_prefix="test-compute")
+    release = threading.Event()
+
+    computation = asyncio.ensure_future(executor.run(release.wait, 5))
+    await asyncio.sleep(0.01)
+
+    assert executor.stats()["active"] == 1
+    assert not computation.done()
+
+    release.set()
+    assert await computation is True
+
+
+@pytest.mark.anyio
+async def test_instrumented_executor_counts_failures() -> None:
+    """Propagate exceptions to the caller and count the failed task."""
+    executor = InstrumentedExecutor(max_workers=1, thread_name_prefix="test-compute")
+
+    def fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await executor.run(fail)
+
+    assert executor.stats()["failed"] == 1
+
+
+def test_instrumented_executor_accepts_work_from_other_threads() -> None:
+    """Submit work without an event loop and wait for its future."""
+    executor = InstrumentedExecutor(max_workers=2, thread_name_prefix="test-stats")
+
+    futures = [executor.submit(pow, base, 2) for base in range(4)]
+
+    assert [future.result() for future in futures] == [0, 1, 4, 9]
+    assert executor.stats()["completed"] == 4
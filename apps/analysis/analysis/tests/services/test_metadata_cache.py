@@ -0,0 +1,51 @@
+from datetime import UTC, datetime
+from unittest.mock import Mock
+
+from analysis.services.metadata_cache import MetadataCache
+
+
+def _dataset(file_hash: str, updated_at: datetime) -> Mock:
+    dataset = Mock()
+    dataset.id = "dataset-id"
+    dataset.file_hash = file_hash
+    dataset.updated_at = updated_at
+    return dataset
+
+
+def test_metadata_cache_returns_cached_variables() -> None:
+    """Return cached variables and report the names that still need loading."""
+    cache = MetadataCache(ttl=60, max_entries=10)
+    dataset = _dataset("hash", datetime(2024, 1, 1, tzinfo=UTC))
+    variable = Mock()
+    cache.put_variables(dataset, {"q1": variable})
+
+    found, missing = cache.get_variables(dataset, ["q1", "q2"])
+
+    assert found == {"q1": variable}
+    assert missing == ["q2"]
+    assert cache.stats()["variables"]["hits"] == 1
+    assert cache.stats()["variables"]["misses"] == 1
+
+
+def test_metadata_cache_invalidates_variables_of_updated_dataset() -> None:
+    """Stop serving variables once the dataset row has changed."""
+    cache = MetadataCache(ttl=60, max_entries=10)
+    cache.put_variables(
+        _dataset("hash", datetime(2024, 1, 1, tzinfo=UTC)), {"q1": Mock()}
+    )
+
+    updated = _dataset("hash", datetime(2024, 1, 2, tzinfo=UTC))
+    replaced = _dataset("new-hash", datetime(2024, 1, 1, tzinfo=UTC))
+
+    assert cache.get_variables(updated, ["q1"]) == ({}, ["q1"])
+    assert cache.get_variables(replaced, ["q1"]) == ({}, ["q1"])
+
+
+def test_metadata_cache_evicts_variables_by_file_hash() -> None:
+    """Drop all variables of a deleted dataset file."""
+    cache = MetadataCache(ttl=60, max_entries=10)
+    dataset = _dataset("hash", datetime(2024, 1, 1, tzinfo=UTC))
+    cache.put_variables(dataset, {"q1": Mock(), "q2": Mock()})
+
+    assert cache.evict_file_hash("hash") == 2
+    assert cache.get_variables(dataset, ["q1"]) == ({}, ["q1"])
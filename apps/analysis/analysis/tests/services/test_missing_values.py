@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.services.missing_values import compile_missing_value_spec
+
+
+def test_compile_missing_value_spec_merges_overlapping_ranges() -> None:
+    """Merge overlapping ranges and skip malformed ones."""
+    spec = compile_missing_value_spec(
+        ["99", 98.5],
+        [{"lo": 5, "hi": 10}, {"lo": 1, "hi": 6}, {"lo": 20}, {"lo": 30, "hi": 31}],
+    )
+
+    assert spec.points.tolist() == [98.5, 99.0]
+    assert spec.lows.tolist() == [1.0, 30.0]
+    assert spec.highs.tolist() == [10.0, 31.0]
+
+
+def test_missing_value_spec_handles_open_ended_ranges() -> None:
+    """Look up huge ranges, such as LO THRU -1, without enumerating them."""
+    spec = compile_missing_value_spec(None, [{"lo": -1e12, "hi": -1}])
+    variable = pd.Series([-5e9, -1.0, -0.5, 0.0, np.nan])
+
+    assert spec.mask(variable).tolist() == [True, True, False, False, False]
+    assert spec.contains(np.array([-2.0, 3.0])).tolist() == [True, False]
+
+
+def test_missing_value_spec_matches_points_in_string_columns() -> None:
+    """Compare non-numeric columns with the configured missing values as is."""
+    spec = compile_missing_value_spec([1], None)
+    variable = pd.Series([1, "1", "a"], dtype=object)
+
+    assert spec.point_mask(variable).tolist() == [True, False, False]
+
+
+def test_compile_missing_value_spec_caches_compiled_specs() -> None:
+    """Reuse the compiled spec for the same definition."""
+    missing_ranges = [{"lo": 97, "hi": 99}]
+
+    assert compile_missing_value_spec([-9], missing_ranges) is (
+        compile_missing_value_spec([-9], [{"lo": 97, "hi": 99}])
+    )
+
+
+def test_compile_missing_value_spec_rejects_non_numeric_values() -> None:
+    """Raise a ValueError for missing values that are not numeric."""
+    with pytest.raises(ValueError, match="Cannot convert missing_values"):
+        compile_missing_value_spec(["n/a"], None)
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from analysis.services.raw_data_index import RawDataIndex, TokenIndex
+from analysis.services.stats import RawDataService
+
+
+def test_raw_data_index_finds_positions_once() -> None:
+    """Cache the positions of non-empty values per file and variable."""
+    index = RawDataIndex(max_bytes=1024, max_token_bytes=1024)
+    variable = pd.Series(["a", " ", None, "b"], dtype="str")
+
+    positions = index.get_positions("hash", "q1", variable, True)
+
+    assert positions.tolist() == [0, 3]
+    assert index.get_positions("hash", "q1", variable, True) is positions
+    assert index.get_positions("hash", "q1", variable, False) == range(4)
+    assert index.stats()["positions"]["misses"] == 1
+
+    assert index.evict_file_hash("other-hash") == 0
+    assert index.evict_file_hash("hash") == 1
+
+
+def test_raw_data_service_pages_with_cursor() -> None:
+    """Page through all values with cursors, beyond the default max_values."""
+    values = ["", "answer", None] * 1000
+    df = pd.DataFrame({"q1": pd.Series(values, dtype="str")})
+    service = RawDataService(
+        RawDataIndex(max_bytes=1024 * 1024, max_token_bytes=0).for_file("hash")
+    )
+
+    pages = []
+    cursor = None
+    while True:
+        result = service.get_raw_values(
+            df, ["q1"], max_values=5000, page_size=300, cursor=cursor
+        )["q1"]
+        pages.append(result["page"])
+        cursor = result["nextCursor"]
+        if cursor is None:
+            break
+
+    assert pages == [1, 2, 3, 4]
+    assert result["totalNonEmptyCount"] == 1000
+    assert result["nonEmptyCount"] == 100
+    assert result == service.get_raw_values(
+        df, ["q1"], max_values=5000, page=4, page_size=300
+    )["q1"] | {"nextCursor": None}
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("serv", [0, 3]),
+        ("SERVICE great", [0, 3]),
+        ("great food", [3]),
+        ("good service", []),
+        ("2", [4]),
+        ("missing", []),
+    ],
+)
+def test_token_index_search(query: str, expected: list[int]) -> None:
+    """Match rows containing every word of the query, ignoring case."""
+    variable = pd.Series(
+        ["Great service!", "Good food", None, "Slow Service, great food", 12.5],
+        dtype=object,
+    )
+
+    index = TokenIndex.build(variable, [0, 1, 3, 4])
+
+    assert index.search(query).tolist() == expected
+
+
+def test_raw_data_service_pages_through_search_results() -> None:
+    """Search the values of a variable and build the token index only once."""
+    values = ["It was great", "", "Not so great", "Bad"] * 250
+    df = pd.DataFrame({"q1": pd.Series(values, dtype="str")})
+    index = RawDataIndex(max_bytes=1024 * 1024, max_token_bytes=1024 * 1024)
+
+    result = RawDataService(index.for_file("hash", search="Great")).get_raw_values(
+        df, ["q1"], page=100, page_size=5
+    )["q1"]
+    assert result["values"] == ["Not so great", "It was great"] * 2 + ["Not so great"]
+    assert result["totalNonEmptyCount"] == 500
+    assert result["totalPages"] == 100
+
+    result = RawDataService(index.for_file("hash", search="not")).get_raw_values(
+        df, ["q1"]
+    )["q1"]
+    assert result["totalNonEmptyCount"] == 250
+    assert index.stats()["tokens"]["misses"] == 1
+
+    # Searches without words match everything
+    result = RawDataService(index.for_file("hash", search=" ! ")).get_raw_values(
+        df, ["q1"]
+    )["q1"]
+    assert result["totalNonEmptyCount"] == 750
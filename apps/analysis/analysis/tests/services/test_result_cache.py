@@ -0,0 +1,56 @@
+from analysis.services.result_cache import StatsResultCache
+from analysis.services.stats import VariableStatsRequest
+
+
+def test_stats_result_cache_returns_cached_results() -> None:
+    """Serve repeated requests and report the hit ratio."""
+    cache = StatsResultCache(max_entries=10)
+    request = VariableStatsRequest("q1", value_labels={"1": "Yes"})
+    cache.put("hash", request, {"count": 3})
+
+    assert cache.get("hash", VariableStatsRequest("q1", value_labels={"1": "Yes"}))
+    assert cache.get("hash", request, decimal_places=None) is None
+    assert cache.get("hash", request, include=["count"]) is None
+    assert cache.stats()["hit_ratio"] == 0.333
+
+
+def test_stats_result_cache_misses_after_metadata_changes() -> None:
+    """Never serve results computed for other metadata or another file."""
+    cache = StatsResultCache(max_entries=10)
+    cache.put(
+        "hash",
+        VariableStatsRequest("q1", missing_values=[9], split_variable="group"),
+        {"count": 3},
+    )
+
+    assert cache.get("hash", VariableStatsRequest("q1", split_variable="group")) is None
+    assert (
+        cache.get(
+            "hash",
+            VariableStatsRequest(
+                "q1",
+                missing_values=[9],
+                split_variable="group",
+                split_variable_missing_values=[1],
+            ),
+        )
+        is None
+    )
+    assert (
+        cache.get(
+            "new-hash",
+            VariableStatsRequest("q1", missing_values=[9], split_variable="group"),
+        )
+        is None
+    )
+
+
+def test_stats_result_cache_evicts_file_hash() -> None:
+    """Drop the results of an evicted dataset file only."""
+    cache = StatsResultCache(max_entries=10)
+    cache.put("hash", VariableStatsRequest("q1"), {"count": 1})
+    cache.put("hash", VariableStatsRequest("q2"), {"count": 2})
+    cache.put("other-hash", VariableStatsRequest("q1"), {"count": 3})
+
+    assert cache.evict_file_hash("hash") == 2
+    assert cache.get("other-hash", VariableStatsRequest("q1")) == {"count": 3}
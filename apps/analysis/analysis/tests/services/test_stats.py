@@ -1,7 +1,12 @@
 import pandas as pd
 import pytest
 
-from analysis.services.stats import RawDataService, StatisticsService
+from analysis.services.stats import (
+    RawDataService,
+    StatisticsService,
+    VariableStatsRequest,
+)
+from analysis.services.stats_index import summarize_column
 
 
 @pytest.fixture
@@ -111,6 +116,32 @@ def test_get_raw_values_include_empty(raw_data_service: RawDataService) -> None:
     assert result["feedback"]["totalCount"] == 4
 
 
+@pytest.mark.parametrize("dtype", ["str", object])
+def test_get_raw_values_stops_at_max_values(
+    raw_data_service: RawDataService,
+    dtype: str | type,
+) -> None:
+    """Test paging through a long column limited to max_values."""
+    values = [" ", None, "a", "\t", 1.5, ""] * 2000
+    if dtype == "str":
+        values = [v if not isinstance(v, float) else str(v) for v in values]
+    df = pd.DataFrame({"feedback": pd.Series(values, dtype=dtype)})
+
+    result = raw_data_service.get_raw_values(
+        df, ["feedback"], max_values=3001, page=601, page_size=5
+    )
+
+    assert result["feedback"] == {
+        "values": ["a"],
+        "totalCount": 12000,
+        "nonEmptyCount": 1,
+        "totalNonEmptyCount": 3001,
+        "totalPages": 601,
+        "page": 601,
+        "nextCursor": None,
+    }
+
+
 @pytest.fixture
 def stats_service() -> StatisticsService:
     """Fixture to provide a StatisticsService instance for testing."""
@@ -1108,3 +1139,389 @@ def test_missing_ranges_empty_or_none(stats_service) -> None:
     assert "97.0" in freq_empty
     assert "98.0" in freq_empty
     assert "99.0" in freq_empty
+
+
+def test_frequency_table_sorts_numbers_before_strings(stats_service) -> None:
+    """Test that values are sorted numerically, followed by non-numeric labels."""
+    df = pd.DataFrame({"test_var": [10, 2, 2, 1, 10, 10]})
+    value_labels = {"b": "B", "3": "Three", "a": "A", "99": "No answer"}
+
+    result = stats_service.describe_var(
+        df,
+        "test_var",
+        include=["frequencies"],
+        missing_values=[99],
+        value_labels=value_labels,
+        decimal_places=1,
+    )
+
+    assert result["frequency_table"] == [
+        {"value": "1.0", "counts": 1, "percentages": 16.7},
+        {"value": "2.0", "counts": 2, "percentages": 33.3},
+        {"value": "3", "counts": 0, "percentages": 0.0},
+        {"value": "10.0", "counts": 3, "percentages": 50.0},
+        {"value": "a", "counts": 0, "percentages": 0.0},
+        {"value": "b", "counts": 0, "percentages": 0.0},
+    ]
+
+
+def test_describe_var_with_split_variable_matches_per_category_stats(
+    stats_service,
+) -> None:
+    """Test that split statistics equal the statistics of each category's rows."""
+    df = pd.DataFrame(
+        {
+            "score": [1.5, 2.25, None, 4.0, 3.5, 1.0, 2.0, 5.5],
+            "group": [2, 1, 1, 2, None, 3, 1, 2],
+            "unrelated": list("abcdefgh"),
+        }
+    )
+
+    result = stats_service.describe_var(df, "score", split_variable="group")
+
+    assert list(result["categories"]) == ["1.0", "2.0", "3.0"]
+    for category, category_stats in result["categories"].items():
+        category_df = df[df["group"] == float(category)]
+        assert category_stats == stats_service.describe_var(category_df, "score")
+
+
+def test_missing_values_do_not_modify_shared_dataframe(stats_service) -> None:
+    """Test that missing values are applied to a copy of the variable only."""
+    df = pd.DataFrame(
+        {
+            "score": [1.0, 2.0, 97.0, 99.0],
+            "group": [1.0, 1.0, 2.0, -9.0],
+        }
+    )
+    original = df.copy()
+
+    stats = stats_service.describe_var(
+        df,
+        "score",
+        include=["count"],
+        missing_values=[99],
+        missing_ranges=[{"lo": 97, "hi": 98}],
+        split_variable="group",
+        split_variable_missing_values=[-9],
+    )
+
+    assert stats["categories"] == {"1.0": {"count": 2}, "2.0": {"count": 0}}
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_missing_ranges_exclude_value_labels_within_range(stats_service) -> None:
+    """Test that labels anywhere within a missing range are left out."""
+    df = pd.DataFrame({"test_var": [1.0, 2.0, -3.0]})
+    value_labels = {"1": "Yes", "2": "No", "-1": "Refused", "-2.5": "Other"}
+
+    result = stats_service.describe_var(
+        df,
+        "test_var",
+        include=["frequencies"],
+        missing_ranges=[{"lo": -1e9, "hi": -1}],
+        value_labels=value_labels,
+    )
+
+    values = [item["value"] for item in result["frequency_table"]]
+    assert values == ["1.0", "1", "2.0", "2"]
+
+
+def test_describe_many_matches_describe_var(stats_service) -> None:
+    """Test that batched statistics equal those of describing each variable."""
+    df = pd.DataFrame(
+        {
+            "score": [1.5, 2.25, None, 4.0, 3.5, 1.0, 2.0, 5.5],
+            "rating": [1, 2, 2, 3, 99, 1, 2, 3],
+            "count": [5, 3, 5, 1, 2, 2, 5, 4],
+            "name": list("abcabcab"),
+            "group": [2, 1, 1, 2, None, 3, 1, 2],
+        }
+    )
+    requests = [
+        VariableStatsRequest("score", missing_ranges=[{"lo": 5, "hi": 6}]),
+        VariableStatsRequest("rating", missing_values=[99], value_labels={"4": "x"}),
+        VariableStatsRequest("count"),
+        VariableStatsRequest("name"),
+        VariableStatsRequest("score", split_variable="group"),
+        VariableStatsRequest(
+            "rating",
+            missing_values=["99"],
+            split_variable="group",
+            split_variable_missing_values=[3],
+        ),
+        VariableStatsRequest("group", split_variable="group"),
+    ]
+
+    results = stats_service.describe_many(df, requests, decimal_places=3)
+
+    assert [result["variable"] for result in results] == [
+        request.variable_name for request in requests
+    ]
+    for request, result in zip(requests, results, strict=True):
+        assert result["stats"] == stats_service.describe_var(
+            df,
+            request.variable_name,
+            missing_values=request.missing_values,
+            missing_ranges=request.missing_ranges,
+            value_labels=request.value_labels,
+            split_variable=request.split_variable,
+            split_variable_missing_values=request.split_variable_missing_values,
+            decimal_places=3,
+        )
+
+
+def test_describe_many_reports_errors_per_variable(stats_service) -> None:
+    """Test that a variable that cannot be described does not fail the batch."""
+    df = pd.DataFrame({"score": [1.0, 2.0, 3.0]})
+    requests = [
+        VariableStatsRequest("score", missing_values=["n/a"]),
+        VariableStatsRequest("unknown"),
+        VariableStatsRequest("score", split_variable="unknown"),
+        VariableStatsRequest("score"),
+    ]
+
+    results = stats_service.describe_many(df, requests, include=["count"])
+
+    assert "Cannot convert missing_values[0]" in results[0]["error"]
+    assert results[1]["error"] == "Variable 'unknown' not found in the DataFrame."
+    assert results[2]["error"] == (
+        "Split variable 'unknown' not found in the DataFrame."
+    )
+    assert results[3] == {"variable": "score", "stats": {"count": 3}}
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [3.5, None, 1.25, 3.5, 2.0, 7.75],
+        [4, 1, 1, 3, 2, 2, 9],
+        [float("nan"), float("nan")],
+    ],
+)
+def test_numeric_stats_match_pandas_reductions(stats_service, values) -> None:
+    """Test that statistics derived from value counts equal pandas reductions."""
+    variable = pd.Series(values)
+
+    result = stats_service.describe_var(
+        pd.DataFrame({"test_var": variable}),
+        "test_var",
+        decimal_places=None,
+    )
+
+    def reduced(value) -> float | None:
+        return None if pd.isna(value) else float(value)
+
+    assert result["count"] == variable.count()
+    assert result["mode"] == variable.mode().tolist()
+    assert result["min"] == reduced(variable.min())
+    assert result["max"] == reduced(variable.max())
+    assert result["median"] == reduced(variable.median())
+    assert result["range"] == reduced(variable.max() - variable.min())
+
+
+def test_describe_from_index_matches_describe_var(stats_service) -> None:
+    """Test that index answers equal statistics computed from the data."""
+    df = pd.DataFrame({"test_var": [1.0, 2.0, 2.0, None, 4.0, 9.0, 2.0]})
+    summary = summarize_column(df["test_var"])
+
+    for options in (
+        {},
+        {"value_labels": {"1": "Yes", "3": "Maybe"}},
+        {"missing_values": [9], "include": ["count", "median", "frequencies"]},
+        {"missing_ranges": [{"lo": 3, "hi": 10}], "decimal_places": 1},
+    ):
+        assert stats_service.describe_from_index(
+            summary,
+            **options,
+        ) == stats_service.describe_var(df, "test_var", **options)
+
+
+def test_describe_from_index_needs_value_counts_for_missing_values(
+    stats_service,
+) -> None:
+    """Test that the index cannot apply missing values without value counts."""
+    summary = {
+        "dtype": "float64",
+        "stats": {
+            "count": 2,
+            "mean": 1.5,
+            "std": 0.7,
+            "min": 1.0,
+            "max": 2.0,
+            "median": 1.5,
+            "range": 1.0,
+        },
+    }
+
+    assert stats_service.describe_from_index(summary, include=["mean"]) == {"mean": 1.5}
+    assert stats_service.describe_from_index(summary, include=["mode"]) is None
+    assert stats_service.describe_from_index(summary, missing_values=[1]) is None
+
+
+def test_crosstab_counts_and_percentages(stats_service) -> None:
+    """Test a crosstab with missing values and labelled empty categories."""
+    df = pd.DataFrame(
+        {
+            "q1": [1.0, 2.0, 1.0, 1.0, 9.0, 2.0, None],
+            "gender": [1.0, 1.0, 2.0, 2.0, 1.0, 99.0, 2.0],
+        }
+    )
+    request = VariableStatsRequest(
+        "q1",
+        missing_values=[9],
+        value_labels={"1": "Yes", "2": "No", "3": "Maybe", "9": "No answer"},
+        split_variable="gender",
+        split_variable_value_labels={"1.0": "Male", "2.0": "Female"},
+        split_variable_missing_values=[99],
+    )
+
+    result = stats_service.crosstab(df, request, decimal_places=1)
+
+    assert result == {
+        "rows": [
+            {"value": "1.0", "label": "Yes"},
+            {"value": "2.0", "label": "No"},
+            {"value": "3.0", "label": "Maybe"},
+        ],
+        "columns": [
+            {"value": "1.0", "label": "Male"},
+            {"value": "2.0", "label": "Female"},
+        ],
+        "counts": [[1, 2], [1, 0], [0, 0]],
+        "row_percentages": [[33.3, 66.7], [100.0, 0.0], [0.0, 0.0]],
+        "column_percentages": [[50.0, 100.0], [50.0, 0.0], [0.0, 0.0]],
+        "total_percentages": [[25.0, 50.0], [25.0, 0.0], [0.0, 0.0]],
+        "row_totals": [3, 1, 0],
+        "column_totals": [2, 2],
+        "total": 4,
+    }
+
+
+def test_crosstab_needs_split_variable(stats_service) -> None:
+    """Test that a crosstab without split variable is rejected."""
+    df = pd.DataFrame({"q1": [1.0]})
+
+    with pytest.raises(ValueError, match="no split variable"):
+        stats_service.crosstab(df, VariableStatsRequest("q1"))
+    with pytest.raises(ValueError, match="Split variable 'group' not found"):
+        stats_service.crosstab(df, VariableStatsRequest("q1", split_variable="group"))
+
+
+MULTI_RESPONSE_ITEMS = pd.DataFrame(
+    {
+        "q_a": [1.0, 0.0, 1.0, 9.0, None],
+        "q_b": [1.0, 1.0, 0.0, 0.0, None],
+        "q_c": [0.0, 0.0, 0.0, 1.0, None],
+        "group": [1.0, 1.0, 2.0, 99.0, 2.0],
+    }
+)
+
+
+def _multi_response_requests() -> list[VariableStatsRequest]:
+    return [
+        VariableStatsRequest(name, missing_values=[9]) for name in ["q_a", "q_b", "q_c"]
+    ]
+
+
+def test_describe_multi_response(stats_service) -> None:
+    """Test counts and percentages of respondents and of responses."""
+    result = stats_service.describe_multi_response(
+        MULTI_RESPONSE_ITEMS,
+        _multi_response_requests(),
+    )
+
+    assert result == {
+        "items": [
+            {
+                "variable": "q_a",
+                "counts": 2,
+                "respondent_percentages": 50.0,
+                "response_percentages": 40.0,
+            },
+            {
+                "variable": "q_b",
+                "counts": 2,
+                "respondent_percentages": 50.0,
+                "response_percentages": 40.0,
+            },
+            {
+                "variable": "q_c",
+                "counts": 1,
+                "respondent_percentages": 25.0,
+                "response_percentages": 20.0,
+            },
+        ],
+        "respondents": 4,
+        "responses": 5,
+    }
+
+
+def test_describe_multi_response_by_split_variable(stats_service) -> None:
+    """Test a multi-response set split by a variable with missing values."""
+    result = stats_service.describe_multi_response(
+        MULTI_RESPONSE_ITEMS,
+        _multi_response_requests(),
+        split_variable="group",
+        split_variable_value_labels={"1": "A", "2": "B"},
+        split_variable_missing_values=[99],
+    )
+
+    assert result["split_variable"] == "group"
+    assert result["split_variable_labels"] == {"1": "A", "2": "B"}
+    assert list(result["categories"]) == ["1.0", "2.0"]
+
+    first = result["categories"]["1.0"]
+    assert (first["respondents"], first["responses"]) == (2, 3)
+    assert [item["counts"] for item in first["items"]] == [1, 2, 0]
+    assert [item["respondent_percentages"] for item in first["items"]] == [
+        50.0,
+        100.0,
+        0.0,
+    ]
+    assert [item["response_percentages"] for item in first["items"]] == [
+        33.33,
+        66.67,
+        0.0,
+    ]
+
+    # The last row of the second category has no selection and is not counted
+    second = result["categories"]["2.0"]
+    assert (second["respondents"], second["responses"]) == (1, 1)
+    assert [item["counts"] for item in second["items"]] == [1, 0, 0]
+
+
+def test_describe_multi_response_needs_numeric_items(stats_service) -> None:
+    """Test that text items of a multi-response set are rejected."""
+    df = pd.DataFrame({"q_a": [1.0], "q_b": pd.Series(["yes"], dtype="str")})
+
+    with pytest.raises(ValueError, match="q_b is not numeric"):
+        stats_service.describe_multi_response(
+            df,
+            [VariableStatsRequest("q_a"), VariableStatsRequest("q_b")],
+        )
+    with pytest.raises(ValueError, match="Variable 'q_c' not found"):
+        stats_service.describe_multi_response(df, [VariableStatsRequest("q_c")])
+    with pytest.raises(ValueError, match="Split variable 'group' not found"):
+        stats_service.describe_multi_response(
+            df,
+            [VariableStatsRequest("q_a")],
+            split_variable="group",
+        )
+
+
+def test_describe_multi_response_counts_respondents_with_a_selection(
+    stats_service,
+) -> None:
+    """Test that rows answering every item without a selection are no respondents."""
+    df = pd.DataFrame({"q_a": [1.0, 0.0, 0.0, None], "q_b": [0.0, 0.0, 1.0, None]})
+
+    result = stats_service.describe_multi_response(
+        df,
+        [VariableStatsRequest("q_a"), VariableStatsRequest("q_b")],
+    )
+
+    assert result["respondents"] == 2
+    assert [item["respondent_percentages"] for item in result["items"]] == [
+        50.0,
+        50.0,
+    ]
@@ -0,0 +1,83 @@
+import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyreadstat
+import pytest
+
+from analysis.services.columnar_cache import convert_to_columnar, get_sidecar_path
+from analysis.services.stats import StatisticsService
+from analysis.services.stats_index import load_stats_index, summarize_column
+from analysis.settings import settings
+
+
+def test_summarize_column_keeps_value_counts_of_low_cardinality_columns() -> None:
+    """Store exact value counts, sorted by value, for columns with few values."""
+    summary = summarize_column(pd.Series([3.0, 1.0, np.nan, 3.0]))
+
+    assert summary == {
+        "dtype": "float64",
+        "stats": {
+            "count": 3,
+            "mean": 7 / 3,
+            "std": pytest.approx(1.1547005),
+            "min": 1.0,
+            "max": 3.0,
+            "median": 3.0,
+            "range": 2.0,
+            "mode": [3.0],
+        },
+        "values": [1.0, 3.0],
+        "counts": [1, 2],
+    }
+
+
+def test_summarize_column_leaves_out_counts_of_continuous_columns(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Keep only the statistics of columns with many distinct values."""
+    monkeypatch.setattr(settings, "stats_index_max_distinct_values", 2)
+
+    summary = summarize_column(pd.Series([0.5, 1.5, 2.5]))
+
+    assert "values" not in summary
+    assert "mode" not in summary["stats"]
+    assert summarize_column(pd.Series(["a", "b"])) is None
+    # Only requests without frequencies and mode are answered from the index
+    assert StatisticsService().describe_from_index(summary) is None
+    assert StatisticsService().describe_from_index(
+        summary, include=["count", "mean"]
+    ) == {"count": 3, "mean": 1.5}
+
+
+def test_convert_to_columnar_writes_stats_index(tmp_path: Path) -> None:
+    """Build the statistics index of numeric columns with the columnar copy."""
+    sav_path = tmp_path / "dataset-hash.sav"
+    df = pd.DataFrame(
+        {
+            "rating": [1.0, 2.0, 2.0, 5.0, np.nan],
+            "feedback": ["a", "b", "c", "d", "e"],
+            "visited": [datetime.date(2024, 1, day) for day in range(1, 6)],
+        }
+    )
+    pyreadstat.write_sav(df, str(sav_path))
+
+    convert_to_columnar(sav_path)
+    stats_index = load_stats_index(get_sidecar_path(sav_path))
+
+    assert list(stats_index) == ["rating"]
+    expected = StatisticsService().describe_var(
+        df,
+        "rating",
+        missing_values=[5],
+        value_labels={"1": "Low", "5": "High"},
+    )
+    assert (
+        StatisticsService().describe_from_index(
+            stats_index["rating"],
+            missing_values=[5],
+            value_labels={"1": "Low", "5": "High"},
+        )
+        == expected
+    )
@@ -0,0 +1,121 @@
+import pandas as pd
+import pytest
+
+from analysis.services.raw_data_index import RawDataIndex, TokenIndex
+from analysis.services.word_frequencies import WordFrequencyService
+
+ANSWERS = pd.Series(
+    [
+        "The service was great",
+        "Great food, slow service",
+        None,
+        "  ",
+        "Food was cold. Cold!",
+        "Great SERVICE",
+    ],
+    dtype="str",
+)
+
+
+def test_count_words_returns_top_words() -> None:
+    """Count word occurrences, leaving out stopwords and ties in order."""
+    df = pd.DataFrame({"q1": ANSWERS})
+
+    result = WordFrequencyService().count_words(df, "q1", top_n=3)
+
+    assert result == {
+        "total_count": 11,
+        "words": [
+            {"word": "service", "count": 3},
+            {"word": "great", "count": 3},
+            {"word": "food", "count": 2},
+        ],
+    }
+    result = WordFrequencyService().count_words(
+        df, "q1", top_n=2, stopwords=["great", "Food"]
+    )
+
+    assert result["words"] == [
+        {"word": "service", "count": 3},
+        {"word": "was", "count": 2},
+    ]
+
+
+def test_count_words_by_split_variable() -> None:
+    """Count words per split category, leaving out missing split values."""
+    df = pd.DataFrame(
+        {
+            "q1": ANSWERS,
+            "group": [2.0, 1.0, 1.0, 1.0, 9.0, 2.0],
+        }
+    )
+    service = WordFrequencyService(RawDataIndex(1024, 1024).token_index_for_file("h"))
+
+    result = service.count_words(
+        df,
+        "q1",
+        split_variable="group",
+        split_variable_value_labels={"1": "A", "2": "B"},
+        split_variable_missing_values=[9],
+        top_n=2,
+    )
+
+    assert result == {
+        "split_variable": "group",
+        "categories": {
+            "1.0": {
+                "total_count": 4,
+                "words": [
+                    {"word": "service", "count": 1},
+                    {"word": "great", "count": 1},
+                ],
+            },
+            "2.0": {
+                "total_count": 4,
+                "words": [
+                    {"word": "service", "count": 2},
+                    {"word": "great", "count": 2},
+                ],
+            },
+        },
+        "split_variable_labels": {"1": "A", "2": "B"},
+    }
+
+
+def test_count_words_rejects_numeric_variables() -> None:
+    """Only count the words of text variables."""
+    df = pd.DataFrame({"age": [21.0, 35.0]})
+
+    with pytest.raises(ValueError, match="not a text variable"):
+        WordFrequencyService().count_words(df, "age")
+
+
+def test_count_words_rejects_variables_missing_from_data() -> None:
+    """Reject variables and split variables that are not in the data."""
+    df = pd.DataFrame({"q1": ANSWERS})
+
+    with pytest.raises(ValueError, match="Variable 'q2' not found"):
+        WordFrequencyService().count_words(df, "q2")
+    with pytest.raises(ValueError, match="Split variable 'group' not found"):
+        WordFrequencyService().count_words(df, "q1", split_variable="group")
+
+
+def test_count_words_reports_words_as_written() -> None:
+    """Report words in lower case, not casefolded, but match stopwords by casefold."""
+    df = pd.DataFrame(
+        {"q1": pd.Series(["Große Straße", "große STRASSE", "Maße"], dtype="str")}
+    )
+
+    result = WordFrequencyService().count_words(df, "q1")
+
+    assert result["words"] == [
+        {"word": "große", "count": 2},
+        {"word": "straße", "count": 1},
+        {"word": "strasse", "count": 1},
+        {"word": "maße", "count": 1},
+    ]
+    result = WordFrequencyService().count_words(df, "q1", stopwords=["GROSSE"])
+    assert [word["word"] for word in result["words"]] == ["straße", "strasse", "maße"]
+    # Searches still ignore the spelling
+    index = TokenIndex.build(df["q1"], [0, 1, 2])
+    assert index.search("strasse").tolist() == [0, 1]
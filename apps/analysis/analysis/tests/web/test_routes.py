@@ -1,3 +1,5 @@
+import asyncio
+import time
 from io import BytesIO
 from pathlib import Path
 from tempfile import NamedTemporaryFile
@@ -8,17 +10,32 @@ import pandas as pd
 import pytest
 from fastapi import HTTPException, UploadFile
 
+from analysis.services.cache import LRUCache, SingleFlight, dataframe_nbytes
+from analysis.services.metadata_cache import MetadataCache
+from analysis.services.raw_data_index import RawDataIndex
+from analysis.services.result_cache import StatsResultCache
+from analysis.services.stats import StatisticsService, VariableStatsRequest
+from analysis.services.stats_index import summarize_column
 from analysis.web.api.datasets.routes import (
+    MultiResponseRequest,
     RawDataRequest,
     RawDataRequestOptions,
     RawDataResponse,
     RawDataVariableResponse,
     StatsRequest,
     StatsVariable,
+    WordFrequencyRequest,
+    _describe_in_parallel,
+    _get_dataset_by_id,
+    _read_dataframe_from_dataset,
+    _stats_request_columns,
     export_dataset_excel,
     export_dataset_powerpoint,
+    get_dataset_crosstab,
+    get_dataset_multi_response,
     get_dataset_raw_data,
     get_dataset_stats,
+    get_dataset_word_frequencies,
     preview_dataset_metadata,
 )
 from analysis.web.api.schemas.datasets import (
@@ -126,7 +143,7 @@ def test_stats_request_model_with_split_variables() -> None:
 
 @patch("analysis.web.api.datasets.routes._get_dataset_by_id")
 @patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
-@patch("analysis.web.api.datasets.routes._get_dataset_variable_by_name")
+@patch("analysis.web.api.datasets.routes._get_dataset_variables_by_name")
 @patch("analysis.web.api.datasets.routes.StatisticsService")
 def test_stats_endpoint_split_variable_logic(
     mock_stats_service_class: Mock,
@@ -153,7 +170,10 @@ def test_stats_endpoint_split_variable_logic(
     mock_split_var.value_labels = {"A": "Group A", "B": "Group B"}
     mock_split_var.missing_values = []
 
-    mock_get_variable.side_effect = [mock_main_var, mock_split_var]
+    mock_get_variable.return_value = {
+        "test_var": mock_main_var,
+        "split_var": mock_split_var,
+    }
 
     # Mock StatisticsService
     mock_stats_service = Mock()
@@ -180,6 +200,504 @@ def test_stats_endpoint_split_variable_logic(
     assert get_dataset_stats is not None
 
 
+def _mock_dataset_variable(name: str, value_labels: dict[str, str]) -> Mock:
+    variable = Mock()
+    variable.name = name
+    variable.value_labels = value_labels
+    variable.missing_values = None
+    variable.missing_ranges = None
+    return variable
+
+
+@pytest.mark.anyio
+@patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
+@patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
+async def test_stats_endpoint_loads_variables_in_one_query(
+    mock_read_df: Mock,
+    mock_ensure_cached: Mock,
+    mock_get_dataset: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Load all requested and split variables with a single database query."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.stats_result_cache",
+        StatsResultCache(max_entries=10),
+    )
+    mock_dataset = Mock()
+    mock_dataset.file_hash = "dataset-hash"
+    mock_dataset.storage_key = "test/path.sav"
+    mock_get_dataset.return_value = mock_dataset
+
+    mock_read_df.return_value = pd.DataFrame(
+        {
+            "q1": [1.0, 2.0, 1.0],
+            "q2": [2.0, 2.0, 1.0],
+            "group": [1.0, 2.0, 1.0],
+        }
+    )
+
+    query_result = Mock()
+    query_result.scalars.return_value.all.return_value = [
+        _mock_dataset_variable("q1", {"1": "Yes", "2": "No"}),
+        _mock_dataset_variable("q2", {"1": "Yes", "2": "No"}),
+        _mock_dataset_variable("group", {"1": "A", "2": "B"}),
+    ]
+    db = AsyncMock()
+    db.execute.return_value = query_result
+
+    results = await get_dataset_stats(
+        dataset_id="test-dataset-id",
+        stats_request=StatsRequest(
+            variables=[
+                StatsVariable(variable="q1"),
+                StatsVariable(variable="q2"),
+                StatsVariable(variable="missing"),
+            ],
+            split_variable="group",
+        ),
+        db=db,
+        api_key="test-key",
+    )
+
+    db.execute.assert_awaited_once()
+    assert [result["variable"] for result in results] == ["q1", "q2", "missing"]
+    assert "stats" in results[0]
+    assert "stats" in results[1]
+    assert results[2] == {"variable": "missing", "error": "Variable missing not found"}
+
+
+@pytest.mark.anyio
+@patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes.get_dataset_stats_index")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
+@patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
+async def test_stats_endpoint_answers_from_stats_index(
+    mock_read_df: Mock,
+    mock_ensure_cached: Mock,
+    mock_get_stats_index: Mock,
+    mock_get_dataset: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Load only the columns that the index and result cache cannot answer."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.stats_result_cache",
+        StatsResultCache(max_entries=10),
+    )
+    mock_dataset = Mock()
+    mock_dataset.file_hash = "dataset-hash"
+    mock_dataset.storage_key = "test/path.sav"
+    mock_get_dataset.return_value = mock_dataset
+
+    df = pd.DataFrame(
+        {
+            "q1": [1.0, 2.0, 1.0],
+            "q2": [2.0, 2.0, 1.0],
+            "group": [1.0, 2.0, 1.0],
+        }
+    )
+    mock_get_stats_index.return_value = {"q1": summarize_column(df["q1"])}
+    mock_read_df.return_value = df[["q2", "group"]]
+
+    query_result = Mock()
+    query_result.scalars.return_value.all.return_value = [
+        _mock_dataset_variable("q1", {"1": "Yes", "2": "No"}),
+        _mock_dataset_variable("q2", {"1": "Yes", "2": "No"}),
+        _mock_dataset_variable("group", {"1": "A", "2": "B"}),
+    ]
+    db = AsyncMock()
+    db.execute.return_value = query_result
+
+    results = await get_dataset_stats(
+        dataset_id="test-dataset-id",
+        stats_request=StatsRequest(
+            variables=[
+                StatsVariable(variable="q1"),
+                StatsVariable(variable="q2", split_variable="group"),
+            ],
+        ),
+        db=db,
+        api_key="test-key",
+    )
+
+    mock_read_df.assert_called_once_with(mock_dataset, ["q2", "group"])
+    assert results[0] == {
+        "variable": "q1",
+        "stats": StatisticsService().describe_var(
+            df,
+            "q1",
+            value_labels={"1": "Yes", "2": "No"},
+        ),
+    }
+    assert results[1]["variable"] == "q2"
+    assert list(results[1]["stats"]["categories"]) == ["1.0", "2.0"]
+
+    # Repeated requests are answered from the result cache
+    repeated = await get_dataset_stats(
+        dataset_id="test-dataset-id",
+        stats_request=StatsRequest(
+            variables=[
+                StatsVariable(variable="q1"),
+                StatsVariable(variable="q2", split_variable="group"),
+            ],
+        ),
+        db=db,
+        api_key="test-key",
+    )
+    assert repeated == results
+    mock_read_df.assert_called_once()
+
+
+@pytest.mark.anyio
+@patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
+@patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
+async def test_crosstab_endpoint_caches_results(
+    mock_read_df: Mock,
+    mock_ensure_cached: Mock,
+    mock_get_dataset: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Cross-tabulate variables and answer repeated requests from cache."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.stats_result_cache",
+        StatsResultCache(max_entries=10),
+    )
+    mock_dataset = Mock()
+    mock_dataset.file_hash = "dataset-hash"
+    mock_dataset.storage_key = "test/path.sav"
+    mock_get_dataset.return_value = mock_dataset
+    df = pd.DataFrame({"q1": [1.0, 2.0, 1.0], "group": [1.0, 2.0, 2.0]})
+    mock_read_df.return_value = df
+
+    query_result = Mock()
+    query_result.scalars.return_value.all.return_value = [
+        _mock_dataset_variable("q1", {"1": "Yes", "2": "No"}),
+        _mock_dataset_variable("group", {"1": "A", "2": "B"}),
+    ]
+    db = AsyncMock()
+    db.execute.return_value = query_result
+    stats_request = StatsRequest(
+        variables=[
+            StatsVariable(variable="q1", split_variable="group"),
+            StatsVariable(variable="group"),
+        ],
+    )
+
+    results = await get_dataset_crosstab(
+        dataset_id="test-dataset-id",
+        stats_request=stats_request,
+        db=db,
+        api_key="test-key",
+    )
+
+    mock_read_df.assert_called_once_with(mock_dataset, ["q1", "group"])
+    assert results[0] == {
+        "variable": "q1",
+        "crosstab": StatisticsService().crosstab(
+            df,
+            VariableStatsRequest(
+                "q1",
+                value_labels={"1": "Yes", "2": "No"},
+                split_variable="group",
+                split_variable_value_labels={"1": "A", "2": "B"},
+            ),
+        ),
+    }
+    assert results[0]["crosstab"]["counts"] == [[1, 1], [0, 1]]
+    assert results[1] == {
+        "variable": "group",
+        "error": "Variable group has no split variable",
+    }
+
+    repeated = await get_dataset_crosstab(
+        dataset_id="test-dataset-id",
+        stats_request=stats_request,
+        db=db,
+        api_key="test-key",
+    )
+    assert repeated == results
+    mock_read_df.assert_called_once()
+
+
+@pytest.mark.anyio
+@patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
+@patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
+async def test_crosstab_endpoint_reports_columns_missing_from_file(
+    mock_read_df: Mock,
+    mock_ensure_cached: Mock,
+    mock_get_dataset: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Report variables that are not in the data file per variable."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.stats_result_cache",
+        StatsResultCache(max_entries=10),
+    )
+    mock_dataset = Mock()
+    mock_dataset.file_hash = "dataset-hash"
+    mock_dataset.storage_key = "test/path.sav"
+    mock_get_dataset.return_value = mock_dataset
+    # Columns that are not in the file are left out of the loaded data
+    mock_read_df.return_value = pd.DataFrame({"q1": [1.0, 2.0], "group": [1.0, 2.0]})
+
+    query_result = Mock()
+    query_result.scalars.return_value.all.return_value = [
+        _mock_dataset_variable("q1", {}),
+        _mock_dataset_variable("stale", {}),
+        _mock_dataset_variable("group", {}),
+    ]
+    db = AsyncMock()
+    db.execute.return_value = query_result
+
+    results = await get_dataset_crosstab(
+        dataset_id="test-dataset-id",
+        stats_request=StatsRequest(
+            variables=[StatsVariable(variable="stale"), StatsVariable(variable="q1")],
+            split_variable="group",
+        ),
+        db=db,
+        api_key="test-key",
+    )
+
+    assert results[0] == {
+        "variable": "stale",
+        "error": "Variable 'stale' not found in the DataFrame.",
+    }
+    assert results[1]["crosstab"]["total"] == 2
+
+
+@pytest.mark.anyio
+@patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
+@patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
+async def test_multi_response_endpoint(
+    mock_read_df: Mock,
+    mock_ensure_cached: Mock,
+    mock_get_dataset: Mock,
+) -> None:
+    """Count a multi-response set with the metadata of its items."""
+    mock_dataset = Mock()
+    mock_dataset.file_hash = "dataset-hash"
+    mock_dataset.storage_key = "test/path.sav"
+    mock_get_dataset.return_value = mock_dataset
+    mock_read_df.return_value = pd.DataFrame(
+        {
+            "q_a": [1.0, 2.0, 2.0, 9.0],
+            "q_b": [2.0, 2.0, 2.0, 2.0],
+            "group": [1.0, 1.0, 2.0, 2.0],
+        }
+    )
+
+    q_a = _mock_dataset_variable("q_a", {"2": "Selected"})
+    q_a.missing_values = [9]
+    query_result = Mock()
+    query_result.scalars.return_value.all.return_value = [
+        q_a,
+        _mock_dataset_variable("q_b", {"2": "Selected"}),
+        _mock_dataset_variable("group", {"1": "A", "2": "B"}),
+    ]
+    db = AsyncMock()
+    db.execute.return_value = query_result
+
+    result = await get_dataset_multi_response(
+        dataset_id="test-dataset-id",
+        multi_response_request=MultiResponseRequest(
+            variables=["q_a", "q_b"],
+            counted_value=2,
+            split_variable="group",
+        ),
+        db=db,
+        api_key="test-key",
+    )
+
+    mock_read_df.assert_called_once_with(mock_dataset, ["q_a", "group", "q_b"])
+    assert result["split_variable_labels"] == {"1": "A", "2": "B"}
+    second = result["categories"]["2.0"]
+    assert [item["counts"] for item in second["items"]] == [1, 2]
+    assert (second["respondents"], second["responses"]) == (2, 3)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_dataset_multi_response(
+            dataset_id="test-dataset-id",
+            multi_response_request=MultiResponseRequest(variables=["q_a", "q_x"]),
+            db=db,
+            api_key="test-key",
+        )
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Variable q_x not found"
+
+
+@pytest.mark.anyio
+@patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
+@patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
+async def test_stats_endpoint_coalesces_identical_requests(
+    mock_read_df: Mock,
+    mock_ensure_cached: Mock,
+    mock_get_dataset: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Compute the statistics of concurrent identical requests only once."""
+    flights = SingleFlight()
+    monkeypatch.setattr("analysis.web.api.datasets.routes.stats_flights", flights)
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.stats_result_cache",
+        StatsResultCache(max_entries=10),
+    )
+    mock_dataset = Mock()
+    mock_dataset.file_hash = "dataset-hash"
+    mock_dataset.storage_key = "test/path.sav"
+    mock_get_dataset.return_value = mock_dataset
+
+    def read_slowly(dataset: Any, columns: list[str]) -> pd.DataFrame:
+        time.sleep(0.1)
+        return pd.DataFrame({"q1": [1.0, 2.0, 1.0]})
+
+    mock_read_df.side_effect = read_slowly
+
+    query_result = Mock()
+    query_result.scalars.return_value.all.return_value = [
+        _mock_dataset_variable("q1", {"1": "Yes", "2": "No"}),
+    ]
+    db = AsyncMock()
+    db.execute.return_value = query_result
+
+    results = await asyncio.gather(
+        *(
+            get_dataset_stats(
+                dataset_id="test-dataset-id",
+                stats_request=StatsRequest(variables=[StatsVariable(variable="q1")]),
+                db=db,
+                api_key="test-key",
+            )
+            for _ in range(3)
+        )
+    )
+
+    mock_read_df.assert_called_once()
+    assert results[0] == results[1] == results[2]
+    assert flights.stats()["coalesced"] == 2
+
+
+@pytest.mark.anyio
+@patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
+@patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
+async def test_stats_endpoint_coalesces_overlapping_requests(
+    mock_read_df: Mock,
+    mock_ensure_cached: Mock,
+    mock_get_dataset: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Describe variables shared by concurrent requests only once."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.stats_flights", SingleFlight()
+    )
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.stats_result_cache",
+        StatsResultCache(max_entries=10),
+    )
+    mock_dataset = Mock()
+    mock_dataset.file_hash = "dataset-hash"
+    mock_dataset.storage_key = "test/path.sav"
+    mock_get_dataset.return_value = mock_dataset
+    df = pd.DataFrame({"q1": [1.0, 2.0], "q2": [3.0, 3.0], "q3": [4.0, 5.0]})
+
+    def read_slowly(dataset: Any, columns: list[str]) -> pd.DataFrame:
+        time.sleep(0.1)
+        return df[columns]
+
+    mock_read_df.side_effect = read_slowly
+
+    query_result = Mock()
+    query_result.scalars.return_value.all.return_value = [
+        _mock_dataset_variable(name, {}) for name in ["q1", "q2", "q3"]
+    ]
+    db = AsyncMock()
+    db.execute.return_value = query_result
+
+    results = await asyncio.gather(
+        *(
+            get_dataset_stats(
+                dataset_id="test-dataset-id",
+                stats_request=StatsRequest(
+                    variables=[StatsVariable(variable=name) for name in names]
+                ),
+                db=db,
+                api_key="test-key",
+            )
+            for names in [["q1", "q2"], ["q2", "q3"]]
+        )
+    )
+
+    loaded = [column for call in mock_read_df.call_args_list for column in call.args[1]]
+    assert sorted(loaded) == ["q1", "q2", "q3"]
+    assert [result["variable"] for result in results[1]] == ["q2", "q3"]
+    assert results[1][0] == results[0][1]
+
+
+def test_describe_in_parallel_keeps_request_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Describe chunks of variables on several threads, in request order."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.settings.stats_min_variables_per_worker",
+        2,
+    )
+    df = pd.DataFrame(
+        {
+            "q1": [1.0, 2.0, 1.0],
+            "q2": [3, 2, 2],
+            "name": ["a", "b", "a"],
+            "group": [1.0, 2.0, 1.0],
+        }
+    )
+    requests = [
+        VariableStatsRequest("q1", split_variable="group"),
+        VariableStatsRequest("missing"),
+        VariableStatsRequest("q2", missing_values=["n/a"]),
+        VariableStatsRequest("name"),
+        VariableStatsRequest("q2", value_labels={"1": "One"}),
+        VariableStatsRequest("q1"),
+    ]
+
+    results = _describe_in_parallel(df, requests, decimal_places=2)
+
+    assert results == StatisticsService().describe_many(df, requests)
+    assert [result["variable"] for result in results] == [
+        "q1",
+        "missing",
+        "q2",
+        "name",
+        "q2",
+        "q1",
+    ]
+    assert "error" in results[1]
+    assert "error" in results[2]
+
+
+@pytest.mark.anyio
+async def test_get_dataset_by_id_reuses_cached_dataset(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Serve repeated dataset lookups from the metadata cache."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.metadata_cache",
+        MetadataCache(ttl=60, max_entries=10),
+    )
+    dataset = Mock()
+    query_result = Mock()
+    query_result.scalar_one_or_none.return_value = dataset
+    db = AsyncMock()
+    db.execute.return_value = query_result
+
+    assert await _get_dataset_by_id(db, "dataset-id") is dataset
+    assert await _get_dataset_by_id(db, "dataset-id") is dataset
+    db.execute.assert_awaited_once()
+
+
 def test_value_labels_conversion() -> None:
     """Test that JSONB value labels are properly converted to string keys."""
     # Simulate JSONB data with mixed key types
@@ -262,11 +780,13 @@ def test_raw_data_request_model() -> None:
 
 @pytest.mark.anyio
 @patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
 @patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
 @patch("analysis.web.api.datasets.routes.RawDataService")
 async def test_raw_data_endpoint_logic(
     mock_raw_data_service_class: Mock,
     mock_read_df: Mock,
+    mock_ensure_cached: Mock,
     mock_get_dataset: Mock,
 ) -> None:
     """Test the raw data endpoint logic directly."""
@@ -331,6 +851,7 @@ async def test_raw_data_endpoint_logic(
         max_values=1000,
         page=1,
         page_size=5,
+        cursor=None,
     )
 
     # Verify the response structure
@@ -355,6 +876,75 @@ async def test_raw_data_endpoint_logic(
     assert comments.page == 1
 
 
+@pytest.mark.anyio
+@patch("analysis.web.api.datasets.routes._get_dataset_by_id")
+@patch("analysis.web.api.datasets.routes._ensure_cached_dataset_file")
+@patch("analysis.web.api.datasets.routes._read_dataframe_from_dataset")
+async def test_word_frequency_endpoint_caches_results(
+    mock_read_df: Mock,
+    mock_ensure_cached: Mock,
+    mock_get_dataset: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Count words by split variable and answer repeated requests from cache."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.word_frequency_cache",
+        LRUCache(max_size=10),
+    )
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.raw_data_index",
+        RawDataIndex(max_bytes=1024, max_token_bytes=1024),
+    )
+    mock_dataset = Mock()
+    mock_dataset.file_hash = "dataset-hash"
+    mock_dataset.storage_key = "test/path.sav"
+    mock_get_dataset.return_value = mock_dataset
+    mock_read_df.return_value = pd.DataFrame(
+        {
+            "feedback": pd.Series(["Great service", "Slow service", ""], dtype="str"),
+            "group": [1.0, 2.0, 2.0],
+        }
+    )
+
+    query_result = Mock()
+    query_result.scalars.return_value.all.return_value = [
+        _mock_dataset_variable("feedback", {}),
+        _mock_dataset_variable("group", {"1": "A", "2": "B"}),
+    ]
+    db = AsyncMock()
+    db.execute.return_value = query_result
+    word_request = WordFrequencyRequest(
+        variables=["feedback", "unknown"],
+        split_variable="group",
+        stopwords=["slow"],
+    )
+
+    results = await get_dataset_word_frequencies(
+        dataset_id="test-dataset-id",
+        word_request=word_request,
+        db=db,
+        api_key="test-key",
+    )
+
+    mock_read_df.assert_called_once_with(mock_dataset, ["feedback", "group"])
+    categories = results[0]["word_frequencies"]["categories"]
+    assert categories["1.0"]["words"] == [
+        {"word": "great", "count": 1},
+        {"word": "service", "count": 1},
+    ]
+    assert categories["2.0"]["words"] == [{"word": "service", "count": 1}]
+    assert results[1] == {"variable": "unknown", "error": "Variable unknown not found"}
+
+    repeated = await get_dataset_word_frequencies(
+        dataset_id="test-dataset-id",
+        word_request=word_request,
+        db=db,
+        api_key="test-key",
+    )
+    assert repeated == results
+    mock_read_df.assert_called_once()
+
+
 def test_raw_data_response_model() -> None:
     """Test that the RawDataResponse model works correctly."""
     response = RawDataResponse(
@@ -541,3 +1131,65 @@ async def test_excel_export_endpoint_logic(
         == 'attachment; filename="chart-export-2026-03-17.xlsx"'
     )
     assert response.body == b"xlsx-bytes"
+
+
+@patch("analysis.web.api.datasets.routes.get_cached_dataset_path")
+@patch("analysis.web.api.datasets.routes.pyreadstat.read_sav")
+def test_read_dataframe_from_dataset_only_reads_missing_columns(
+    mock_read_sav: Mock,
+    mock_get_cached_dataset_path: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Read only requested columns and reuse cached ones on later requests."""
+    monkeypatch.setattr(
+        "analysis.web.api.datasets.routes.dataframe_cache",
+        LRUCache(max_size=1024 * 1024, sizeof=dataframe_nbytes),
+    )
+    mock_get_cached_dataset_path.return_value = Path("dataset-hash.sav")
+    full_df = pd.DataFrame(
+        {
+            "age": [20.0, 30.0, 40.0],
+            "gender": [1.0, 2.0, 1.0],
+            "region": [3.0, 3.0, 4.0],
+        }
+    )
+    mock_read_sav.side_effect = lambda path, usecols: (
+        full_df[[column for column in usecols if column in full_df.columns]],
+        Mock(),
+    )
+
+    dataset = Mock()
+    dataset.file_hash = "dataset-hash"
+    dataset.storage_key = "test/path.sav"
+
+    first = _read_dataframe_from_dataset(dataset, ["age", "gender"])
+    second = _read_dataframe_from_dataset(dataset, ["region", "age", "unknown"])
+    third = _read_dataframe_from_dataset(dataset, ["gender", "region"])
+
+    assert list(first.columns) == ["age", "gender"]
+    assert list(second.columns) == ["region", "age"]
+    assert second["region"].tolist() == [3.0, 3.0, 4.0]
+    assert list(third.columns) == ["gender", "region"]
+    assert [call.kwargs["usecols"] for call in mock_read_sav.call_args_list] == [
+        ["age", "gender"],
+        ["region", "unknown"],
+    ]
+
+
+def test_stats_request_columns_include_split_variables() -> None:
+    """Collect requested and split variables once, in request order."""
+    stats_request = StatsRequest(
+        variables=[
+            StatsVariable(variable="age", split_variable="gender"),
+            StatsVariable(variable="income"),
+            StatsVariable(variable="gender"),
+        ],
+        split_variable="region",
+    )
+
+    assert _stats_request_columns(stats_request) == [
+        "age",
+        "gender",
+        "income",
+        "region",
+    ]
@@ -0,0 +1 @@
+"""Cache API routes and endpoints."""
@@ -0,0 +1,71 @@
+import re
+from typing import Any, Dict
+
+from fastapi import HTTPException, Security, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRouter
+
+from analysis.services.dataset_cache import (
+    dataframe_cache,
+    download_flights,
+    evict_dataset,
+    get_dataset_cache_usage,
+)
+from analysis.services.executor import compute_executor, stats_executor
+from analysis.services.metadata_cache import metadata_cache
+from analysis.services.raw_data_index import raw_data_index
+from analysis.services.result_cache import (
+    stats_flights,
+    stats_result_cache,
+    word_frequency_cache,
+)
+from analysis.web.api.security import get_api_key
+
+FILE_HASH_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+router = APIRouter(tags=["cache"])
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    api_key: str = Security(get_api_key),
+) -> Dict[str, Any]:
+    """Return usage counters of this worker's caches and compute executors."""
+    return {
+        "dataframes": dataframe_cache.stats(),
+        "disk": await run_in_threadpool(get_dataset_cache_usage),
+        "downloads": download_flights.stats(),
+        "metadata": metadata_cache.stats(),
+        "results": stats_result_cache.stats(),
+        "computations": stats_flights.stats(),
+        "raw_data": raw_data_index.stats(),
+        "word_frequencies": word_frequency_cache.stats(),
+        "compute": compute_executor.stats(),
+        "stats": stats_executor.stats(),
+    }
+
+
+@router.delete("/cache/datasets/{file_hash}")
+async def delete_cached_dataset(
+    file_hash: str,
+    api_key: str = Security(get_api_key),
+) -> Dict[str, Any]:
+    """
+    Evict a dataset file from the cache, e.g. after the dataset was deleted.
+
+    Eviction is best-effort. The files on disk are removed for all worker
+    processes, but only the worker answering this call drops the dataset from
+    its in-memory caches. Other workers keep it until their caches evict it.
+    """
+    if not FILE_HASH_PATTERN.fullmatch(file_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file hash",
+        )
+
+    evicted = await run_in_threadpool(evict_dataset, file_hash)
+    metadata_cache.evict_file_hash(file_hash)
+    stats_result_cache.evict_file_hash(file_hash)
+    raw_data_index.evict_file_hash(file_hash)
+    word_frequency_cache.pop_matching(lambda key: key[0] == file_hash)
+    return {"file_hash": file_hash, "evicted": evicted}
@@ -1,4 +1,5 @@
 import tempfile
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -16,7 +17,13 @@ from sqlalchemy.future import select
 
 from analysis.db.dependencies import get_db_session
 from analysis.db.models.models import Dataset, DatasetVariable
-from analysis.services.dataset_cache import get_cached_dataset_path
+from analysis.services.columnar_cache import read_columnar_columns
+from analysis.services.dataset_cache import (
+    dataframe_cache,
+    ensure_dataset_cached,
+    get_cached_dataset_path,
+    get_dataset_stats_index,
+)
 from analysis.services.excel_export import (
     XLSX_MEDIA_TYPE,
     build_workbook,
@@ -24,6 +31,8 @@ from analysis.services.excel_export import (
 from analysis.services.excel_export import (
     build_content_disposition as build_excel_content_disposition,
 )
+from analysis.services.executor import compute_executor, stats_executor
+from analysis.services.metadata_cache import metadata_cache
 from analysis.services.powerpoint_export import (
     PPTX_MEDIA_TYPE,
     build_presentation,
@@ -31,7 +40,21 @@ from analysis.services.powerpoint_export import (
 from analysis.services.powerpoint_export import (
     build_content_disposition as build_powerpoint_content_disposition,
 )
-from analysis.services.stats import RawDataService, StatisticsService
+from analysis.services.raw_data_index import raw_data_index
+from analysis.services.result_cache import (
+    result_key,
+    stats_flights,
+    stats_result_cache,
+    word_frequency_cache,
+    word_frequency_key,
+)
+from analysis.services.stats import (
+    RawDataService,
+    StatisticsService,
+    VariableStatsRequest,
+)
+from analysis.services.word_frequencies import STOPWORDS, WordFrequencyService
+from analysis.settings import settings
 from analysis.web.api.schemas.datasets import (
     DatasetResponse,
     ExcelExportRequest,
@@ -69,6 +92,10 @@ class RawDataRequestOptions(BaseModel):
     max_values: int = 1000
     page: int = 1
     page_size: int = 5
+    # next_cursor of the previous page; takes precedence over page
+    cursor: Optional[int] = None
+    # Only return values containing every word of the search, ignoring case
+    search: Optional[str] = None
 
 
 class RawDataRequest(BaseModel):
@@ -78,6 +105,31 @@ class RawDataRequest(BaseModel):
     options: RawDataRequestOptions = RawDataRequestOptions()
 
 
+class WordFrequencyRequest(BaseModel):
+    """Request model for the word frequency endpoint."""
+
+    variables: List[str]
+    split_variable: Optional[str] = None
+    # Number of most frequent words returned per variable and split category
+    top_n: int = 50
+    # Leave out common English and German words
+    exclude_stopwords: bool = True
+    # Further words to leave out, ignoring case
+    stopwords: List[str] = []
+
+
+class MultiResponseRequest(BaseModel):
+    """Request model for the multi-response endpoint."""
+
+    # The items of the set, one variable each
+    variables: List[str]
+    # The value of an item that is selected
+    counted_value: int | float = 1
+    split_variable: Optional[str] = None
+    # Number of decimal places for percentages
+    decimal_places: Optional[int] = 2
+
+
 class RawDataVariableResponse(BaseModel):
     """Response model for a single variable's raw data."""
 
@@ -87,6 +139,7 @@ class RawDataVariableResponse(BaseModel):
     total_non_empty_count: int
     total_pages: int
     page: int
+    next_cursor: Optional[int] = None
     error: Optional[str] = None
 
 
@@ -108,31 +161,42 @@ class RawDataResponse(BaseModel):
 
 
 async def _get_dataset_by_id(db: AsyncSession, dataset_id: str) -> Optional[Dataset]:
-    """Fetches a dataset from the database by its ID."""
+    """Fetches a dataset by its ID, reusing rows recently loaded by this worker."""
+    dataset = metadata_cache.get_dataset(dataset_id)
+    if dataset is not None:
+        return dataset
+
     try:
         result = await db.execute(select(Dataset).filter(Dataset.id == dataset_id))
-        return result.scalar_one_or_none()
+        dataset = result.scalar_one_or_none()
     except ValueError:
         # This handles cases where id is not a valid UUID
         return None
 
+    if dataset is not None:
+        metadata_cache.put_dataset(dataset_id, dataset)
+    return dataset
+
 
-async def _get_dataset_variable_by_name(
+async def _get_dataset_variables_by_name(
     db: AsyncSession,
-    dataset_id: str,
-    variable_name: str,
-) -> Optional[DatasetVariable]:
-    try:
-        result = await db.execute(
-            select(DatasetVariable).filter(
-                DatasetVariable.dataset_id == dataset_id,
-                DatasetVariable.name == variable_name,
-            ),
-        )
-        return result.scalar_one_or_none()
-    except ValueError:
-        # This handles cases where id is not a valid UUID
-        return None
+    dataset: Dataset,
+    variable_names: List[str],
+) -> Dict[str, DatasetVariable]:
+    """Fetches the named variables of a dataset, querying only uncached ones."""
+    variables, missing_names = metadata_cache.get_variables(dataset, variable_names)
+    if not missing_names:
+        return variables
+
+    result = await db.execute(
+        select(DatasetVariable).filter(
+            DatasetVariable.dataset_id == dataset.id,
+            DatasetVariable.name.in_(missing_names),
+        ),
+    )
+    loaded = {variable.name: variable for variable in result.scalars().all()}
+    metadata_cache.put_variables(dataset, loaded)
+    return {**variables, **loaded}
 
 
 @router.get("/datasets/{dataset_id}", response_model=DatasetResponse)
@@ -167,8 +231,8 @@ class MetadataResponse(BaseModel):
     metadata: Optional[Dict[str, Any]] = {}
 
 
-def _get_cached_dataset_file_path(dataset: Dataset) -> str:
-    """Return the local cached file path for a dataset."""
+def _validate_dataset_file(dataset: Dataset) -> None:
+    """Ensure a dataset references a file that can be cached."""
     if dataset.storage_key is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -181,11 +245,35 @@ def _get_cached_dataset_file_path(dataset: Dataset) -> str:
             detail="Dataset has no file hash",
         )
 
+
+def _get_cached_dataset_file_path(dataset: Dataset) -> str:
+    """Return the local cached file path for a dataset."""
+    _validate_dataset_file(dataset)
     return str(
         get_cached_dataset_path(str(dataset.file_hash), str(dataset.storage_key))
     )
 
 
+async def _ensure_cached_dataset_file(dataset: Dataset) -> None:
+    """Download a dataset file into the cache, without blocking the event loop."""
+    _validate_dataset_file(dataset)
+    await ensure_dataset_cached(str(dataset.file_hash), str(dataset.storage_key))
+
+
+async def _load_dataframe(dataset: Dataset, columns: List[str]) -> pd.DataFrame:
+    """
+    Load dataset columns into a DataFrame.
+
+    A missing dataset file is downloaded first on the dedicated download
+    executor. Parsing then runs on the compute executor.
+    """
+    if any(
+        (str(dataset.file_hash), column) not in dataframe_cache for column in columns
+    ):
+        await _ensure_cached_dataset_file(dataset)
+    return await compute_executor.run(_read_dataframe_from_dataset, dataset, columns)
+
+
 def _read_sav_from_path(
     dataset_file_path: str,
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
@@ -228,20 +316,79 @@ def _read_sav_from_dataset(dataset: Dataset) -> Tuple[Dict[str, Any], Dict[str,
     return _read_sav_from_path(_get_cached_dataset_file_path(dataset))
 
 
-def _read_dataframe_from_dataset(dataset: Dataset) -> pd.DataFrame:
-    """Read a cached SAV file and return a pandas DataFrame."""
-    dataset_file_path = _get_cached_dataset_file_path(dataset)
+def _read_dataframe_from_dataset(
+    dataset: Dataset,
+    columns: List[str],
+) -> pd.DataFrame:
+    """
+    Read the given columns of a cached SAV file into a pandas DataFrame.
+
+    Only the requested columns are loaded. Loaded columns are kept in the
+    worker's in-memory cache, keyed by the dataset file hash and column name,
+    so later requests only read the columns that are not cached yet. Columns
+    are memory-mapped from the dataset's columnar sidecar when it exists and
+    parsed from the SAV file otherwise. Columns that do not exist in the file
+    are left out of the DataFrame.
+    """
+    loaded_columns: Dict[str, pd.Series] = {}
+    if dataset.file_hash:
+        for column in columns:
+            cached_column = dataframe_cache.get((str(dataset.file_hash), column))
+            if cached_column is not None:
+                loaded_columns[column] = cached_column
+
+    missing_columns = [column for column in columns if column not in loaded_columns]
+    if missing_columns:
+        dataset_file_path = _get_cached_dataset_file_path(dataset)
+
+        for column, series in read_columnar_columns(
+            Path(dataset_file_path),
+            missing_columns,
+        ).items():
+            dataframe_cache.put((str(dataset.file_hash), column), series)
+            loaded_columns[column] = series
+
+        missing_columns = [
+            column for column in missing_columns if column not in loaded_columns
+        ]
+
+    if missing_columns:
+        try:
+            df, _ = pyreadstat.read_sav(dataset_file_path, usecols=missing_columns)
+            if df is None:
+                raise ValueError("No data found in SAV file.")
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Error reading SAV file: {e!s}",
+            ) from e
+
+        for column in df.columns:
+            # Copy the column out of the parsed frame so that each cached
+            # column owns its memory and can be evicted on its own.
+            series = df[column].copy()
+            dataframe_cache.put((str(dataset.file_hash), column), series)
+            loaded_columns[column] = series
+
+    return pd.DataFrame(
+        {
+            column: loaded_columns[column]
+            for column in columns
+            if column in loaded_columns
+        },
+        copy=False,
+    )
 
-    try:
-        df, _ = pyreadstat.read_sav(dataset_file_path)
-        if df is None:
-            raise ValueError("No data found in SAV file.")
-        return df
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error reading SAV file: {e!s}",
-        ) from e
+
+def _stats_request_columns(stats_request: StatsRequest) -> List[str]:
+    """Return the columns needed to answer a stats request, in request order."""
+    columns: Dict[str, None] = {}
+    for var_request in stats_request.variables:
+        columns[var_request.variable] = None
+        split_var = var_request.split_variable or stats_request.split_variable
+        if split_var:
+            columns[split_var] = None
+    return list(columns)
 
 
 @router.get("/datasets/{dataset_id}/metadata", response_model=MetadataResponse)
@@ -260,6 +407,7 @@ async def get_dataset_metadata(
         raise HTTPException(status_code=404, detail="Dataset not found")
 
     try:
+        await _ensure_cached_dataset_file(dataset)
         data, metadata = await run_in_threadpool(_read_sav_from_dataset, dataset)
 
         return MetadataResponse(
@@ -327,6 +475,224 @@ async def preview_dataset_metadata(
             temp_path.unlink(missing_ok=True)
 
 
+def _variable_stats_requests(
+    stats_request: StatsRequest,
+    dataset_variables: Dict[str, DatasetVariable],
+) -> List[VariableStatsRequest | Dict[str, Any]]:
+    """
+    Resolve the variables of a stats request against their metadata.
+
+    Returns one entry per requested variable: the request to describe it, or
+    its error result if the variable or its split variable is unknown.
+    """
+    requests: List[VariableStatsRequest | Dict[str, Any]] = []
+
+    for var_request in stats_request.variables:
+        dataset_variable = dataset_variables.get(var_request.variable)
+        if not dataset_variable:
+            requests.append(
+                {
+                    "variable": var_request.variable,
+                    "error": f"Variable {var_request.variable} not found",
+                },
+            )
+            continue
+
+        # Use per-variable split_variable if provided, otherwise fall back to global
+        split_var = var_request.split_variable or stats_request.split_variable
+
+        # Get split variable value labels if split variable is provided
+        split_variable_value_labels: dict[str, str] | None = None
+        split_variable_missing_values: list[str | int | float] | None = None
+        split_variable_missing_ranges: Optional[List[Dict[str, float]]] = None
+        if split_var:
+            split_variable_obj = dataset_variables.get(split_var)
+            if not split_variable_obj:
+                requests.append(
+                    {
+                        "variable": var_request.variable,
+                        "error": f"Split variable {split_var} not found",
+                    },
+                )
+                continue
+            # Cast JSONB to dict
+            value_labels_raw = split_variable_obj.value_labels
+            if isinstance(value_labels_raw, dict):
+                split_variable_value_labels = {
+                    str(k): str(v) for k, v in value_labels_raw.items()
+                }
+            else:
+                split_variable_value_labels = None
+
+            # Get missing values for split variable
+            split_variable_missing_values = split_variable_obj.missing_values  # type: ignore
+            # Extract split variable missing_ranges array from the object structure
+            split_missing_ranges_raw = split_variable_obj.missing_ranges
+            split_variable_missing_ranges = (
+                split_missing_ranges_raw.get(split_var)
+                if isinstance(split_missing_ranges_raw, dict)
+                else None
+            )
+
+        # Extract missing_ranges array from the object structure
+        # DB stores: { variableName: [{ lo, hi }, ...] }
+        # Service expects: [{ lo, hi }, ...]
+        missing_ranges_raw = dataset_variable.missing_ranges
+        missing_ranges = (
+            missing_ranges_raw.get(var_request.variable)
+            if isinstance(missing_ranges_raw, dict)
+            else None
+        )
+
+        requests.append(
+            VariableStatsRequest(
+                variable_name=var_request.variable,
+                missing_values=dataset_variable.missing_values,  # type: ignore
+                missing_ranges=missing_ranges,
+                value_labels=dataset_variable.value_labels,  # type: ignore
+                split_variable=split_var,
+                split_variable_value_labels=split_variable_value_labels,
+                split_variable_missing_values=split_variable_missing_values,
+                split_variable_missing_ranges=split_variable_missing_ranges,
+            ),
+        )
+
+    return requests
+
+
+def _request_columns(requests: List[VariableStatsRequest]) -> List[str]:
+    """Return the columns of variables and their split variables, in order."""
+    columns: Dict[str, None] = {}
+    for request in requests:
+        columns[request.variable_name] = None
+        if request.split_variable:
+            columns[request.split_variable] = None
+    return list(columns)
+
+
+def _describe_without_data(
+    dataset: Dataset,
+    requests: List[VariableStatsRequest | Dict[str, Any]],
+    decimal_places: int | None,
+) -> List[Dict[str, Any] | None]:
+    """
+    Answer what can be answered without loading any data.
+
+    Returns one result per request: error results as they are, results
+    computed before and still cached, and results of variables without a
+    split that the dataset's statistics index can describe. The remaining
+    requests get None and need the dataset's data.
+    """
+    file_hash = str(dataset.file_hash)
+    stats_index = get_dataset_stats_index(file_hash) or {}
+    stats_service = StatisticsService()
+    results: List[Dict[str, Any] | None] = []
+
+    for request in requests:
+        if not isinstance(request, VariableStatsRequest):
+            results.append(request)
+            continue
+
+        stats = stats_result_cache.get(
+            file_hash,
+            request,
+            decimal_places=decimal_places,
+        )
+        if stats is not None:
+            results.append({"variable": request.variable_name, "stats": stats})
+            continue
+
+        summary = stats_index.get(request.variable_name)
+        if summary is None or request.split_variable is not None:
+            results.append(None)
+            continue
+
+        try:
+            stats = stats_service.describe_from_index(
+                summary,
+                missing_values=request.missing_values,
+                missing_ranges=request.missing_ranges,
+                value_labels=request.value_labels,
+                decimal_places=decimal_places,
+            )
+        except ValueError as e:
+            results.append({"variable": request.variable_name, "error": str(e)})
+            continue
+        if stats is None:
+            results.append(None)
+            continue
+
+        stats_result_cache.put(
+            file_hash,
+            request,
+            stats,
+            decimal_places=decimal_places,
+        )
+        results.append({"variable": request.variable_name, "stats": stats})
+
+    return results
+
+
+def _describe_in_parallel(
+    df: pd.DataFrame,
+    requests: List[VariableStatsRequest],
+    decimal_places: int | None,
+) -> List[Dict[str, Any]]:
+    """
+    Describe variables in parallel and return their results in request order.
+
+    The variables are split into contiguous chunks, each described as one
+    batch on the stats executor. The threads share the DataFrame without
+    copying it, and NumPy releases the GIL for most of the work.
+    """
+    stats_service = StatisticsService()
+    chunk_count = min(
+        stats_executor.max_workers,
+        len(requests) // max(settings.stats_min_variables_per_worker, 1),
+    )
+    if chunk_count <= 1:
+        return stats_service.describe_many(
+            df,
+            requests,
+            decimal_places=decimal_places,
+        )
+
+    chunk_size = -(-len(requests) // chunk_count)
+    futures = [
+        stats_executor.submit(
+            partial(stats_service.describe_many, decimal_places=decimal_places),
+            df,
+            requests[start : start + chunk_size],
+        )
+        for start in range(0, len(requests), chunk_size)
+    ]
+    return [result for future in futures for result in future.result()]
+
+
+async def _load_and_describe(
+    dataset: Dataset,
+    requests: List[VariableStatsRequest],
+    decimal_places: int | None,
+) -> List[Dict[str, Any]]:
+    """Load the columns of the requested variables, then describe and cache them."""
+    df = await _load_dataframe(dataset, _request_columns(requests))
+    results = await compute_executor.run(
+        _describe_in_parallel,
+        df,
+        requests,
+        decimal_places,
+    )
+    for request, result in zip(requests, results, strict=True):
+        if "stats" in result:
+            stats_result_cache.put(
+                str(dataset.file_hash),
+                request,
+                result["stats"],
+                decimal_places=decimal_places,
+            )
+    return results
+
+
 @router.post("/datasets/{dataset_id}/stats")
 async def get_dataset_stats(
     dataset_id: str,
@@ -340,80 +706,167 @@ async def get_dataset_stats(
         raise HTTPException(status_code=404, detail="Dataset not found")
 
     try:
-        df = await run_in_threadpool(_read_dataframe_from_dataset, dataset)
-        stats_service = StatisticsService()
-        results = []
-
-        for var_request in stats_request.variables:
-            try:
-                dataset_variable = await _get_dataset_variable_by_name(
-                    db,
-                    dataset_id,
-                    var_request.variable,
-                )
-                if not dataset_variable:
-                    raise ValueError(f"Variable {var_request.variable} not found")
-
-                # Use per-variable split_variable if provided, otherwise fall back to global
-                split_var = var_request.split_variable or stats_request.split_variable
-
-                # Get split variable value labels if split variable is provided
-                split_variable_value_labels: dict[str, str] | None = None
-                split_variable_missing_values: list[str | int | float] | None = None
-                split_variable_missing_ranges: Optional[List[Dict[str, float]]] = None
-                if split_var:
-                    split_variable_obj = await _get_dataset_variable_by_name(
-                        db,
-                        dataset_id,
-                        split_var,
-                    )
-                    if not split_variable_obj:
-                        raise ValueError(f"Split variable {split_var} not found")
-                    # Cast JSONB to dict
-                    value_labels_raw = split_variable_obj.value_labels
-                    if isinstance(value_labels_raw, dict):
-                        split_variable_value_labels = {
-                            str(k): str(v) for k, v in value_labels_raw.items()
-                        }
-                    else:
-                        split_variable_value_labels = None
-
-                    # Get missing values for split variable
-                    split_variable_missing_values = split_variable_obj.missing_values  # type: ignore
-                    # Extract split variable missing_ranges array from the object structure
-                    split_missing_ranges_raw = split_variable_obj.missing_ranges
-                    split_variable_missing_ranges = (
-                        split_missing_ranges_raw.get(split_var)
-                        if isinstance(split_missing_ranges_raw, dict)
-                        else None
+        columns = _stats_request_columns(stats_request)
+        dataset_variables = await _get_dataset_variables_by_name(
+            db,
+            dataset,
+            columns,
+        )
+        requests = _variable_stats_requests(stats_request, dataset_variables)
+        results = await compute_executor.run(
+            _describe_without_data,
+            dataset,
+            requests,
+            stats_request.decimal_places,
+        )
+
+        # Only the variables not answered yet are loaded and described
+        pending = [
+            request
+            for request, result in zip(requests, results, strict=True)
+            if result is None
+        ]
+        if pending:
+            # Variables described by concurrent requests are described once;
+            # the others are loaded and described together
+            file_hash = str(dataset.file_hash)
+            described = await stats_flights.do_many_async(
+                [
+                    (
+                        result_key(
+                            file_hash,
+                            request,
+                            decimal_places=stats_request.decimal_places,
+                        ),
+                        request,
                     )
+                    for request in pending
+                ],
+                partial(
+                    _load_and_describe,
+                    dataset,
+                    decimal_places=stats_request.decimal_places,
+                ),
+            )
 
-                # Extract missing_ranges array from the object structure
-                # DB stores: { variableName: [{ lo, hi }, ...] }
-                # Service expects: [{ lo, hi }, ...]
-                missing_ranges_raw = dataset_variable.missing_ranges
-                missing_ranges = (
-                    missing_ranges_raw.get(var_request.variable)
-                    if isinstance(missing_ranges_raw, dict)
-                    else None
-                )
+            described_results = iter(described)
+            results = [
+                result if result is not None else next(described_results)
+                for result in results
+            ]
+        return results
 
-                stats = stats_service.describe_var(
-                    df,
-                    var_request.variable,
-                    missing_values=dataset_variable.missing_values,  # type: ignore
-                    missing_ranges=missing_ranges,
-                    value_labels=dataset_variable.value_labels,  # type: ignore
-                    split_variable=split_var,
-                    split_variable_value_labels=split_variable_value_labels,
-                    split_variable_missing_values=split_variable_missing_values,
-                    split_variable_missing_ranges=split_variable_missing_ranges,
-                    decimal_places=stats_request.decimal_places,
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing dataset statistics: {e!s}",
+        ) from e
+
+
+# Crosstabs are cached with the statistics, as if they were one more statistic
+_CROSSTAB_INCLUDE = ["crosstab"]
+
+
+def _crosstab_many(
+    df: pd.DataFrame,
+    requests: List[VariableStatsRequest],
+    decimal_places: int | None,
+) -> List[Dict[str, Any]]:
+    """Cross-tabulate variables with their split variables, in request order."""
+    stats_service = StatisticsService()
+    results: List[Dict[str, Any]] = []
+    for request in requests:
+        try:
+            crosstab = stats_service.crosstab(df, request, decimal_places)
+        except ValueError as e:
+            results.append({"variable": request.variable_name, "error": str(e)})
+            continue
+        results.append({"variable": request.variable_name, "crosstab": crosstab})
+    return results
+
+
+@router.post("/datasets/{dataset_id}/crosstab")
+async def get_dataset_crosstab(
+    dataset_id: str,
+    stats_request: StatsRequest,
+    db: AsyncSession = Depends(get_db_session),
+    api_key: str = Security(get_api_key),
+) -> List[Dict[str, Any]]:
+    """
+    Cross-tabulate variables with their split variables.
+
+    Returns one contingency table per variable, with counts and row, column
+    and total percentages as matrices. Both variables' missing values and
+    value labels are applied.
+    """
+    dataset = await _get_dataset_by_id(db, dataset_id)
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    try:
+        dataset_variables = await _get_dataset_variables_by_name(
+            db,
+            dataset,
+            _stats_request_columns(stats_request),
+        )
+        requests = _variable_stats_requests(stats_request, dataset_variables)
+
+        file_hash = str(dataset.file_hash)
+        results: List[Dict[str, Any] | None] = []
+        for request in requests:
+            if not isinstance(request, VariableStatsRequest):
+                results.append(request)
+                continue
+            if request.split_variable is None:
+                results.append(
+                    {
+                        "variable": request.variable_name,
+                        "error": f"Variable {request.variable_name} has no split variable",
+                    },
                 )
-                results.append({"variable": var_request.variable, "stats": stats})
-            except ValueError as e:
-                results.append({"variable": var_request.variable, "error": str(e)})
+                continue
+            crosstab = stats_result_cache.get(
+                file_hash,
+                request,
+                include=_CROSSTAB_INCLUDE,
+                decimal_places=stats_request.decimal_places,
+            )
+            results.append(
+                {"variable": request.variable_name, "crosstab": crosstab}
+                if crosstab is not None
+                else None,
+            )
 
+        pending = [
+            request
+            for request, result in zip(requests, results, strict=True)
+            if result is None
+        ]
+        if pending:
+            df = await _load_dataframe(dataset, _request_columns(pending))
+            computed = await compute_executor.run(
+                _crosstab_many,
+                df,
+                pending,
+                stats_request.decimal_places,
+            )
+            for request, result in zip(pending, computed, strict=True):
+                if "crosstab" in result:
+                    stats_result_cache.put(
+                        file_hash,
+                        request,
+                        result["crosstab"],
+                        include=_CROSSTAB_INCLUDE,
+                        decimal_places=stats_request.decimal_places,
+                    )
+
+            computed_results = iter(computed)
+            results = [
+                result if result is not None else next(computed_results)
+                for result in results
+            ]
         return results
 
     except HTTPException:
@@ -421,7 +874,7 @@ async def get_dataset_stats(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing dataset statistics: {e!s}",
+            detail=f"Error processing crosstab: {e!s}",
         ) from e
 
 
@@ -443,16 +896,28 @@ async def get_dataset_raw_data(
         raise HTTPException(status_code=404, detail="Dataset not found")
 
     try:
-        df = await run_in_threadpool(_read_dataframe_from_dataset, dataset)
-        raw_data_service = RawDataService()
+        df = await _load_dataframe(
+            dataset,
+            list(dict.fromkeys(raw_data_request.variables)),
+        )
+        raw_data_service = RawDataService(
+            position_index=raw_data_index.for_file(
+                dataset.file_hash,
+                search=raw_data_request.options.search,
+            ),
+        )
 
-        raw_data = raw_data_service.get_raw_values(
-            df,
-            raw_data_request.variables,
-            exclude_empty=raw_data_request.options.exclude_empty,
-            max_values=raw_data_request.options.max_values,
-            page=raw_data_request.options.page,
-            page_size=raw_data_request.options.page_size,
+        raw_data = await compute_executor.run(
+            partial(
+                raw_data_service.get_raw_values,
+                df,
+                raw_data_request.variables,
+                exclude_empty=raw_data_request.options.exclude_empty,
+                max_values=raw_data_request.options.max_values,
+                page=raw_data_request.options.page,
+                page_size=raw_data_request.options.page_size,
+                cursor=raw_data_request.options.cursor,
+            ),
         )
 
         # Convert to response model format
@@ -465,6 +930,7 @@ async def get_dataset_raw_data(
                 total_non_empty_count=var_data["totalNonEmptyCount"],
                 total_pages=var_data["totalPages"],
                 page=var_data["page"],
+                next_cursor=var_data.get("nextCursor"),
                 error=var_data.get("error"),
             )
 
@@ -484,6 +950,190 @@ async def get_dataset_raw_data(
         ) from e
 
 
+def _count_words(
+    df: pd.DataFrame,
+    requests: List[VariableStatsRequest],
+    top_n: int,
+    stopwords: frozenset[str],
+    file_hash: str,
+) -> List[Dict[str, Any]]:
+    """Count the most frequent words of text variables, in request order."""
+    service = WordFrequencyService(raw_data_index.token_index_for_file(file_hash))
+    results: List[Dict[str, Any]] = []
+    for request in requests:
+        try:
+            word_frequencies = service.count_words(
+                df,
+                request.variable_name,
+                split_variable=request.split_variable,
+                split_variable_value_labels=request.split_variable_value_labels,
+                split_variable_missing_values=request.split_variable_missing_values,
+                split_variable_missing_ranges=request.split_variable_missing_ranges,
+                top_n=top_n,
+                stopwords=stopwords,
+            )
+        except ValueError as e:
+            results.append({"variable": request.variable_name, "error": str(e)})
+            continue
+        results.append(
+            {"variable": request.variable_name, "word_frequencies": word_frequencies},
+        )
+    return results
+
+
+@router.post("/datasets/{dataset_id}/word-frequencies")
+async def get_dataset_word_frequencies(
+    dataset_id: str,
+    word_request: WordFrequencyRequest,
+    db: AsyncSession = Depends(get_db_session),
+    api_key: str = Security(get_api_key),
+) -> List[Dict[str, Any]]:
+    """
+    Count the most frequent words of text variables in a dataset.
+
+    Only the top words are returned, optionally per category of a split
+    variable, so word clouds never need the raw answers. Results are cached
+    per dataset file, variable and options.
+    """
+    dataset = await _get_dataset_by_id(db, dataset_id)
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    try:
+        stats_request = StatsRequest(
+            variables=[StatsVariable(variable=name) for name in word_request.variables],
+            split_variable=word_request.split_variable,
+        )
+        dataset_variables = await _get_dataset_variables_by_name(
+            db,
+            dataset,
+            _stats_request_columns(stats_request),
+        )
+        requests = _variable_stats_requests(stats_request, dataset_variables)
+
+        stopwords = frozenset(word_request.stopwords) | (
+            STOPWORDS if word_request.exclude_stopwords else frozenset()
+        )
+        file_hash = str(dataset.file_hash)
+        results: List[Dict[str, Any] | None] = [
+            word_frequency_cache.get(
+                word_frequency_key(file_hash, request, word_request.top_n, stopwords),
+            )
+            if isinstance(request, VariableStatsRequest)
+            else request
+            for request in requests
+        ]
+
+        pending = [
+            request
+            for request, result in zip(requests, results, strict=True)
+            if result is None
+        ]
+        if pending:
+            df = await _load_dataframe(dataset, _request_columns(pending))
+            counted = await compute_executor.run(
+                _count_words,
+                df,
+                pending,
+                word_request.top_n,
+                stopwords,
+                file_hash,
+            )
+            for request, result in zip(pending, counted, strict=True):
+                if "word_frequencies" in result:
+                    word_frequency_cache.put(
+                        word_frequency_key(
+                            file_hash,
+                            request,
+                            word_request.top_n,
+                            stopwords,
+                        ),
+                        result,
+                    )
+
+            counted_results = iter(counted)
+            results = [
+                result if result is not None else next(counted_results)
+                for result in results
+            ]
+        return results
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error counting words: {e!s}",
+        ) from e
+
+
+@router.post("/datasets/{dataset_id}/multi-response")
+async def get_dataset_multi_response(
+    dataset_id: str,
+    multi_response_request: MultiResponseRequest,
+    db: AsyncSession = Depends(get_db_session),
+    api_key: str = Security(get_api_key),
+) -> Dict[str, Any]:
+    """
+    Count the selections of a multi-response set in a dataset.
+
+    Returns the count of every item with its percentages of respondents and
+    of responses, optionally per category of a split variable. The items'
+    missing values are applied. Respondents are the rows with at least one
+    item holding the counted value; responses are all such selections.
+    """
+    dataset = await _get_dataset_by_id(db, dataset_id)
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    try:
+        stats_request = StatsRequest(
+            variables=[
+                StatsVariable(variable=name)
+                for name in multi_response_request.variables
+            ],
+            split_variable=multi_response_request.split_variable,
+        )
+        dataset_variables = await _get_dataset_variables_by_name(
+            db,
+            dataset,
+            _stats_request_columns(stats_request),
+        )
+        requests: List[VariableStatsRequest] = []
+        for request in _variable_stats_requests(stats_request, dataset_variables):
+            if not isinstance(request, VariableStatsRequest):
+                raise HTTPException(status_code=400, detail=request["error"])
+            requests.append(request)
+        if not requests:
+            raise HTTPException(status_code=400, detail="No variables requested")
+
+        df = await _load_dataframe(dataset, _request_columns(requests))
+        split = requests[0]
+        return await compute_executor.run(
+            partial(
+                StatisticsService().describe_multi_response,
+                df,
+                requests,
+                counted_value=multi_response_request.counted_value,
+                split_variable=split.split_variable,
+                split_variable_value_labels=split.split_variable_value_labels,
+                split_variable_missing_values=split.split_variable_missing_values,
+                split_variable_missing_ranges=split.split_variable_missing_ranges,
+                decimal_places=multi_response_request.decimal_places,
+            ),
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error counting multi-response set: {e!s}",
+        ) from e
+
+
 @router.post("/datasets/{dataset_id}/exports/powerpoint")
 async def export_dataset_powerpoint(
     dataset_id: str,
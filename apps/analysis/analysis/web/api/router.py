@@ -2,6 +2,7 @@ from fastapi import Security
 from fastapi.responses import JSONResponse
 from fastapi.routing import APIRouter
 
+from analysis.web.api.cache.routes import router as cache_router
 from analysis.web.api.datasets.routes import router as dataset_router
 from analysis.web.api.security import get_api_key
 
@@ -15,3 +16,4 @@ async def root(api_key: str = Security(get_api_key)) -> dict[str, str]:
 
 
 api_router.include_router(dataset_router)
+api_router.include_router(cache_router)
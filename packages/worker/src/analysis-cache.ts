@@ -0,0 +1,26 @@
+/**
+ * Evicts a dataset file from the analysis service's local cache.
+ *
+ * Eviction is best-effort: the cached files are removed from disk, but only the
+ * analysis worker process answering the request drops the dataset from memory.
+ * Other processes keep it until their in-memory caches evict it.
+ *
+ * Does nothing when ANALYSIS_API_URL is not configured.
+ */
+export async function evictAnalysisDatasetCache(fileHash: string): Promise<void> {
+  const baseUrl = process.env.ANALYSIS_API_URL;
+  if (!baseUrl) {
+    return;
+  }
+
+  const response = await fetch(`${baseUrl}/cache/datasets/${encodeURIComponent(fileHash)}`, {
+    method: "DELETE",
+    headers: {
+      "X-API-KEY": process.env.ANALYSIS_API_KEY ?? "",
+    },
+  });
+
+  if (!response.ok) {
+    throw new Error(`Analysis cache eviction failed with status ${response.status}`);
+  }
+}
@@ -5,6 +5,7 @@ import { createDeleteDatasetFilesTask } from "./delete-dataset-files.js";
 
 type DatasetDeleteJobPayload = {
   data: {
+    file_hash?: string;
     id: string;
     storage_key: string;
   };
@@ -35,6 +36,7 @@ function createPayload(jobId = "550e8400-e29b-41d4-a716-446655440100"): DatasetD
 function createHelpers() {
   const errorLogs: string[] = [];
   const infoLogs: string[] = [];
+  const warnLogs: string[] = [];
   const queries: QueryCall[] = [];
 
   const client: MockPgClient = {
@@ -51,13 +53,16 @@ function createHelpers() {
       info(message: string) {
         infoLogs.push(message);
       },
+      warn(message: string) {
+        warnLogs.push(message);
+      },
     },
     async withPgClient<T>(callback: (pgClient: MockPgClient) => Promise<T>) {
       return callback(client);
     },
   } as TaskHelpers;
 
-  return { errorLogs, helpers, infoLogs, queries };
+  return { errorLogs, helpers, infoLogs, queries, warnLogs };
 }
 
 describe("createDeleteDatasetFilesTask", () => {
@@ -82,6 +87,50 @@ describe("createDeleteDatasetFilesTask", () => {
     assert.deepEqual(infoLogs, [`Deleting dataset file for dataset ${payload.data.id} (job_id: ${payload.job_id})`]);
   });
 
+  test("evicts the analysis cache for the dataset file", async () => {
+    const evictedHashes: string[] = [];
+    const task = createDeleteDatasetFilesTask(
+      async () => {},
+      async (fileHash: string) => {
+        evictedHashes.push(fileHash);
+      }
+    );
+    const payload = createPayload();
+    payload.data.file_hash = "0cc175b9c0f1b6a831c399e269772661";
+    const { helpers, queries, warnLogs } = createHelpers();
+
+    await task(payload, helpers);
+
+    assert.deepEqual(evictedHashes, [payload.data.file_hash]);
+    assert.equal(queries.length, 1);
+    assert.deepEqual(warnLogs, []);
+  });
+
+  test("completes the job when the analysis cache eviction fails", async () => {
+    const task = createDeleteDatasetFilesTask(
+      async () => {},
+      async () => {
+        throw new Error("analysis unavailable");
+      }
+    );
+    const payload = createPayload();
+    payload.data.file_hash = "0cc175b9c0f1b6a831c399e269772661";
+    const { errorLogs, helpers, queries, warnLogs } = createHelpers();
+
+    await task(payload, helpers);
+
+    assert.deepEqual(queries, [
+      {
+        params: [payload.job_id],
+        text: "UPDATE public.jobs SET status = 'completed'::job_status, last_error = NULL WHERE id = $1",
+      },
+    ]);
+    assert.deepEqual(errorLogs, []);
+    assert.deepEqual(warnLogs, [
+      `Failed to evict cached dataset file for dataset ${payload.data.id}: analysis unavailable`,
+    ]);
+  });
+
   test("rejects invalid payloads before touching storage", async () => {
     const task = createDeleteDatasetFilesTask(async () => {
       throw new Error("should not be called");
@@ -1,5 +1,6 @@
 import type { Task } from "graphile-worker";
 import { deleteDataset } from "@repo/storage";
+import { evictAnalysisDatasetCache } from "../analysis-cache.js";
 
 type DatasetRowPayload = {
   created_at: string;
@@ -41,14 +42,17 @@ function isDatasetDeleteJobPayload(value: unknown): value is DatasetDeleteJobPay
   return typeof data.id === "string" && typeof data.storage_key === "string";
 }
 
-export function createDeleteDatasetFilesTask(deleteDatasetObject: typeof deleteDataset = deleteDataset): Task {
+export function createDeleteDatasetFilesTask(
+  deleteDatasetObject: typeof deleteDataset = deleteDataset,
+  evictDatasetCache: typeof evictAnalysisDatasetCache = evictAnalysisDatasetCache
+): Task {
   return async (payload, helpers) => {
     if (!isDatasetDeleteJobPayload(payload)) {
       throw new Error("Invalid delete_dataset_files payload");
     }
 
     const {
-      data: { id: datasetId, storage_key: storageKey },
+      data: { file_hash: fileHash, id: datasetId, storage_key: storageKey },
       job_id,
     } = payload;
 
@@ -56,6 +60,19 @@ export function createDeleteDatasetFilesTask(deleteDatasetObject: typeof deleteD
 
     try {
       await deleteDatasetObject(storageKey);
+
+      if (typeof fileHash === "string" && fileHash) {
+        // The cached copy is only an optimization, so a failed eviction must not fail the job.
+        // Eviction is also best-effort: other analysis worker processes may keep the dataset in
+        // memory until their caches evict it, but it can no longer be requested once deleted.
+        try {
+          await evictDatasetCache(fileHash);
+        } catch (error) {
+          const message = error instanceof Error ? error.message : "Unknown error";
+          helpers.logger.warn(`Failed to evict cached dataset file for dataset ${datasetId}: ${message}`);
+        }
+      }
+
       await helpers.withPgClient(async (client) => {
         await client.query("UPDATE public.jobs SET status = 'completed'::job_status, last_error = NULL WHERE id = $1", [
           job_id,